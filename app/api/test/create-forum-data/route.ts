@@ -1,6 +1,11 @@
 import { createClient } from "@supabase/supabase-js";
 
 export async function POST(request: Request) {
+  // Test data only outside production, unless explicitly enabled
+  if (process.env.NODE_ENV === "production" && process.env.ENABLE_TEST_ENDPOINTS !== "true") {
+    return Response.json({ ok: false, message: "Not found" }, { status: 404 });
+  }
+
   const supabaseUrl = process.env.SUPABASE_URL;
   const supabaseServiceKey = process.env.SUPABASE_SERVICE_ROLE_KEY;
 
@@ -8,16 +13,25 @@ export async function POST(request: Request) {
     return Response.json({ ok: false, message: "Server misconfigured" }, { status: 500 });
   }
 
+  // Optional { index, replies } body (scripts/generate_test_forum.py) seeds a
+  // distinct user test<index> with that many replies; no body keeps the single
+  // default test user
+  const options = await request.json().catch(() => ({}));
+  const index = Number.isInteger(options?.index) ? options.index : null;
+  const replyCount = Number.isInteger(options?.replies) ? Math.min(Math.max(options.replies, 0), 50) : 1;
+  const handle = index === null ? "test" : `test${index}`;
+  const email = `${handle}@hbracing7.local`;
+
   try {
     const db = createClient(supabaseUrl, supabaseServiceKey);
 
     // Create a test user
     const { data: authUser, error: authError } = await db.auth.admin.createUser({
-      email: "test@hbracing7.local",
+      email,
       password: "TestPassword123!",
       email_confirm: true,
       user_metadata: {
-        display_name: "Test User",
+        display_name: index === null ? "Test User" : `Test User ${index}`,
       },
     });
 
@@ -32,7 +46,7 @@ export async function POST(request: Request) {
       const { data: existingUser } = await db
         .from("auth.users")
         .select("id")
-        .eq("email", "test@hbracing7.local")
+        .eq("email", email)
         .single();
       
       if (!existingUser) {
@@ -47,7 +61,7 @@ export async function POST(request: Request) {
     // Create or update user profile
     await db.from("user_profiles").upsert({
       id: userId,
-      forum_handle: "test",
+      forum_handle: handle,
       forum_avatar_url: null,
     });
 
@@ -70,28 +84,32 @@ export async function POST(request: Request) {
       );
     }
 
-    // Create a test reply
-    const { data: reply, error: replyError } = await db
-      .from("forum_posts")
-      .insert({
-        thread_id: thread.id,
-        user_id: userId,
-        body: "This is a test reply! Challenge accepted! 🏁",
-      })
-      .select()
-      .single();
+    // Create test replies
+    const { data: replies, error: replyError } = replyCount
+      ? await db
+          .from("forum_posts")
+          .insert(
+            Array.from({ length: replyCount }, (_, i) => ({
+              thread_id: thread.id,
+              user_id: userId,
+              body: i === 0 ? "This is a test reply! Challenge accepted! 🏁" : `Test reply #${i + 1}`,
+            }))
+          )
+          .select()
+      : { data: [], error: null };
 
     if (replyError) {
       console.error("Reply error:", replyError);
     }
+    const reply = replies?.[0];
 
     return Response.json({
       ok: true,
       message: "Test data created successfully",
       user: {
         id: userId,
-        email: "test@hbracing7.local",
-        handle: "test",
+        email,
+        handle,
       },
       thread: {
         id: thread.id,
@@ -99,6 +117,7 @@ export async function POST(request: Request) {
         url: `/forum/thread/${thread.id}`,
       },
       reply: reply ? { id: reply.id } : null,
+      replies: replies?.length ?? 0,
     });
   } catch (error) {
     console.error("Error:", error);
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Summit listing parser benchmark
+
+Runs each listing parser over synthetic pages (synthetic_summit_listing.py)
+of increasing size and records throughput and peak memory:
+
+    first100     tmp/extract_first100.py parse_listing_html (div.item.row cards)
+    crawler      extractSummitCamshafts.py parse_listing_page (the crawl path)
+
+Each size is timed --repeat times (best run kept) without tracing, then run
+once more under tracemalloc for the peak. Results go to
+bench_summit_parsers.csv/.json and, if matplotlib is installed, a
+bench_summit_parsers.png with throughput and peak memory against page size.
+
+Requirements:
+    pip install beautifulsoup4
+    pip install matplotlib   (optional, for the plot)
+
+Usage:
+    python scripts/bench_summit_parsers.py
+    python scripts/bench_summit_parsers.py --sizes 100 1000 10000 100000 --parsers first100
+"""
+
+import gc
+import csv
+import json
+import time
+import argparse
+import tracemalloc
+import importlib.util
+from pathlib import Path
+
+from synthetic_summit_listing import DEFAULT_SEED, generate_listing_html
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_OUTPUT_DIR = REPO_DIR / "tmp" / "bench"
+DEFAULT_SIZES = [100, 1000, 10000]
+
+
+def load_parsers() -> dict:
+    """{name: parse(html, cards) -> records}"""
+    spec = importlib.util.spec_from_file_location("extract_first100", REPO_DIR / "tmp" / "extract_first100.py")
+    first100 = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(first100)
+    from extractSummitCamshafts import parse_listing_page
+
+    return {
+        "first100": lambda html, cards: len(first100.parse_listing_html(html, 1, cards)),
+        "crawler": lambda html, cards: len(parse_listing_page(html)[1]),
+    }
+
+
+def measure(parse, html: str, cards: int, repeat: int) -> dict:
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        records = parse(html, cards)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    gc.collect()
+    tracemalloc.start()
+    parse(html, cards)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "seconds": round(best, 6),
+        "records": records,
+        "cards_per_second": round(cards / best, 1) if best else 0,
+        "mib_per_second": round(len(html) / 2**20 / best, 3) if best else 0,
+        "peak_mib": round(peak / 2**20, 2),
+    }
+
+
+def write_results(results: list, output_dir: Path):
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_dir / "bench_summit_parsers.json", "w") as f:
+        json.dump(results, f, indent=2)
+    with open(output_dir / "bench_summit_parsers.csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0]))
+        writer.writeheader()
+        writer.writerows(results)
+    print(f"\nResults: {output_dir / 'bench_summit_parsers.csv'}")
+
+
+def plot_results(results: list, output_dir: Path):
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib not installed, skipping plot. Run: pip install matplotlib")
+        return
+
+    fig, (throughput_ax, memory_ax) = plt.subplots(1, 2, figsize=(12, 4.5))
+    for parser in dict.fromkeys(row["parser"] for row in results):
+        rows = [row for row in results if row["parser"] == parser]
+        cards = [row["cards"] for row in rows]
+        throughput_ax.plot(cards, [row["cards_per_second"] for row in rows], marker="o", label=parser)
+        memory_ax.plot(cards, [row["peak_mib"] for row in rows], marker="o", label=parser)
+
+    throughput_ax.set(xscale="log", xlabel="cards per page", ylabel="cards / second", title="Throughput")
+    memory_ax.set(xscale="log", yscale="log", xlabel="cards per page", ylabel="peak traced MiB", title="Peak memory")
+    for ax in (throughput_ax, memory_ax):
+        ax.grid(True, which="both", alpha=0.3)
+        ax.legend()
+    fig.tight_layout()
+    path = output_dir / "bench_summit_parsers.png"
+    fig.savefig(path, dpi=120)
+    print(f"Plot: {path}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the Summit listing parsers on synthetic pages.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help=f"Cards per page to test (default: {' '.join(map(str, DEFAULT_SIZES))}).")
+    parser.add_argument("--parsers", nargs="+", choices=["first100", "crawler"], default=["first100", "crawler"],
+                        help="Parser paths to run (default: both).")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"Page generator seed (default: {DEFAULT_SEED}).")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per size; the best is kept (default: 3).")
+    parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT_DIR,
+                        help=f"Where to write results (default: {DEFAULT_OUTPUT_DIR.relative_to(REPO_DIR)}).")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    parsers = load_parsers()
+
+    results = []
+    for cards in sorted(args.sizes):
+        html = generate_listing_html(cards, args.seed)
+        print(f"\n{cards:,} cards ({len(html) / 2**20:.1f} MiB)")
+        for name in args.parsers:
+            row = {"parser": name, "cards": cards, "html_bytes": len(html)}
+            row.update(measure(parsers[name], html, cards, args.repeat))
+            results.append(row)
+            print(f"  {name:<9} {row['seconds']:9.3f}s  {row['cards_per_second']:>10,.0f} cards/s  "
+                  f"{row['mib_per_second']:7.2f} MiB/s  peak {row['peak_mib']:8.1f} MiB  {row['records']:,} records")
+        del html
+
+    write_results(results, args.output_dir)
+    plot_results(results, args.output_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Nearest-cam similarity index
+
+Builds one KD-tree per engine family over (dur_int_050, dur_exh_050, lsa,
+lift_int, lift_exh), each feature standardized within the family, and
+exports the top-k most similar cams for every cam as static JSON the app
+can serve without scanning cse_generic_cams:
+
+    public/data/cam-neighbors/index.json            families -> file, cam count
+    public/data/cam-neighbors/<family-slug>.json    {"cams": {brand: {pn: [{pn, brand, cam_name, distance}, ...]}}}
+
+Cams are keyed by brand and part number, since different brands can use
+the same part number.
+
+Cams without @.050 duration or lift are left out. A missing LSA is filled
+with the family median (and flagged) rather than dropping the cam.
+
+Input is validate_cams.py's load_ready.json or a cse_generic_cams CSV
+export (anything cam_records.read_records understands).
+
+Requirements:
+    pip install numpy
+    pip install scipy   (optional; falls back to a NumPy brute-force search)
+
+Usage:
+    python scripts/build_cam_neighbors.py tmp/validated/load_ready.json --k 10
+    python scripts/build_cam_neighbors.py cse_generic_cams.csv --output-dir public/data/cam-neighbors
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: NumPy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+from cam_records import read_records
+from ingest_metrics import METRICS
+from resolve_cams import FAMILY_NAMES, family_key
+
+OUTPUT_DIR = Path(__file__).parent.parent / "public" / "data" / "cam-neighbors"
+# Run metrics stay out of public/
+METRICS_DIR = Path(__file__).parent.parent / "tmp" / "cam_neighbors"
+FEATURES = ("dur_int_050", "dur_exh_050", "lsa", "lift_int", "lift_exh")
+LSA_COLUMN = FEATURES.index("lsa")
+DEFAULT_K = 10
+
+# Rows of the brute-force distance matrix computed at a time (each block is
+# BRUTE_FORCE_BLOCK x family size x features floats)
+BRUTE_FORCE_BLOCK = 256
+
+# Floor for a feature's spread, so a family where every cam shares a value
+# (e.g. one LSA) doesn't blow that feature up
+MIN_SCALE = np.array([2.0, 2.0, 1.0, 0.010, 0.010])
+
+
+def family_slug(family: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", family.lower()).strip("-")
+
+
+class CamIndex:
+    """KD-tree (or brute force) over standardized cam features."""
+
+    def __init__(self, features):
+        self.mean = features.mean(axis=0)
+        self.scale = np.maximum(features.std(axis=0), MIN_SCALE)
+        self.points = (features - self.mean) / self.scale
+        try:
+            from scipy.spatial import cKDTree
+            self.tree = cKDTree(self.points)
+        except ImportError:
+            self.tree = None
+
+    def __len__(self):
+        return len(self.points)
+
+    def query(self, features, k: int):
+        """(distances, indices), each (len(features), k), for raw feature rows."""
+        points = (np.atleast_2d(features) - self.mean) / self.scale
+        k = min(k, len(self))
+        if self.tree is not None:
+            distances, indices = self.tree.query(points, k=k)
+            return distances.reshape(len(points), k), indices.reshape(len(points), k)
+        # Brute force, a block of rows at a time so a large family never
+        # materializes the whole n x n x features difference array
+        distances = np.empty((len(points), k))
+        indices = np.empty((len(points), k), dtype=np.intp)
+        for start in range(0, len(points), BRUTE_FORCE_BLOCK):
+            block = points[start:start + BRUTE_FORCE_BLOCK]
+            squared = ((block[:, None, :] - self.points[None, :, :]) ** 2).sum(axis=2)
+            nearest = np.argpartition(squared, k - 1, axis=1)[:, :k]
+            order = np.take_along_axis(squared, nearest, axis=1).argsort(axis=1)
+            nearest = np.take_along_axis(nearest, order, axis=1)
+            indices[start:start + len(block)] = nearest
+            distances[start:start + len(block)] = np.sqrt(np.take_along_axis(squared, nearest, axis=1))
+        return distances, indices
+
+
+def feature_matrix(records: list):
+    """(features, lsa_imputed) for records that have every feature but LSA."""
+    features = np.array([[record[name] for name in FEATURES] for record in records], dtype=float)
+    missing_lsa = np.isnan(features[:, LSA_COLUMN])
+    if missing_lsa.any():
+        known = features[~missing_lsa, LSA_COLUMN]
+        features[missing_lsa, LSA_COLUMN] = np.median(known) if len(known) else 112.0
+    return features, missing_lsa
+
+
+def group_by_family(records: list) -> tuple:
+    """
+    ({family name: [records]}, skipped) keeping cams with @.050 duration and
+    lift. Spelling variants of a family ("Ford small block Windsor") are
+    grouped by resolve_cams.family_key under the canonical name from
+    FAMILY_NAMES, else the first spelling seen.
+    """
+    families, names, skipped = {}, {}, 0
+    seen = set()
+    for record in records:
+        required = [record[name] for name in FEATURES if name != "lsa"]
+        family = family_key(record["family"])
+        key = (family, record["brand"], record["pn"])
+        if None in required or not record["pn"] or key in seen:
+            skipped += 1
+            continue
+        seen.add(key)
+        names.setdefault(family, FAMILY_NAMES.get(family, record["family"]))
+        families.setdefault(family, []).append(record)
+    return {names[family]: family_records for family, family_records in families.items()}, skipped
+
+
+def neighbor_lists(records: list, distances, indices, k: int) -> dict:
+    """{brand: {pn: [neighbor, ...]}} from a k+1 self-query, excluding each cam itself."""
+    cams = {}
+    for row, record in enumerate(records):
+        neighbors = []
+        for distance, other in zip(distances[row], indices[row]):
+            if other == row or len(neighbors) == k:
+                continue
+            match = records[other]
+            neighbors.append({"pn": match["pn"], "brand": match["brand"], "cam_name": match["cam_name"],
+                              "distance": round(float(distance), 4)})
+        cams.setdefault(record["brand"] or "", {})[record["pn"]] = neighbors
+    return cams
+
+
+def build_family(family: str, records: list, k: int) -> dict:
+    with METRICS.stage("index"):
+        features, lsa_imputed = feature_matrix(records)
+        index = CamIndex(features)
+    METRICS.count("index", records=len(records))
+
+    start = time.perf_counter()
+    with METRICS.stage("query"):
+        distances, indices = index.query(features, k + 1)
+    elapsed = time.perf_counter() - start
+    METRICS.count("query", records=len(records))
+    print(f"  {family}: {len(records)} cams, batched k-NN in {elapsed * 1000:.2f} ms "
+          f"({elapsed / len(records) * 1e6:.1f} us/cam, {'kd-tree' if index.tree is not None else 'brute force'})")
+    cams = neighbor_lists(records, distances, indices, k)
+
+    return {
+        "family": family,
+        "features": list(FEATURES),
+        "k": min(k, len(records) - 1),
+        "scale": {"mean": index.mean.round(4).tolist(), "std": index.scale.round(4).tolist()},
+        "lsa_imputed": [{"brand": record["brand"], "pn": record["pn"]}
+                        for record, imputed in zip(records, lsa_imputed) if imputed],
+        "cams": cams,
+    }
+
+
+def write_family(output_dir: Path, data: dict) -> Path:
+    path = output_dir / f"{family_slug(data['family'])}.json"
+    with METRICS.stage("write"):
+        path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+    METRICS.count("write", records=sum(map(len, data["cams"].values())), bytes=path.stat().st_size)
+    return path
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build per-family nearest-cam lists for static serving.")
+    parser.add_argument("inputs", nargs="+", type=Path, help="load_ready.json / cse_generic_cams CSV export(s).")
+    parser.add_argument("--k", type=int, default=DEFAULT_K, help=f"Neighbors per cam (default: {DEFAULT_K}).")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR, help="Where to write the JSON files.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    records = []
+    for path in args.inputs:
+        if not path.exists():
+            print(f"ERROR: File not found: {path}")
+            sys.exit(1)
+        records.extend(read_records(path))
+
+    families, skipped = group_by_family(records)
+    if skipped:
+        print(f"Skipped {skipped} records without @.050 duration/lift, part number, or duplicated")
+    if not families:
+        print("No cams to index.")
+        return
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    print(f"Indexing {sum(map(len, families.values()))} cams in {len(families)} families (k={args.k})")
+    summary = {}
+    for family, family_records in sorted(families.items()):
+        if len(family_records) < 2:
+            print(f"  {family}: only one cam, skipped")
+            continue
+        path = write_family(args.output_dir, build_family(family, family_records, args.k))
+        summary[family] = {"file": path.name, "cams": len(family_records)}
+
+    index_path = args.output_dir / "index.json"
+    index_path.write_text(json.dumps({"features": list(FEATURES), "k": args.k, "families": summary}, indent=2),
+                          encoding="utf-8")
+    print(f"Index: {index_path}")
+    METRICS.write(METRICS_DIR, job="cam-neighbors")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Web-optimized image derivatives for the shop
+
+Builds resized WebP (and AVIF, when the installed Pillow can write it)
+variants of the catalog images in public/shop/extracted and
+public/shop/afr-heads, and writes a manifest with dimensions and srcset
+strings for the shop and parts pages.
+
+Sources whose content hash has not changed since the last run are skipped;
+a rebuilt source's variants from earlier settings are deleted.
+
+Requirements:
+    pip install pillow
+
+Usage:
+    python scripts/build_image_derivatives.py [--workers N] [--widths 320 640 1024] [--force]
+"""
+
+import sys
+import os
+import re
+import json
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    from PIL import Image
+except ImportError:
+    print("ERROR: Pillow not installed. Run: pip install pillow")
+    sys.exit(1)
+
+PUBLIC_DIR = Path(__file__).parent.parent / "public"
+SHOP_DIR = PUBLIC_DIR / "shop"
+SOURCE_DIRS = [SHOP_DIR / "extracted", SHOP_DIR / "afr-heads"]
+DERIVED_DIR = SHOP_DIR / "derived"
+MANIFEST_FILE = DERIVED_DIR / "manifest.json"
+
+DEFAULT_WIDTHS = [320, 640, 1024]
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp", ".gif", ".bmp", ".tif", ".tiff"}
+
+# Encoder settings per output format
+FORMAT_OPTIONS = {
+    "webp": {"format": "WEBP", "quality": 80, "method": 6},
+    "avif": {"format": "AVIF", "quality": 55},
+}
+
+
+def available_formats() -> list:
+    """WebP always; AVIF only if this Pillow build (or plugin) can encode it."""
+    Image.init()
+    formats = ["webp"]
+    if "AVIF" in Image.SAVE:
+        formats.append("avif")
+    return formats
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def public_url(path: Path) -> str:
+    return "/" + path.relative_to(PUBLIC_DIR).as_posix()
+
+
+def build_derivatives(source: str, previous: dict | None, widths: list, formats: list, force: bool) -> dict:
+    """
+    Worker: produce every width/format variant for one source image.
+    Returns the manifest entry; `skipped` is set when the previous entry is
+    still valid (same source hash, same settings, variant files present).
+    """
+    source_path = Path(source)
+    sha256 = file_sha256(source_path)
+
+    if previous and not force and previous["sha256"] == sha256 \
+            and previous.get("widths") == widths and previous.get("formats") == formats \
+            and all((PUBLIC_DIR / v["path"].lstrip("/")).exists() for v in previous["variants"]):
+        return dict(previous, skipped=True)
+
+    rel = source_path.relative_to(SHOP_DIR)
+    out_dir = DERIVED_DIR / rel.parent
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    with Image.open(source_path) as img:
+        src_width, src_height = img.size
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB")
+
+        # Never upscale; a source narrower than every target still gets one variant
+        targets = sorted({min(w, src_width) for w in widths})
+
+        variants = []
+        for width in targets:
+            height = max(1, round(src_height * width / src_width))
+            resized = img if width == src_width else img.resize((width, height), Image.LANCZOS)
+            for fmt in formats:
+                out_path = out_dir / f"{source_path.stem}-{width}w.{fmt}"
+                options = dict(FORMAT_OPTIONS[fmt])
+                resized.save(out_path, options.pop("format"), **options)
+                variants.append({
+                    "path": public_url(out_path),
+                    "format": fmt,
+                    "width": width,
+                    "height": height,
+                    "bytes": out_path.stat().st_size,
+                })
+
+    # A rebuild with other widths, formats or settings leaves no old variants behind
+    produced = {Path(v["path"]).name for v in variants}
+    variant_name = re.compile(rf"{re.escape(source_path.stem)}-\d+w\.({'|'.join(FORMAT_OPTIONS)})")
+    for old in out_dir.iterdir():
+        if variant_name.fullmatch(old.name) and old.name not in produced:
+            old.unlink()
+
+    srcset = {
+        fmt: ", ".join(f"{v['path']} {v['width']}w" for v in variants if v["format"] == fmt)
+        for fmt in formats
+    }
+
+    return {
+        "source": public_url(source_path),
+        "sha256": sha256,
+        "width": src_width,
+        "height": src_height,
+        "bytes": source_path.stat().st_size,
+        "widths": widths,
+        "formats": formats,
+        "variants": variants,
+        "srcset": srcset,
+        "skipped": False,
+    }
+
+
+def find_sources(source_dirs: list) -> list:
+    sources = []
+    for source_dir in source_dirs:
+        if not source_dir.exists():
+            print(f"  Skipping missing directory: {source_dir}")
+            continue
+        sources.extend(
+            p for p in sorted(source_dir.rglob("*"))
+            if p.is_file() and p.suffix.lower() in IMAGE_EXTENSIONS and not p.name.startswith(".")
+        )
+    return sources
+
+
+def load_manifest() -> dict:
+    if MANIFEST_FILE.exists():
+        with open(MANIFEST_FILE) as f:
+            return {entry["source"]: entry for entry in json.load(f)["images"]}
+    return {}
+
+
+def remove_stale(manifest: dict, current: set):
+    """Drop manifest entries (and their files) whose source image is gone."""
+    for source in sorted(set(manifest) - current):
+        for variant in manifest[source]["variants"]:
+            stale = PUBLIC_DIR / variant["path"].lstrip("/")
+            if stale.exists():
+                stale.unlink()
+        del manifest[source]
+        print(f"  Removed stale derivatives for {source}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build resized WebP/AVIF variants of shop images.")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (0 = one per CPU core).")
+    parser.add_argument("--widths", type=int, nargs="+", default=DEFAULT_WIDTHS, help="Target widths in pixels.")
+    parser.add_argument("--force", action="store_true", help="Rebuild every variant even if the source is unchanged.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    workers = args.workers or os.cpu_count() or 1
+    widths = sorted(set(args.widths))
+    formats = available_formats()
+
+    print(f"Formats: {', '.join(formats)}  Widths: {widths}")
+
+    sources = find_sources(SOURCE_DIRS)
+    print(f"Found {len(sources)} source images\n")
+
+    manifest = load_manifest()
+    remove_stale(manifest, {public_url(p) for p in sources})
+
+    built = skipped = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(build_derivatives, str(p), manifest.get(public_url(p)), widths, formats, args.force)
+            for p in sources
+        ]
+        for future in futures:
+            try:
+                entry = future.result()
+            except Exception as e:
+                print(f"  Error: {e}")
+                continue
+            if entry.pop("skipped"):
+                skipped += 1
+            else:
+                built += 1
+                print(f"  Built: {entry['source']} ({len(entry['variants'])} variants)")
+            manifest[entry["source"]] = entry
+
+    DERIVED_DIR.mkdir(parents=True, exist_ok=True)
+    with open(MANIFEST_FILE, "w") as f:
+        json.dump({"images": [manifest[k] for k in sorted(manifest)]}, f, indent=2)
+
+    source_bytes = sum(e["bytes"] for e in manifest.values())
+    largest_variant_bytes = sum(
+        max(v["bytes"] for v in e["variants"] if v["format"] == "webp") for e in manifest.values() if e["variants"]
+    )
+
+    print("\n" + "="*60)
+    print("DERIVATIVE SUMMARY")
+    print("="*60)
+    print(f"Built: {built}  Up to date: {skipped}")
+    print(f"Manifest: {MANIFEST_FILE}")
+    if source_bytes:
+        print(f"Source bytes: {source_bytes:,}  Largest WebP variants: {largest_variant_bytes:,} "
+              f"({largest_variant_bytes / source_bytes:.0%})")
+
+
+if __name__ == "__main__":
+    main()
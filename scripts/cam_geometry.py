@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Derived cam geometry
+
+Computes the numbers the cam pages otherwise work out per row on every
+request, for a whole batch in one NumPy pass, and adds them as columns:
+
+    dur_*_050_est        @.050 duration estimated from advertised duration when
+                         only that is known, using the typical advertised-to-@.050
+                         spread for the lifter type (dur_*_050 stay as measured)
+    overlap_050          (intake + exhaust @.050) / 2 - 2 * LSA, from the
+                         estimates when there is no measured @.050
+                         (dur_050_estimated = true)
+    icl / ecl            intake / exhaust centerline: LSA - advance / LSA + advance
+    split                exhaust minus intake duration (@.050 if known, else advertised)
+
+Advance comes from the description ("113 LSA + 4 Adv"); when none is given
+DEFAULT_ADVANCE is used and advance_assumed is set.
+
+The estimates are for display only: validate_cams.py checks and loads the
+measured dur_*_050 columns, never the _est ones.
+
+Requirements:
+    pip install numpy
+
+Usage:
+    python scripts/cam_geometry.py tmp/ford_windsor_cams_first100.json tmp/ford_windsor_cams_page2.csv
+"""
+
+import re
+import sys
+import math
+import csv
+import json
+import argparse
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: NumPy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+from cam_records import FIELDS, GEOMETRY_FIELDS, read_records
+from ingest_metrics import METRICS
+
+OUTPUT_DIR = Path(__file__).parent.parent / "tmp" / "geometry"
+
+DEFAULT_ADVANCE = 4.0
+
+ADVANCE = re.compile(r"\+\s*(\d+(?:\.\d+)?)\s*Adv", re.IGNORECASE)
+
+# (lifter type, pattern) in match order
+LIFTER_TYPES = [
+    ("solid_roller", re.compile(r"\b(mechanical|mech\.?|solid)\s+roller", re.IGNORECASE)),
+    ("solid_flat", re.compile(r"\b(mechanical|mech\.?|solid)\s+flat", re.IGNORECASE)),
+    ("hydraulic_roller", re.compile(r"\b(hydraulic|hyd\.?)\s+roller", re.IGNORECASE)),
+    ("hydraulic_flat", re.compile(r"\b(hydraulic|hyd\.?)\s+flat", re.IGNORECASE)),
+]
+
+# Typical advertised minus @.050 duration by lifter type (rule of thumb;
+# solid cams are rated at a higher checking lift, so the gap is smaller)
+ADV_TO_050 = {
+    "hydraulic_flat": 52.0,
+    "hydraulic_roller": 52.0,
+    "solid_flat": 40.0,
+    "solid_roller": 42.0,
+    None: 50.0,
+}
+
+
+def lifter_type(record: dict) -> str | None:
+    text = " ".join(filter(None, (record.get("description"), record.get("cam_name"))))
+    for name, pattern in LIFTER_TYPES:
+        if pattern.search(text):
+            return name
+    return None
+
+
+def stated_advance(record: dict) -> float | None:
+    match = ADVANCE.search(record.get("description") or "")
+    return float(match.group(1)) if match else None
+
+
+def _column(records: list, field: str):
+    return np.array([record[field] for record in records], dtype=float)
+
+
+def add_geometry(records: list, default_advance: float = DEFAULT_ADVANCE) -> list:
+    """Return the records with GEOMETRY_FIELDS filled in (copies, not in place)."""
+    if not records:
+        return []
+
+    with METRICS.stage("geometry"):
+        lifters = [lifter_type(record) for record in records]
+        advance = np.array([stated_advance(record) for record in records], dtype=float)
+        spread = np.array([ADV_TO_050[lifter] for lifter in lifters])
+
+        adv_int, adv_exh = _column(records, "adv_int"), _column(records, "adv_exh")
+        dur_int, dur_exh = _column(records, "dur_int_050"), _column(records, "dur_exh_050")
+        lsa = _column(records, "lsa")
+
+        estimated = np.isnan(dur_int) & np.isnan(dur_exh) & ~np.isnan(adv_int) & ~np.isnan(adv_exh)
+        est_int = np.where(estimated, adv_int - spread, np.nan)
+        est_exh = np.where(estimated, adv_exh - spread, np.nan)
+        # Measured @.050 where there is one, else the estimate
+        dur_int = np.where(estimated, est_int, dur_int)
+        dur_exh = np.where(estimated, est_exh, dur_exh)
+
+        advance_assumed = np.isnan(advance)
+        advance = np.where(advance_assumed, default_advance, advance)
+
+        overlap = (dur_int + dur_exh) / 2 - 2 * lsa
+        icl = lsa - advance
+        ecl = lsa + advance
+        split = np.where(np.isnan(dur_int), adv_exh - adv_int, dur_exh - dur_int)
+
+        columns = {
+            "dur_int_050_est": est_int, "dur_exh_050_est": est_exh, "advance": advance,
+            "overlap_050": overlap, "icl": icl, "ecl": ecl, "split": split,
+        }
+        # Back to plain Python values, with NaN as None
+        as_lists = {name: np.round(values, 2).tolist() for name, values in columns.items()}
+        output = []
+        for row, record in enumerate(records):
+            derived = {name: (None if math.isnan(values[row]) else values[row]) for name, values in as_lists.items()}
+            derived["lifter_type"] = lifters[row]
+            derived["dur_050_estimated"] = bool(estimated[row])
+            derived["advance_assumed"] = bool(advance_assumed[row])
+            if math.isnan(lsa[row]):
+                # Centerlines need an LSA; the advance alone says nothing
+                derived["advance"] = derived["advance_assumed"] = None
+            output.append({**record, **derived})
+    METRICS.count("geometry", records=len(records))
+    return output
+
+
+def write_outputs(records: list, output_dir: Path):
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with METRICS.stage("write"):
+        with open(output_dir / "cams_geometry.json", "w", encoding="utf-8") as f:
+            json.dump(records, f, indent=2)
+        with open(output_dir / "cams_geometry.csv", "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=[*FIELDS, *GEOMETRY_FIELDS])
+            writer.writeheader()
+            writer.writerows(records)
+    METRICS.count("write", records=len(records))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Add overlap, centerlines, split and estimated @.050 to cams.")
+    parser.add_argument("inputs", nargs="+", type=Path, help="Extractor outputs / cse_generic_cams CSV exports.")
+    parser.add_argument("--default-advance", type=float, default=DEFAULT_ADVANCE,
+                        help=f"Advance (deg) when the description gives none (default: {DEFAULT_ADVANCE:g}).")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR, help="Where to write the export.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    records = []
+    for path in args.inputs:
+        if not path.exists():
+            print(f"ERROR: File not found: {path}")
+            sys.exit(1)
+        records.extend(read_records(path))
+    if not records:
+        print("No records.")
+        return
+
+    records = add_geometry(records, args.default_advance)
+    estimated = sum(record["dur_050_estimated"] for record in records)
+    with_overlap = sum(record["overlap_050"] is not None for record in records)
+    print(f"{len(records)} cams: {with_overlap} with overlap/centerlines, {estimated} with estimated @.050")
+
+    write_outputs(records, args.output_dir)
+    print(f"Output: {args.output_dir}")
+    METRICS.write(args.output_dir, job="geometry")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Shared cam record shape
+
+The cam extractors each emit their own dicts:
+
+    tmp/extract_first100.py      duration "275/279" + duration_type, lift ".499/.510", lsa (strings)
+    extractSummitCamshafts.py    duration_int/duration_exh (advertised), lift_int/lift_exh, lsa
+    tmp/extract_summit_cams.py   dur_int_050/dur_exh_050, lift_int/lift_exh, lsa, engine_make
+
+normalize() turns any of them (or a cse_generic_cams row) into one flat
+record with numbers or None, keeping advertised and @.050 duration apart.
+extract_summit_cams.py only ever matches advertised / Int.-Exh. duration
+text, so its dur_*_050 values are treated as advertised here.
+"""
+
+import re
+import csv
+import json
+from pathlib import Path
+
+# Keys of a normalized record, in output order
+FIELDS = (
+    "make", "family", "brand", "pn", "cam_name",
+    "adv_int", "adv_exh", "dur_int_050", "dur_exh_050",
+    "lift_int", "lift_exh", "lsa",
+    "source", "source_url", "description",
+)
+
+NUMERIC_FIELDS = ("adv_int", "adv_exh", "dur_int_050", "dur_exh_050", "lift_int", "lift_exh", "lsa")
+
+# Derived columns added by cam_geometry.py; kept when records are re-read
+GEOMETRY_FIELDS = ("lifter_type", "dur_int_050_est", "dur_exh_050_est", "dur_050_estimated",
+                   "advance", "advance_assumed", "overlap_050", "icl", "ecl", "split")
+GEOMETRY_FLAGS = ("dur_050_estimated", "advance_assumed")
+
+DEFAULT_MAKE = "Ford"
+DEFAULT_FAMILY = "Ford Small Block Windsor"
+
+# Summit line code -> brand, as used in part numbers (CCA-35-218-3)
+BRAND_CODES = {
+    "CCA": "COMP Cams",
+    "EDL": "Edelbrock",
+    "FMS": "Ford Performance Parts",
+    "HRS": "Howards Cams",
+    "MEL": "Melling",
+    "SUM": "Summit Racing",
+    "TFS": "Trick Flow Specialties",
+}
+
+# Unlabelled "220/231 Duration" values below this are @.050, above it advertised
+UNSPECIFIED_DURATION_SPLIT = 250
+
+PAIR = re.compile(r"^\s*([0-9.]+)\s*/\s*([0-9.]+)\s*$")
+
+
+def to_number(value) -> float | None:
+    """'', None, 'NULL' and unparsable strings -> None; 0 stays 0."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip()
+    if not text or text.upper() == "NULL":
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def split_pair(value) -> tuple:
+    """'275/279' -> (275.0, 279.0); anything else -> (None, None)."""
+    match = PAIR.match(str(value or ""))
+    if not match:
+        return None, None
+    return to_number(match.group(1)), to_number(match.group(2))
+
+
+def _record(**values) -> dict:
+    record = dict.fromkeys(FIELDS)
+    record.update(values)
+    record["make"] = record["make"] or DEFAULT_MAKE
+    record["family"] = record["family"] or DEFAULT_FAMILY
+    return record
+
+
+def from_listing_row(row: dict) -> dict:
+    """tmp/extract_first100.py CSV/JSON row."""
+    first, second = split_pair(row.get("duration"))
+    duration_type = row.get("duration_type") or ""
+    if duration_type == "unspecified" and first is not None:
+        duration_type = "@.050" if first < UNSPECIFIED_DURATION_SPLIT else "adv"
+    adv = (first, second) if duration_type == "adv" else (None, None)
+    dur_050 = (first, second) if duration_type == "@.050" else (None, None)
+    lift_int, lift_exh = split_pair(row.get("lift"))
+    return _record(
+        brand=row.get("brand"), pn=row.get("part_number"),
+        adv_int=adv[0], adv_exh=adv[1], dur_int_050=dur_050[0], dur_exh_050=dur_050[1],
+        lift_int=lift_int, lift_exh=lift_exh, lsa=to_number(row.get("lsa")),
+        source="summit_listing", description=row.get("description"),
+    )
+
+
+def from_crawler(cam: dict) -> dict:
+    """extractSummitCamshafts.py camshaft dict (durations are advertised)."""
+    return _record(
+        brand=cam.get("brand"), pn=cam.get("part_number"), cam_name=cam.get("name"),
+        adv_int=to_number(cam.get("duration_int")), adv_exh=to_number(cam.get("duration_exh")),
+        lift_int=to_number(cam.get("lift_int")), lift_exh=to_number(cam.get("lift_exh")),
+        lsa=to_number(cam.get("lsa")), source="summit_crawl", source_url=cam.get("url"),
+    )
+
+
+def from_summit_cams(cam: dict) -> dict:
+    """tmp/extract_summit_cams.py dict; its dur_*_050 hold advertised duration."""
+    return _record(
+        make=cam.get("engine_make"), family=cam.get("family"), brand=cam.get("brand"),
+        pn=cam.get("pn"), cam_name=cam.get("cam_name"),
+        adv_int=to_number(cam.get("dur_int_050")), adv_exh=to_number(cam.get("dur_exh_050")),
+        lift_int=to_number(cam.get("lift_int")), lift_exh=to_number(cam.get("lift_exh")),
+        lsa=to_number(cam.get("lsa")), source="summit_text",
+    )
+
+
+def from_generic_cam(row: dict) -> dict:
+    """cse_generic_cams row (e.g. a CSV export)."""
+    return _record(
+        make=row.get("make"), family=row.get("family"), brand=row.get("brand"),
+        pn=row.get("pn"), cam_name=row.get("cam_name"),
+        dur_int_050=to_number(row.get("dur_int_050")), dur_exh_050=to_number(row.get("dur_exh_050")),
+        lift_int=to_number(row.get("lift_int")), lift_exh=to_number(row.get("lift_exh")),
+        lsa=to_number(row.get("lsa")), source="cse_generic_cams", source_url=row.get("source_url"),
+    )
+
+
+def normalize(record: dict) -> dict:
+    """Normalize a record from any of the extractors, detected by its keys."""
+    if "adv_int" in record:
+        # Already normalized (e.g. load_ready.json, or read back from CSV)
+        values = {key: record.get(key) or None for key in FIELDS}
+        values.update({key: to_number(record.get(key)) for key in NUMERIC_FIELDS})
+        for key in GEOMETRY_FIELDS:
+            if key not in record:
+                continue
+            value = record[key]
+            if key in GEOMETRY_FLAGS:
+                values[key] = value in (True, "True", "true", "1")
+            elif key == "lifter_type":
+                values[key] = value or None
+            else:
+                values[key] = to_number(value)
+        return _record(**values)
+    if "duration_type" in record:
+        return from_listing_row(record)
+    if "duration_int" in record:
+        return from_crawler(record)
+    if "engine_make" in record:
+        return from_summit_cams(record)
+    if "dur_int_050" in record:
+        return from_generic_cam(record)
+    raise ValueError(f"Unrecognized cam record: {sorted(record)}")
+
+
+def read_records(path) -> list:
+    """Normalized records from an extractor's JSON list or CSV file."""
+    path = Path(path)
+    if path.suffix.lower() == ".json":
+        with open(path, encoding="utf-8") as f:
+            rows = json.load(f)
+    else:
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+    return [normalize(row) for row in rows]
+
+
+def sql_literal(value) -> str:
+    """SQL literal for a record value; only None becomes NULL."""
+    if value is None:
+        return "NULL"
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
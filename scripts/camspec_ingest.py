@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+camspec-ingest: one entry point for the data ingest scripts
+
+Subcommands (everything after the subcommand is passed through to the
+underlying script, so `camspec_ingest.py pdf-images --help` shows that
+script's own options):
+
+    crawl        Crawl Summit Racing listings      (extractSummitCamshafts.py)
+    parse        Parse a saved Summit listing page (tmp/extract_first100.py)
+    pdf-images   Extract catalog PDF images        (extract_afr_catalog_images.py)
+    flow-tables  Extract catalog PDF flow tables   (extract_flow_tables.py)
+    organize     Organize AFR product images       (organize_afr_images.py)
+    geometry     Add derived cam geometry          (cam_geometry.py)
+    validate     Validate extracted cams           (validate_cams.py)
+    resolve      Group the same cam across sources (resolve_cams.py)
+    neighbors    Build nearest-cam lists           (build_cam_neighbors.py)
+    head-cam     Score heads against cams          (score_head_cam.py)
+    load         Run a generated .sql file against Postgres
+
+Each script is imported only when its subcommand runs, and the scripts
+import their heavy dependencies (requests, bs4, PyMuPDF, Pillow, psycopg)
+lazily, so the CLI itself starts with nothing but the standard library.
+
+With --profile, the run is wrapped in per-stage cProfile and tracemalloc
+tracking (see ingest_metrics.py) and the reports land in a profile/ folder
+next to the command's output (or the current directory). The whole run is
+timed as a "<subcommand>-total" stage, which is added to the script's
+metrics files once it finishes.
+
+Usage:
+    python scripts/camspec_ingest.py [--profile] <subcommand> [args...]
+"""
+
+import sys
+import os
+import re
+import argparse
+import importlib
+import importlib.util
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).parent
+REPO_DIR = SCRIPTS_DIR.parent
+
+# subcommand -> (script path, help)
+SCRIPT_COMMANDS = {
+    "crawl": (SCRIPTS_DIR / "extractSummitCamshafts.py", "Crawl Summit Racing camshaft listings."),
+    "parse": (REPO_DIR / "tmp" / "extract_first100.py", "Parse a saved Summit listing page into CSV/JSON."),
+    "pdf-images": (SCRIPTS_DIR / "extract_afr_catalog_images.py", "Extract product images from catalog PDFs."),
+    "flow-tables": (SCRIPTS_DIR / "extract_flow_tables.py", "Extract lift/flow tables from catalog PDFs."),
+    "organize": (SCRIPTS_DIR / "organize_afr_images.py", "Organize AFR product images and generate SQL."),
+    "geometry": (SCRIPTS_DIR / "cam_geometry.py", "Add overlap, centerlines, split and estimated @.050."),
+    "validate": (SCRIPTS_DIR / "validate_cams.py", "Validate extracted cams and quarantine implausible ones."),
+    "resolve": (SCRIPTS_DIR / "resolve_cams.py", "Group records of the same cam across sources."),
+    "neighbors": (SCRIPTS_DIR / "build_cam_neighbors.py", "Build per-family nearest-cam lists for the app."),
+    "head-cam": (SCRIPTS_DIR / "score_head_cam.py", "Rank cylinder heads for every cam by flow at its lift."),
+}
+
+# psql's client-side copy, which we run as COPY ... FROM STDIN
+PSQL_COPY = re.compile(r"^\\copy\s+(\S+)\s+FROM\s+'([^']+)'\s*(.*?);?\s*$", re.IGNORECASE)
+
+
+def load_script(path: Path):
+    """Import a script as a module without running its __main__ block."""
+    if path.parent == SCRIPTS_DIR:
+        return importlib.import_module(path.stem)
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_script(path: Path, argv: list):
+    """Run a script's main() with argv as its command line."""
+    module = load_script(path)
+    sys.argv = [str(path.relative_to(REPO_DIR)), *argv]
+    module.main()
+
+
+def split_psql_script(text: str):
+    """
+    Yield ("sql", statements) and ("copy", (table, file, options)) chunks,
+    in order, from a psql script.
+    """
+    pending = []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("\\"):
+            match = PSQL_COPY.match(stripped)
+            if not match:
+                raise ValueError(f"Unsupported psql meta-command: {stripped}")
+            if "".join(pending).strip():
+                yield "sql", "\n".join(pending)
+            pending = []
+            yield "copy", match.groups()
+        else:
+            pending.append(line)
+    if "".join(pending).strip():
+        yield "sql", "\n".join(pending)
+
+
+def load_sql_file(sql_path: Path, database_url: str):
+    """
+    Run a generated SQL file the way psql would: statements as written
+    (the file's own BEGIN/COMMIT control the transaction) and \\copy lines
+    streamed through COPY FROM STDIN, with paths relative to the SQL file.
+    """
+    try:
+        import psycopg
+    except ImportError:
+        print('ERROR: psycopg not installed. Run: pip install "psycopg[binary]"')
+        sys.exit(1)
+
+    with psycopg.connect(database_url, autocommit=True) as conn, conn.cursor() as cur:
+        for kind, chunk in split_psql_script(sql_path.read_text(encoding="utf-8")):
+            if kind == "sql":
+                cur.execute(chunk)
+                continue
+            table, filename, options = chunk
+            source = sql_path.parent / filename
+            print(f"  COPY {table} <- {source.name}")
+            with open(source, "rb") as f, cur.copy(f"COPY {table} FROM STDIN {options}") as copy:
+                for block in iter(lambda: f.read(1 << 16), b""):
+                    copy.write(block)
+    print(f"Loaded {sql_path}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="camspec-ingest",
+        description="Cam Spec Elite data ingest: crawl, parse, extract, organize and load.",
+    )
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile CPU time and memory per stage (use --workers 1 for extractors).")
+    subcommands = parser.add_subparsers(dest="command", required=True, metavar="<subcommand>")
+
+    for name, (path, help_text) in SCRIPT_COMMANDS.items():
+        # No -h here: help goes through to the script's own parser
+        subcommands.add_parser(name, help=help_text, add_help=False)
+
+    load = subcommands.add_parser("load", help="Run a generated .sql file against Postgres.")
+    load.add_argument("sql_file", type=Path, help="SQL file to run (psql \\copy lines are supported).")
+    load.add_argument("--database-url", default=os.environ.get("DATABASE_URL"),
+                      help="Postgres connection string (default: $DATABASE_URL).")
+    return parser
+
+
+def main():
+    parser = build_parser()
+    args, rest = parser.parse_known_args()
+
+    if args.profile:
+        from ingest_metrics import METRICS
+        METRICS.enable_profiling()
+        try:
+            # Not the bare subcommand name: scripts use that for their own stages
+            with METRICS.stage(f"{args.command}-total"):
+                run_command(parser, args, rest)
+        finally:
+            # The script wrote its metrics while this stage was still open
+            METRICS.flush()
+            METRICS.write_profile(METRICS.output_dir or Path.cwd())
+    else:
+        run_command(parser, args, rest)
+
+
+def run_command(parser, args, rest):
+    if args.command in SCRIPT_COMMANDS:
+        run_script(SCRIPT_COMMANDS[args.command][0], rest)
+        return
+
+    if rest:
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+    if not args.database_url:
+        parser.error("load needs --database-url or DATABASE_URL")
+    if not args.sql_file.exists():
+        print(f"ERROR: File not found: {args.sql_file}")
+        sys.exit(1)
+    load_sql_file(args.sql_file, args.database_url)
+
+
+if __name__ == "__main__":
+    main()
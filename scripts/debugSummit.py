@@ -1,11 +1,33 @@
 #!/usr/bin/env python3
 """
 Debug script to examine HTML structure from Summit Racing
+
+By default downloads the whole listing page, reports which selectors the
+extractors rely on match, and saves the first 20,000 characters.
+
+With --probe it streams the page instead: the response is read in chunks
+and fed to an incremental parser that stops as soon as the first --cards
+product cards (div.item.row) are complete, then reports the selector hits
+so far and a layout fingerprint (the tag.class structure shared by those
+cards). A pre-crawl check then costs a few hundred KB instead of the full
+1.3 MB page. The exit status is 1 if the cards or a required selector are
+missing, or the fingerprint differs from --expect.
+
+Requirements:
+    pip install requests beautifulsoup4   (--probe needs only requests, or nothing with --file)
+
+Usage:
+    python scripts/debugSummit.py
+    python scripts/debugSummit.py --probe --cards 5 --expect d8407040a0d4
+    python scripts/debugSummit.py --probe --file tmp/summit_ford_windsor_page1.html
 """
 
-import requests
-from bs4 import BeautifulSoup
 import re
+import sys
+import time
+import hashlib
+import argparse
+from html.parser import HTMLParser
 
 BASE_URL = "https://www.summitracing.com/search/make/ford/engine-family/ford-small-block-windsor/part-type/camshafts"
 
@@ -13,40 +35,229 @@ headers = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
 }
 
-print("Fetching page...")
-response = requests.get(BASE_URL, headers=headers, timeout=10)
-response.raise_for_status()
-
-soup = BeautifulSoup(response.text, 'html.parser')
-
-# Find the main product area
-print("\n=== Looking for product containers ===")
-
-# Try to find any div with "product" in class
-divs_with_product = soup.find_all('div', class_=re.compile(r'product', re.IGNORECASE))
-print(f"Divs with 'product' in class: {len(divs_with_product)}")
-if divs_with_product:
-    print(f"First div: {divs_with_product[0]}")
-
-# Try to find h2 (likely product titles)
-h2s = soup.find_all('h2')
-print(f"\nH2 elements: {len(h2s)}")
-if h2s:
-    for i, h2 in enumerate(h2s[:3]):
-        print(f"  H2 {i}: {h2.get_text(strip=True)[:100]}")
-
-# Try to find links to product pages
-product_links = soup.find_all('a', href=re.compile(r'/parts/.*make/ford'))
-print(f"\nLinks to product pages: {len(product_links)}")
-if product_links:
-    for i, link in enumerate(product_links[:5]):
-        print(f"  Link {i}: {link.get_text(strip=True)[:80]}")
-        print(f"    URL: {link.get('href')[:100]}")
-
-# Save HTML for inspection
-with open('debug_summit.html', 'w', encoding='utf-8') as f:
-    # Save first 20000 chars to avoid huge file
-    f.write(response.text[:20000])
-    f.write("\n\n... (truncated) ...\n")
-
-print("\nHTML sample saved to debug_summit.html")
+DEFAULT_CARDS = 5
+CHUNK_SIZE = 16 * 1024
+
+# Selectors the extractors use (tmp/extract_first100.py, extractSummitCamshafts.py)
+# and whether a crawl is pointless without them
+PROBE_SELECTORS = {
+    "div.item.row": True,
+    "p.item-part-number span": True,
+    "p.item-description": True,
+    "h2": False,
+    'div[class*="product"]': False,
+    'div[class*="item"]': False,
+    "a[href*=/parts/...make/ford]": False,
+}
+
+PRODUCT_LINK = re.compile(r'/parts/.*make/ford')
+
+# Only layout elements go into the fingerprint; spans, icons and images vary
+# from card to card (reviews, badges, promos)
+FINGERPRINT_TAGS = ("div", "h2", "p", "a")
+# Present only on some cards (those with reviews)
+OPTIONAL_CLASSES = {"results-review"}
+
+
+def fetch_listing(url=BASE_URL):
+    import requests
+
+    print("Fetching page...")
+    response = requests.get(url, headers=headers, timeout=10)
+    response.raise_for_status()
+    return response.text
+
+
+def report_structure(html):
+    """Print which of the selectors the extractors rely on match this page."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Find the main product area
+    print("\n=== Looking for product containers ===")
+
+    # Try to find any div with "product" in class
+    divs_with_product = soup.find_all('div', class_=re.compile(r'product', re.IGNORECASE))
+    print(f"Divs with 'product' in class: {len(divs_with_product)}")
+    if divs_with_product:
+        print(f"First div: {divs_with_product[0]}")
+
+    # Try to find h2 (likely product titles)
+    h2s = soup.find_all('h2')
+    print(f"\nH2 elements: {len(h2s)}")
+    if h2s:
+        for i, h2 in enumerate(h2s[:3]):
+            print(f"  H2 {i}: {h2.get_text(strip=True)[:100]}")
+
+    # Try to find links to product pages
+    product_links = soup.find_all('a', href=re.compile(r'/parts/.*make/ford'))
+    print(f"\nLinks to product pages: {len(product_links)}")
+    if product_links:
+        for i, link in enumerate(product_links[:5]):
+            print(f"  Link {i}: {link.get_text(strip=True)[:80]}")
+            print(f"    URL: {link.get('href')[:100]}")
+
+
+class LayoutProbe(HTMLParser):
+    """
+    Incremental parser that counts PROBE_SELECTORS hits and records each
+    product card's tag.class tokens, until `cards` cards are complete.
+    """
+
+    def __init__(self, cards: int):
+        super().__init__(convert_charrefs=True)
+        self.cards = cards
+        self.hits = dict.fromkeys(PROBE_SELECTORS, 0)
+        self.card_tokens = []
+        self.done = False
+        self._div_depth = 0
+        self._card_depth = None
+        self._in_part_number = False
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+
+        if tag == "div":
+            self._div_depth += 1
+            class_text = attrs.get("class") or ""
+            if "item" in classes and "row" in classes:
+                self.hits["div.item.row"] += 1
+                if self._card_depth is None:
+                    self._card_depth = self._div_depth
+                    # Root as div.item.row, whatever extra classes (promoted-brand) it has
+                    self.card_tokens.append({"div.item.row"})
+            if "product" in class_text.lower():
+                self.hits['div[class*="product"]'] += 1
+            if "item" in class_text:
+                self.hits['div[class*="item"]'] += 1
+        elif tag == "h2":
+            self.hits["h2"] += 1
+        elif tag == "a" and PRODUCT_LINK.search(attrs.get("href") or ""):
+            self.hits["a[href*=/parts/...make/ford]"] += 1
+        elif tag == "p":
+            if "item-description" in classes:
+                self.hits["p.item-description"] += 1
+            if "item-part-number" in classes:
+                self._in_part_number = True
+        elif tag == "span" and self._in_part_number:
+            self.hits["p.item-part-number span"] += 1
+
+        if self._card_depth is not None and tag in FINGERPRINT_TAGS and not OPTIONAL_CLASSES.intersection(classes):
+            # Digits stripped so column widths (small-24, large-6) don't count
+            self.card_tokens[-1].add(".".join([tag, *sorted(re.sub(r"\d+", "#", name) for name in classes)]))
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        if tag == "p":
+            self._in_part_number = False
+        if tag == "div":
+            if self._card_depth is not None and self._div_depth == self._card_depth:
+                self._card_depth = None
+                self.done = len(self.card_tokens) >= self.cards
+            self._div_depth = max(self._div_depth - 1, 0)
+
+    def handle_startendtag(self, tag, attrs):
+        # <img ... /> etc.: counted, but no end tag to wait for
+        self.handle_starttag(tag, attrs)
+        if tag == "div" and not self.done:
+            self._div_depth = max(self._div_depth - 1, 0)
+
+    def fingerprint(self) -> str:
+        """Short hash of the tag.class tokens the probed cards all share."""
+        cards = self.card_tokens[:self.cards]
+        shared = set.intersection(*cards) if cards else set()
+        return hashlib.sha1("\n".join(sorted(shared)).encode()).hexdigest()[:12]
+
+
+def iter_chunks(url=BASE_URL, file=None, chunk_size=CHUNK_SIZE):
+    """Text chunks of a local file or a streamed response."""
+    if file:
+        with open(file, encoding='utf-8') as f:
+            yield from iter(lambda: f.read(chunk_size), "")
+        return
+
+    import requests
+
+    with requests.get(url, headers=headers, timeout=10, stream=True) as response:
+        response.raise_for_status()
+        response.encoding = response.encoding or 'utf-8'
+        yield from response.iter_content(chunk_size=chunk_size, decode_unicode=True)
+
+
+def probe_layout(url=BASE_URL, cards=DEFAULT_CARDS, file=None, chunk_size=CHUNK_SIZE) -> dict:
+    """Feed chunks to a LayoutProbe until `cards` cards are seen (or the page ends)."""
+    probe = LayoutProbe(cards)
+    start = time.perf_counter()
+    read = 0
+    chunks = iter_chunks(url, file, chunk_size)
+    for chunk in chunks:
+        read += len(chunk.encode('utf-8'))
+        probe.feed(chunk)
+        if probe.done:
+            # Closing the generator closes the response, so the rest is never downloaded
+            chunks.close()
+            break
+    return {
+        "cards": min(len(probe.card_tokens), cards),
+        "complete": probe.done,
+        "bytes": read,
+        "seconds": time.perf_counter() - start,
+        "hits": probe.hits,
+        "fingerprint": probe.fingerprint(),
+    }
+
+
+def report_probe(result: dict, cards: int, expect=None) -> bool:
+    """Print the probe result; True if a crawl can go ahead."""
+    print(f"\n=== Layout probe ({result['bytes'] / 1024:.0f} KB read in {result['seconds']:.2f}s) ===")
+    print(f"Cards: {result['cards']}/{cards}" + ("" if result["complete"] else " (page ended first)"))
+    for selector, count in result["hits"].items():
+        required = PROBE_SELECTORS[selector]
+        status = "MISSING" if required and not count else ("required" if required else "")
+        print(f"  {selector:32} {count:5d}  {status}")
+    print(f"Layout fingerprint: {result['fingerprint']}")
+
+    ok = result["complete"] and all(result["hits"][selector] for selector, required in PROBE_SELECTORS.items() if required)
+    if expect and expect != result["fingerprint"]:
+        print(f"Fingerprint differs from expected {expect}: the card layout has changed")
+        ok = False
+    print("Layout OK" if ok else "Layout check FAILED")
+    return ok
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Examine the HTML structure of a Summit Racing listing.")
+    parser.add_argument("--url", default=BASE_URL, help="Listing page to examine.")
+    parser.add_argument("--probe", action="store_true", help="Stream the page and stop after --cards cards.")
+    parser.add_argument("--cards", type=int, default=DEFAULT_CARDS, help=f"Cards to probe (default: {DEFAULT_CARDS}).")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help=f"Bytes per read (default: {CHUNK_SIZE}).")
+    parser.add_argument("--file", help="Probe a saved page instead of fetching --url.")
+    parser.add_argument("--expect", help="Fingerprint from a known-good run; a mismatch fails the probe.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.probe:
+        result = probe_layout(args.url, args.cards, args.file, args.chunk_size)
+        sys.exit(0 if report_probe(result, args.cards, args.expect) else 1)
+
+    html = fetch_listing(args.url)
+    report_structure(html)
+
+    # Save HTML for inspection
+    with open('debug_summit.html', 'w', encoding='utf-8') as f:
+        # Save first 20000 chars to avoid huge file
+        f.write(html[:20000])
+        f.write("\n\n... (truncated) ...\n")
+
+    print("\nHTML sample saved to debug_summit.html")
+
+
+if __name__ == '__main__':
+    main()
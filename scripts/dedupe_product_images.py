@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate finder for product images
+
+Computes a 64-bit difference hash (dHash) for every image under the shop
+image folders, indexes them in a BK-tree and groups images whose hashes are
+within a small Hamming distance. The best copy in each group (largest pixel
+area, then shortest path) becomes the canonical file.
+
+With --apply, duplicates that are byte-identical to the canonical (same
+SHA-256) are replaced by hardlinks to it; files that only look alike are
+never touched, since they may be different source images. An SQL file
+rewrites image_url references of byte-identical duplicates to the canonical
+URL so the CDN caches one object per photo; the UPDATEs for look-alikes are
+written commented out, for review.
+
+Requirements:
+    pip install pillow
+
+Usage:
+    python scripts/dedupe_product_images.py [--threshold 6] [--apply]
+"""
+
+import sys
+import os
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from image_store import file_sha256
+
+try:
+    from PIL import Image
+except ImportError:
+    print("ERROR: Pillow not installed. Run: pip install pillow")
+    sys.exit(1)
+
+PUBLIC_DIR = Path(__file__).parent.parent / "public"
+SHOP_DIR = PUBLIC_DIR / "shop"
+SOURCE_DIRS = [SHOP_DIR / "afr-images", SHOP_DIR / "extracted", SHOP_DIR / "afr-heads"]
+REPORT_FILE = SHOP_DIR / "image_duplicates.json"
+SQL_FILE = SHOP_DIR / "image_dedupe_updates.sql"
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp", ".gif", ".bmp"}
+DEFAULT_THRESHOLD = 6
+
+
+def dhash(path: str) -> tuple:
+    """Worker: return (path, 64-bit dHash, pixel area) for one image."""
+    with Image.open(path) as img:
+        width, height = img.size
+        # 9x8 grayscale thumbnail; each bit says whether a pixel is brighter than its right neighbour
+        small = img.convert("L").resize((9, 8), Image.LANCZOS)
+    pixels = small.tobytes()
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            bits = (bits << 1) | (left > right)
+    return path, bits, width * height
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over hashes with Hamming distance.
+    A radius query only descends into children whose edge distance is
+    within [d - radius, d + radius], so most of the tree is never visited.
+    """
+
+    def __init__(self):
+        self.root = None
+
+    def add(self, value: int, item):
+        node = [value, item, {}]
+        if self.root is None:
+            self.root = node
+            return
+        current = self.root
+        while True:
+            dist = hamming(value, current[0])
+            child = current[2].get(dist)
+            if child is None:
+                current[2][dist] = node
+                return
+            current = child
+
+    def query(self, value: int, radius: int) -> list:
+        """Return [(distance, item), ...] for every entry within radius."""
+        found = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node_value, item, children = stack.pop()
+            dist = hamming(value, node_value)
+            if dist <= radius:
+                found.append((dist, item))
+            for edge, child in children.items():
+                if dist - radius <= edge <= dist + radius:
+                    stack.append(child)
+        return found
+
+
+def find_images(source_dirs: list) -> list:
+    images = []
+    for source_dir in source_dirs:
+        if source_dir.exists():
+            images.extend(
+                p for p in sorted(source_dir.rglob("*"))
+                if p.is_file() and p.suffix.lower() in IMAGE_EXTENSIONS
+            )
+    return images
+
+
+def group_duplicates(hashed: list, threshold: int) -> dict:
+    """
+    Map canonical path -> [(duplicate path, distance), ...].
+    Images are visited best-first, so whichever image founds a group is the
+    copy we keep.
+    """
+    hashed = sorted(hashed, key=lambda h: (-h[2], len(h[0]), h[0]))
+    tree = BKTree()
+    groups = {}
+    for path, bits, _area in hashed:
+        matches = tree.query(bits, threshold)
+        if matches:
+            dist, canonical = min(matches)
+            groups[canonical].append((path, dist))
+        else:
+            tree.add(bits, path)
+            groups[path] = []
+    return {canonical: dups for canonical, dups in groups.items() if dups}
+
+
+def public_url(path: Path) -> str:
+    return "/" + path.relative_to(PUBLIC_DIR).as_posix()
+
+
+def replace_with_hardlink(canonical: Path, duplicate: Path) -> bool:
+    """Swap the duplicate for a hardlink to the canonical file; False if not possible."""
+    if os.path.samefile(canonical, duplicate):
+        return True
+    tmp = duplicate.with_name(f".{duplicate.name}.link")
+    try:
+        os.link(canonical, tmp)
+    except OSError:
+        return False
+    os.replace(tmp, duplicate)
+    return True
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Find and collapse near-duplicate product images.")
+    parser.add_argument("--threshold", type=int, default=DEFAULT_THRESHOLD,
+                        help="Maximum Hamming distance between dHashes to count as a duplicate.")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes for hashing (0 = one per CPU core).")
+    parser.add_argument("--apply", action="store_true",
+                        help="Hardlink byte-identical duplicates to their canonical file.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    images = find_images(SOURCE_DIRS)
+    print(f"Hashing {len(images)} images...")
+
+    hashed = []
+    with ProcessPoolExecutor(max_workers=args.workers or os.cpu_count() or 1) as pool:
+        futures = [pool.submit(dhash, str(p)) for p in images]
+        for future in futures:
+            try:
+                hashed.append(future.result())
+            except Exception as e:
+                print(f"  Error hashing image: {e}")
+
+    groups = group_duplicates(hashed, args.threshold)
+
+    report = []
+    redundant_bytes = {"identical": 0, "near": 0}
+    linked = 0
+    for canonical, dups in sorted(groups.items()):
+        canonical_path = Path(canonical)
+        print(f"\n  {public_url(canonical_path)}")
+        entry = {"canonical": public_url(canonical_path), "duplicates": []}
+        canonical_sha = None
+        for dup, dist in sorted(dups):
+            dup_path = Path(dup)
+            size = 0 if os.path.samefile(canonical_path, dup_path) else dup_path.stat().st_size
+            identical = False
+            if canonical_path.stat().st_size == dup_path.stat().st_size:
+                canonical_sha = canonical_sha or file_sha256(canonical_path)
+                identical = file_sha256(dup_path) == canonical_sha
+            redundant_bytes["identical" if identical else "near"] += size
+            entry["duplicates"].append({"path": public_url(dup_path), "distance": dist, "bytes": size,
+                                        "identical": identical})
+            print(f"    {'=' if identical else '~'} {public_url(dup_path)} (distance {dist}, {size:,} bytes)")
+            if args.apply and identical:
+                linked += replace_with_hardlink(canonical_path, dup_path)
+        report.append(entry)
+
+    with open(REPORT_FILE, "w") as f:
+        json.dump({"threshold": args.threshold, "redundant_bytes": redundant_bytes, "groups": report}, f, indent=2)
+
+    with open(SQL_FILE, "w") as f:
+        f.write("-- Point product images at the canonical copy of each duplicate group\n")
+        f.write("-- Generated by scripts/dedupe_product_images.py\n")
+        f.write("-- Byte-identical duplicates are rewritten; look-alikes (~) are left commented\n")
+        f.write("-- out, since they may be different photos: review before enabling them.\n\n")
+        for entry in report:
+            for dup in entry["duplicates"]:
+                if not dup["identical"]:
+                    f.write(f"-- ~ distance {dup['distance']}\n-- ")
+                f.write(f"UPDATE cse_parts_products SET image_url = '{entry['canonical']}' "
+                        f"WHERE image_url = '{dup['path']}';\n")
+
+    print("\n" + "="*60)
+    print("DEDUPE SUMMARY")
+    print("="*60)
+    print(f"Images hashed: {len(hashed)}")
+    print(f"Duplicate groups: {len(report)} ({sum(len(e['duplicates']) for e in report)} duplicates)")
+    print(f"Redundant bytes (byte-identical, removable): {redundant_bytes['identical']:,}")
+    print(f"Near-duplicate bytes (look-alikes, kept): {redundant_bytes['near']:,}")
+    if args.apply:
+        print(f"Hardlinked: {linked} (byte-identical only; near-duplicates left in place)")
+    print(f"Report: {REPORT_FILE}")
+    print(f"SQL: {SQL_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,19 @@
 #!/usr/bin/env python3
 """
 Extract Ford Small Block Windsor camshaft data from Summit Racing
+
+requests and BeautifulSoup are imported by the functions that need them, so
+the parsing helpers can be imported (e.g. by camspec_ingest.py or worker
+processes) without loading either.
 """
 
-import requests
-from bs4 import BeautifulSoup
 import re
 import time
 from urllib.parse import urljoin
 import json
+import os
+
+from ingest_metrics import METRICS, timed
 
 # Base URL for Summit Racing Ford SBF Windsor camshafts
 BASE_URL = "https://www.summitracing.com/search/make/ford/engine-family/ford-small-block-windsor/part-type/camshafts"
@@ -122,6 +127,7 @@ def extract_brand(title):
     
     return 'Unknown'
 
+@timed("parse_listing")
 def parse_product_listing(product_div):
     """Parse a single product listing from the HTML"""
     try:
@@ -175,9 +181,11 @@ def parse_product_listing(product_div):
             return None
         
         # Extract specs from description text
-        duration_int, duration_exh, lift_int, lift_exh = extract_duration_and_lift(product_text)
-        lsa = extract_lsa(product_text)
+        with METRICS.stage("extract_specs"):
+            duration_int, duration_exh, lift_int, lift_exh = extract_duration_and_lift(product_text)
+            lsa = extract_lsa(product_text)
         
+        METRICS.count("parse_listing", records=1)
         return {
             'brand': brand,
             'part_number': part_number,
@@ -191,10 +199,14 @@ def parse_product_listing(product_div):
         }
     except Exception as e:
         print(f"Error parsing product: {e}")
+        METRICS.count("parse_listing", errors=1)
         return None
 
+@timed("fetch")
 def fetch_page(page_num=1, items_per_page=25):
     """Fetch a single page of results"""
+    import requests
+    
     # Try different pagination methods
     urls_to_try = [
         f"{BASE_URL}?page={page_num}",
@@ -212,13 +224,71 @@ def fetch_page(page_num=1, items_per_page=25):
             print(f"Fetching: {url}")
             response = requests.get(url, headers=headers, timeout=10)
             response.raise_for_status()
+            METRICS.count("fetch", records=1, bytes=len(response.content))
             return response.text
         except Exception as e:
             print(f"Error fetching {url}: {e}")
+            METRICS.count("fetch", errors=1)
             continue
     
     return None
 
+def parse_listing_page(html):
+    """
+    Parse one listing page. Returns (number of product elements found,
+    [camshaft dicts]) with cards that did not parse left out.
+    """
+    from bs4 import BeautifulSoup
+    
+    with METRICS.stage("html_parse"):
+        soup = BeautifulSoup(html, 'html.parser')
+    METRICS.count("html_parse", bytes=len(html))
+    
+    # Find all product divs/links - try multiple selectors
+    products = []
+    
+    # Try finding product containers
+    for selector in ['div[class*="product"]', 'div[class*="item"]', 'h2', 'a[href*="/parts/"]']:
+        if selector == 'h2':
+            # Find h2 headers (likely product titles)
+            h2s = soup.find_all('h2')
+            if h2s:
+                products = h2s
+                break
+        elif selector.startswith('a'):
+            # Find all product links
+            all_links = soup.find_all('a', href=re.compile(r'/parts/.*make/ford'))
+            if all_links:
+                products = all_links
+                break
+        else:
+            found = soup.find_all(selector)
+            if found:
+                products = found
+                break
+    
+    # If still no products, try finding any links with part numbers
+    if not products:
+        all_links = soup.find_all('a', href=True)
+        products = [link for link in all_links if '/parts/' in link.get('href', '') and '/make/ford' in link.get('href', '')]
+    
+    camshafts = []
+    for product in products:
+        # For h2 elements or other non-div elements, get parent or adjacent elements
+        if product.name == 'h2':
+            # Get parent div
+            parent = product.find_parent('div')
+            if parent:
+                camshaft = parse_product_listing(parent)
+            else:
+                camshaft = parse_product_listing(product)
+        else:
+            camshaft = parse_product_listing(product)
+        if camshaft:
+            camshafts.append(camshaft)
+    
+    return len(products), camshafts
+
 def extract_all_camshafts():
     """Extract all camshafts from all pages"""
     all_camshafts = []
@@ -234,61 +304,21 @@ def extract_all_camshafts():
             print(f"Failed to fetch page {page}, stopping.")
             break
         
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Find all product divs/links - try multiple selectors
-        products = []
-        
-        # Try finding product containers
-        for selector in ['div[class*="product"]', 'div[class*="item"]', 'h2', 'a[href*="/parts/"]']:
-            if selector == 'h2':
-                # Find h2 headers (likely product titles)
-                h2s = soup.find_all('h2')
-                if h2s:
-                    products = h2s
-                    break
-            elif selector.startswith('a'):
-                # Find all product links
-                all_links = soup.find_all('a', href=re.compile(r'/parts/.*make/ford'))
-                if all_links:
-                    products = all_links
-                    break
-            else:
-                found = soup.find_all(selector)
-                if found:
-                    products = found
-                    break
-        
-        # If still no products, try finding any links with part numbers
-        if not products:
-            all_links = soup.find_all('a', href=True)
-            products = [link for link in all_links if '/parts/' in link.get('href', '') and '/make/ford' in link.get('href', '')]
+        product_count, camshafts = parse_listing_page(html)
         
-        if not products:
+        if not product_count:
             print(f"No products found on page {page}, might be end of results.")
             break
         
-        print(f"Found {len(products)} product elements on page {page}")
+        print(f"Found {product_count} product elements on page {page}")
         
         page_camshafts = 0
-        for product in products:
-            # For h2 elements or other non-div elements, get parent or adjacent elements
-            if product.name == 'h2':
-                # Get parent div
-                parent = product.find_parent('div')
-                if parent:
-                    camshaft = parse_product_listing(parent)
-                else:
-                    camshaft = parse_product_listing(product)
-            else:
-                camshaft = parse_product_listing(product)
-            
-            if camshaft:
-                # Deduplicate by part number
-                if camshaft['part_number'] not in seen_part_numbers:
-                    all_camshafts.append(camshaft)
-                    seen_part_numbers.add(camshaft['part_number'])
-                    page_camshafts += 1
+        for camshaft in camshafts:
+            # Deduplicate by part number
+            if camshaft['part_number'] not in seen_part_numbers:
+                all_camshafts.append(camshaft)
+                seen_part_numbers.add(camshaft['part_number'])
+                page_camshafts += 1
         
         print(f"Extracted {page_camshafts} new camshafts from page {page}")
         
@@ -311,11 +341,12 @@ def generate_sql_insert(camshaft):
     url = camshaft['url'].replace("'", "''")
     brand = camshaft['brand'].replace("'", "''")
     
-    dur_int = camshaft['duration_int'] if camshaft['duration_int'] else 'NULL'
-    dur_exh = camshaft['duration_exh'] if camshaft['duration_exh'] else 'NULL'
-    lsa = camshaft['lsa'] if camshaft['lsa'] else 'NULL'
-    lift_int = camshaft['lift_int'] if camshaft['lift_int'] else 'NULL'
-    lift_exh = camshaft['lift_exh'] if camshaft['lift_exh'] else 'NULL'
+    # Only a missing value is NULL; a real 0 stays 0
+    dur_int = camshaft['duration_int'] if camshaft['duration_int'] is not None else 'NULL'
+    dur_exh = camshaft['duration_exh'] if camshaft['duration_exh'] is not None else 'NULL'
+    lsa = camshaft['lsa'] if camshaft['lsa'] is not None else 'NULL'
+    lift_int = camshaft['lift_int'] if camshaft['lift_int'] is not None else 'NULL'
+    lift_exh = camshaft['lift_exh'] if camshaft['lift_exh'] is not None else 'NULL'
     
     return (f"('Ford', 'Ford Small Block Windsor', '{brand}', '{camshaft['part_number']}', "
             f"'{name}', {dur_int}, {dur_exh}, {lsa}, {lift_int}, {lift_exh}, "
@@ -333,14 +364,15 @@ def main():
     
     if camshafts:
         # Save as JSON for reference
-        with open('extracted_camshafts.json', 'w') as f:
-            json.dump(camshafts, f, indent=2)
+        with METRICS.stage("write"):
+            with open('extracted_camshafts.json', 'w') as f:
+                json.dump(camshafts, f, indent=2)
         
         # Generate SQL inserts
         sql_lines = [generate_sql_insert(cam) for cam in camshafts]
         
         # Write SQL file
-        with open('summit_new_camshafts.sql', 'w') as f:
+        with METRICS.stage("write"), open('summit_new_camshafts.sql', 'w') as f:
             f.write("-- New Ford Small Block Windsor Camshafts from Summit Racing\n")
             f.write("-- Auto-generated extraction\n\n")
             f.write("INSERT INTO public.cse_generic_cams\n")
@@ -349,6 +381,8 @@ def main():
             f.write("VALUES\n")
             f.write(",\n".join(sql_lines))
             f.write(";\n")
+        METRICS.count("write", records=len(camshafts),
+                      bytes=os.path.getsize('extracted_camshafts.json') + os.path.getsize('summit_new_camshafts.sql'))
         
         print(f"\nSQL file saved to: summit_new_camshafts.sql")
         print(f"JSON file saved to: extracted_camshafts.json")
@@ -359,6 +393,8 @@ def main():
             print(f"  {sql}")
     else:
         print("No new camshafts extracted!")
+    
+    METRICS.write(".", job="crawl")
 
 if __name__ == '__main__':
     main()
@@ -6,48 +6,38 @@ Extracts images from AFR dealer catalog PDF and attempts to match them
 to part numbers for the cylinder heads database.
 
 Requirements:
-    pip install pymupdf pillow
+    pip install pymupdf
 
 Usage:
-    python scripts/extract_afr_catalog_images.py <path_to_catalog.pdf>
+    python scripts/extract_afr_catalog_images.py <path_to_catalog.pdf> [--workers N] [--full]
+    python scripts/extract_afr_catalog_images.py <catalog_dir> [--workers N] [--catalog parts.csv]
+
+Re-runs against the same output directory only reprocess pages whose text
+or images changed (tracked in extract_manifest.json).
+
+Given a directory, every PDF in it is processed (up to --workers at once),
+each into its own subfolder of public/shop/extracted/, and a merged report
+is written to public/shop/extracted/batch_report.json and
+batch_suggested_updates.sql.
+
+Part numbers come from the shared part catalog (see part_catalog.py).
 """
 
 import sys
 import os
 import re
 import json
+import hashlib
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-try:
-    import fitz  # PyMuPDF
-except ImportError:
-    print("ERROR: PyMuPDF not installed. Run: pip install pymupdf")
-    sys.exit(1)
-
-try:
-    from PIL import Image
-except ImportError:
-    print("ERROR: Pillow not installed. Run: pip install pillow")
-    sys.exit(1)
-
-# AFR part numbers from our seed file
-AFR_PART_NUMBERS = [
-    # SBC
-    "1011", "1012", "1016", "0911", "0916", "908", "1034", "1036", "1095-716",
-    "1050", "1054", "1100", "1065", "1110", "1068", "1121", "1132-TI", "1137-TI",
-    # SBF
-    "1351", "1352", "1402", "1472", "1422", "1420", "1426-716", "1428-716", "1450", "1451",
-    # LS Cathedral
-    "1501", "1502", "1506", "1510", "1530", "1610", "1680",
-    # LS3 Rectangle
-    "1803", "1804", "1840", "1845",
-    # BBC
-    "2000", "2001", "2010-TI", "2015-TI", "2020-TI", "2100", "2101", "2110",
-    # Mopar LA
-    "2401", "2402",
-    # Gen 3 Hemi
-    "2509", "2510", "2505", "2506", "2513", "2514",
-]
+from ingest_metrics import METRICS
+from part_catalog import load_part_catalog, part_numbers
+
+# AFR part numbers from the shared part catalog (scripts/part_catalog.csv)
+AFR_PART_NUMBERS = part_numbers(load_part_catalog())
 
 # Engine family patterns to help categorize images
 ENGINE_PATTERNS = {
@@ -60,128 +50,604 @@ ENGINE_PATTERNS = {
     "Hemi": [r"hemi", r"gen 3", r"5\.7", r"6\.1"],
 }
 
-OUTPUT_DIR = Path(__file__).parent.parent / "public" / "shop" / "extracted"
+# cse_parts_products.brand of the catalog's heads (see migrations/032)
+AFR_BRAND = "Air Flow Research"
+
+PUBLIC_DIR = Path(__file__).parent.parent / "public"
+OUTPUT_DIR = PUBLIC_DIR / "shop" / "extracted"
 
 
-def extract_images_from_pdf(pdf_path: str) -> dict:
+def _trie_pattern(words) -> str:
     """
-    Extract all images from PDF along with nearby text context.
-    Returns dict mapping image data to potential part numbers.
+    Build a regex from a prefix trie of `words`, so thousands of part numbers
+    cost one walk per text position instead of one alternative per part.
     """
-    doc = fitz.open(pdf_path)
-    extracted = []
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word.upper():
+            node = node.setdefault(ch, {})
+        node[""] = {}
     
-    print(f"Processing {len(doc)} pages...")
+    def build(node) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Optional tail: the trie walk is greedy, so the longest part number wins
+        return f"(?:{body})?" if "" in node else body
     
-    for page_num, page in enumerate(doc):
-        print(f"  Page {page_num + 1}/{len(doc)}...", end=" ")
-        
-        # Get all text from the page for context
-        page_text = page.get_text()
+    return build(trie)
+
+
+def part_number_pattern(part_numbers) -> str:
+    """Anchored pattern so short codes like 908 do not match inside longer numbers."""
+    return rf"(?<![\w.-]){_trie_pattern(part_numbers)}(?![\w-])"
+
+
+def build_family_matcher(engine_patterns):
+    """
+    Compile every engine family cue into a single pattern, one named group
+    each (f0, f1, ...) in the priority order of `engine_patterns`. The cues
+    are lookaheads so they consume nothing: a cue like "enforcer.*chevy"
+    must not hide the part numbers or other cues inside it.
+    """
+    alternatives = []
+    for i, patterns in enumerate(engine_patterns.values()):
+        alternatives.append(f"(?=(?P<f{i}>" + "|".join(f"(?:{p})" for p in patterns) + "))")
+    return re.compile("|".join(alternatives), re.IGNORECASE)
+
+
+FAMILY_ORDER = list(ENGINE_PATTERNS)
+
+
+def configure_parts(part_numbers_list):
+    """
+    (Re)build the matchers for a part number list. Also used as the worker
+    initializer so pool processes match against the same catalog as the parent.
+    """
+    global AFR_PART_NUMBERS, PART_MATCHER, PART_LOOKUP
+    AFR_PART_NUMBERS = list(part_numbers_list)
+    PART_MATCHER = re.compile(part_number_pattern(AFR_PART_NUMBERS), re.IGNORECASE)
+    PART_LOOKUP = {part.upper(): part for part in AFR_PART_NUMBERS}
+
+
+FAMILY_MATCHER = build_family_matcher(ENGINE_PATTERNS)
+configure_parts(AFR_PART_NUMBERS)
+
+
+def scan_page_text(page_text: str):
+    """
+    One pass over the page text for part numbers and one for family cues.
+    Returns (found_parts, detected_family, part_positions) where
+    part_positions maps each part number to its character offsets.
+    """
+    part_positions = {}
+    families_seen = set()
+    
+    for match in PART_MATCHER.finditer(page_text):
+        part = PART_LOOKUP[match.group().upper()]
+        part_positions.setdefault(part, []).append(match.start())
+    for match in FAMILY_MATCHER.finditer(page_text):
+        families_seen.add(int(match.lastgroup[1:]))
+    
+    detected_family = FAMILY_ORDER[min(families_seen)] if families_seen else None
+    return list(part_positions), detected_family, part_positions
+
+
+# Labels further than this (in PDF points, 72 per inch) from an image are
+# not considered to belong to it
+MAX_LABEL_DISTANCE = 150
+
+
+class LabelGrid:
+    """
+    Uniform grid over the part-number labels of one page.
+    Nearest-label queries only visit the cells around the image, growing
+    ring by ring, so a page with dozens of products does not compare every
+    image against every label.
+    """
+    
+    def __init__(self, labels, cell_size: float = 72.0):
+        self.cell_size = cell_size
+        self.cells = {}
+        for part, x, y in labels:
+            self.cells.setdefault(self._cell(x, y), []).append((part, x, y))
+        self.max_ring = 0
+        if self.cells:
+            xs = [cx for cx, _ in self.cells]
+            ys = [cy for _, cy in self.cells]
+            self.bounds = (min(xs), min(ys), max(xs), max(ys))
+    
+    def _cell(self, x: float, y: float) -> tuple:
+        return int(x // self.cell_size), int(y // self.cell_size)
+    
+    @staticmethod
+    def _distance(rect, x: float, y: float) -> float:
+        """Distance from a point to the nearest edge of rect (0 if inside)."""
+        dx = max(rect[0] - x, 0, x - rect[2])
+        dy = max(rect[1] - y, 0, y - rect[3])
+        return (dx * dx + dy * dy) ** 0.5
+    
+    def nearest(self, rect, max_distance: float = MAX_LABEL_DISTANCE):
+        """Return (part, distance) of the label closest to rect, or (None, None)."""
+        if not self.cells:
+            return None, None
         
-        # Find part numbers mentioned on this page
-        found_parts = []
-        for part_num in AFR_PART_NUMBERS:
-            # Escape special regex chars in part number
-            pattern = re.escape(part_num)
-            if re.search(pattern, page_text, re.IGNORECASE):
-                found_parts.append(part_num)
+        cx0, cy0 = self._cell(rect[0], rect[1])
+        cx1, cy1 = self._cell(rect[2], rect[3])
+        min_x, min_y, max_x, max_y = self.bounds
+        best_part, best_dist = None, None
+        ring = 0
         
-        # Detect engine family from page text
-        detected_family = None
-        for family, patterns in ENGINE_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, page_text, re.IGNORECASE):
-                    detected_family = family
-                    break
-            if detected_family:
+        while True:
+            x_lo, y_lo, x_hi, y_hi = cx0 - ring, cy0 - ring, cx1 + ring, cy1 + ring
+            for cx in range(max(x_lo, min_x), min(x_hi, max_x) + 1):
+                for cy in range(max(y_lo, min_y), min(y_hi, max_y) + 1):
+                    # Only the outer ring of cells is new on each pass
+                    if ring and x_lo < cx < x_hi and y_lo < cy < y_hi:
+                        continue
+                    for part, x, y in self.cells.get((cx, cy), ()):
+                        dist = self._distance(rect, x, y)
+                        if best_dist is None or dist < best_dist:
+                            best_part, best_dist = part, dist
+            
+            # Anything in later rings is at least `ring` cells away
+            reach = ring * self.cell_size
+            if best_dist is not None and best_dist <= reach:
+                break
+            if reach > max_distance or (x_lo <= min_x and y_lo <= min_y and x_hi >= max_x and y_hi >= max_y):
                 break
+            ring += 1
+        
+        if best_dist is None or best_dist > max_distance:
+            return None, None
+        return best_part, round(best_dist, 1)
+
+
+def build_label_grid(page) -> LabelGrid:
+    """Index the centers of every word on the page that is a known part number."""
+    labels = []
+    for x0, y0, x1, y1, word, *_ in page.get_text("words"):
+        match = PART_MATCHER.search(word)
+        if match:
+            labels.append((PART_LOOKUP[match.group().upper()], (x0 + x1) / 2, (y0 + y1) / 2))
+    return LabelGrid(labels)
+
+
+def open_pdf(pdf_path: str):
+    """
+    Open a PDF with PyMuPDF. Imported on first use, so this module (and the
+    ingest CLI) can be imported without PyMuPDF installed.
+    """
+    try:
+        import fitz  # PyMuPDF
+    except ImportError:
+        print("ERROR: PyMuPDF not installed. Run: pip install pymupdf")
+        sys.exit(1)
+    return fitz.open(pdf_path)
+
+
+def page_digest(doc, page_text: str, image_list: list, xref_digests: dict) -> str:
+    """Content hash of a page: its text plus a digest of every image stream it shows."""
+    digest = hashlib.sha1(page_text.encode("utf-8", "replace"))
+    for img_info in image_list:
+        xref = img_info[0]
+        if xref not in xref_digests:
+            # Raw (undecoded) stream bytes are enough to notice a changed image
+            xref_digests[xref] = hashlib.sha1(doc.xref_stream_raw(xref) or b"").hexdigest()
+        digest.update(f"{xref_digests[xref]}:{img_info[2]}x{img_info[3]};".encode())
+    return digest.hexdigest()
+
+
+def _iter_page_images(doc, start: int, stop: int, part_index: dict | None = None,
+                      previous_digests: set | None = None):
+    """
+    Yield candidate images for pages [start, stop) of an open document.
+    Every page starts with a marker {"page", "page_digest", "unchanged"};
+    pages whose digest is in `previous_digests` (wherever that page was in
+    the previous run) are not processed further.
+    If `part_index` is given, every part number hit is recorded into it as
+    part -> [[page, offset], ...].
+    An image already yielded for an earlier page is yielded again for each
+    later page that shows it, without "bytes", so its label match there counts.
+    """
+    seen_xrefs = set()
+    decoded = {}
+    xref_digests = {}
+    previous_digests = previous_digests or set()
+    
+    for page_num in range(start, stop):
+        page = doc[page_num]
+    
+        with METRICS.stage("page_text"):
+            # Get all text from the page for context
+            page_text = page.get_text()
+            image_list = page.get_images(full=True)
+            
+            digest = page_digest(doc, page_text, image_list, xref_digests)
+        METRICS.count("page_text", records=1, bytes=len(page_text))
+        unchanged = digest in previous_digests
+        yield {"page": page_num + 1, "page_digest": digest, "unchanged": unchanged}
+        
+        if unchanged:
+            print(f"  Page {page_num + 1}/{len(doc)}: unchanged, skipped")
+            continue
         
-        # Extract images from this page
-        image_list = page.get_images(full=True)
+        with METRICS.stage("part_match"):
+            # Find part numbers and the engine family in a single scan
+            found_parts, detected_family, part_positions = scan_page_text(page_text)
+            
+            if part_index is not None:
+                for part, offsets in part_positions.items():
+                    part_index.setdefault(part, []).extend([page_num + 1, offset] for offset in offsets)
+            
+            print(f"  Page {page_num + 1}/{len(doc)}: found {len(image_list)} images, {len(found_parts)} parts")
+            
+            # Link each image to the part-number label printed closest to it
+            label_grid = None
+            image_rects = {}
+            if found_parts and image_list:
+                label_grid = build_label_grid(page)
+                for info in page.get_image_info(xrefs=True):
+                    image_rects.setdefault(info["xref"], tuple(info["bbox"]))
+        METRICS.count("part_match", records=len(found_parts))
         
         for img_idx, img_info in enumerate(image_list):
             xref = img_info[0]
             
+            matched_part, label_distance = None, None
+            if label_grid and xref in image_rects:
+                matched_part, label_distance = label_grid.nearest(image_rects[xref])
+            
+            # The same logo/banner object is referenced from many pages;
+            # decode each xref at most once per document (or shard)
+            if xref in seen_xrefs:
+                if xref in decoded:
+                    yield {
+                        "page": page_num + 1,
+                        "index": img_idx,
+                        **decoded[xref],
+                        "found_parts": found_parts,
+                        "matched_part": matched_part,
+                        "label_distance": label_distance,
+                        "engine_family": detected_family,
+                    }
+                continue
+            seen_xrefs.add(xref)
+            
+            # Filter on the dimensions PyMuPDF already reports before decoding anything
+            width, height = img_info[2], img_info[3]
+            
+            # Skip tiny images (likely icons/logos)
+            if width < 100 or height < 100:
+                continue
+            
+            # Skip very large aspect ratios (likely banners/headers)
+            aspect = max(width, height) / min(width, height)
+            if aspect > 5:
+                continue
+            
             try:
-                base_image = doc.extract_image(xref)
-                image_bytes = base_image["image"]
-                image_ext = base_image["ext"]
-                width = base_image["width"]
-                height = base_image["height"]
-                
-                # Skip tiny images (likely icons/logos)
-                if width < 100 or height < 100:
-                    continue
+                with METRICS.stage("image_decode"):
+                    base_image = doc.extract_image(xref)
+                    image_bytes = base_image["image"]
+                    sha1 = hashlib.sha1(image_bytes).hexdigest()
+                METRICS.count("image_decode", records=1, bytes=len(image_bytes))
+                decoded[xref] = {"xref": xref, "width": base_image["width"], "height": base_image["height"],
+                                 "ext": base_image["ext"], "sha1": sha1}
                 
-                # Skip very large aspect ratios (likely banners/headers)
-                aspect = max(width, height) / min(width, height)
-                if aspect > 5:
-                    continue
-                
-                extracted.append({
+                yield {
                     "page": page_num + 1,
                     "index": img_idx,
                     "xref": xref,
-                    "width": width,
-                    "height": height,
-                    "ext": image_ext,
+                    "width": base_image["width"],
+                    "height": base_image["height"],
+                    "ext": base_image["ext"],
                     "bytes": image_bytes,
+                    "sha1": sha1,
                     "found_parts": found_parts,
+                    "matched_part": matched_part,
+                    "label_distance": label_distance,
                     "engine_family": detected_family,
-                    "page_text_snippet": page_text[:500],
-                })
+                }
                 
             except Exception as e:
                 print(f"Error extracting image {xref}: {e}")
-        
-        print(f"found {len(image_list)} images, {len(found_parts)} parts")
+                METRICS.count("image_decode", errors=1)
+
+
+def extract_images_from_pdf(pdf_path: str, part_index: dict | None = None, previous_digests: set | None = None):
+    """
+    Extract candidate images from PDF along with nearby text context.
+    Yields one dict per image that passes the size/aspect filters; the raw
+    bytes only live until the consumer has written them out.
+    """
+    doc = open_pdf(pdf_path)
+    
+    try:
+        print(f"Processing {len(doc)} pages...")
+        yield from _iter_page_images(doc, 0, len(doc), part_index, previous_digests)
+    finally:
+        doc.close()
+
+
+def _extract_page_range(pdf_path: str, start: int, stop: int, staging_dir: str,
+                        previous_digests: set | None = None) -> tuple:
+    """
+    Worker for sharded extraction: open the PDF in this process, handle one
+    contiguous page range and stage the image bytes on disk so only small
+    metadata dicts travel back to the parent.
+    Returns (items, part_index, metrics snapshot) for the range.
+    """
+    METRICS.reset()
+    doc = open_pdf(pdf_path)
+    results = []
+    part_index = {}
     
+    try:
+        for item in _iter_page_images(doc, start, stop, part_index, previous_digests):
+            if "page_digest" in item or "bytes" not in item:
+                results.append(item)
+                continue
+            staged_path = os.path.join(staging_dir, f"p{item['page']}-{item['index']}.{item['ext']}")
+            with METRICS.stage("stage_write"), open(staged_path, "wb") as f:
+                f.write(item.pop("bytes"))
+            item["staged_path"] = staged_path
+            results.append(item)
+    finally:
+        doc.close()
+    
+    return results, part_index, METRICS.snapshot()
+
+
+def extract_images_parallel(pdf_path: str, workers: int, staging_dir: Path, part_index: dict | None = None,
+                            previous_digests: set | None = None):
+    """
+    Page-sharded version of extract_images_from_pdf.
+    Splits the document into contiguous page ranges, processes them in a
+    pool of worker processes and yields items in page order, so the
+    per-family filename counters come out the same as a serial run.
+    """
+    doc = open_pdf(pdf_path)
+    page_count = len(doc)
     doc.close()
-    return extracted
+    
+    # A few shards per worker keeps the pool busy while the ordered merge
+    # waits on the earliest outstanding range
+    shard_count = min(page_count, workers * 4) or 1
+    bounds = [page_count * i // shard_count for i in range(shard_count + 1)]
+    
+    print(f"Processing {page_count} pages in {shard_count} shards across {workers} workers...")
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=configure_parts, initargs=(AFR_PART_NUMBERS,)) as pool:
+        futures = [
+            pool.submit(_extract_page_range, pdf_path, bounds[i], bounds[i + 1], str(staging_dir), previous_digests)
+            for i in range(shard_count)
+        ]
+        for future in futures:
+            items, shard_index, shard_metrics = future.result()
+            METRICS.merge(shard_metrics)
+            if part_index is not None:
+                for part, hits in shard_index.items():
+                    part_index.setdefault(part, []).extend(hits)
+            yield from items
+
+
+def entry_appearances(entry: dict) -> list:
+    """Pages a saved image appears on (manifests from before appearances: just its page)."""
+    if "appearances" in entry:
+        return entry["appearances"]
+    return [{"page": entry["page"], "matched_part": entry["matched_part"],
+             "label_distance": entry["label_distance"], "possible_parts": entry["possible_parts"]}]
 
 
-def save_extracted_images(extracted: list, output_dir: Path) -> list:
+def summarize_appearances(entry: dict):
+    """Set page, possible_parts, matched_part and label_distance from the entry's appearances."""
+    entry["appearances"].sort(key=lambda appearance: appearance["page"])
+    entry["page"] = entry["appearances"][0]["page"]
+    entry["possible_parts"] = list(dict.fromkeys(
+        part for appearance in entry["appearances"] for part in appearance["possible_parts"]))
+    matched = [appearance for appearance in entry["appearances"] if appearance["matched_part"]]
+    best = min(matched, key=lambda appearance: appearance["label_distance"]) if matched else {}
+    entry["matched_part"] = best.get("matched_part")
+    entry["label_distance"] = best.get("label_distance")
+
+
+def save_extracted_images(extracted, output_dir: Path, previous: dict | None = None,
+                          page_digests: dict | None = None) -> list:
     """
     Save extracted images to disk with meaningful filenames.
-    Returns list of saved file info.
+    Consumes `extracted` lazily, writing each image as soon as it arrives,
+    and returns the lightweight metadata of what was saved (no image bytes).
+    
+    An image is saved once however many pages show it (same xref, or the
+    same bytes under another xref). Every page it appears on is recorded in
+    its "appearances" ({page, matched_part, label_distance, possible_parts}),
+    and "page", "matched_part" and "label_distance" summarize them: the
+    first page, and the closest label match on any page.
+    
+    `previous` is the manifest of an earlier run: appearances on pages marked
+    unchanged are kept as they are (found by page digest, so a page that
+    only moved keeps its files and filenames; the appearance gets the new
+    page number), and new filenames continue after its counters. Page
+    digests from the markers are collected into `page_digests`.
     """
     output_dir.mkdir(parents=True, exist_ok=True)
-    saved = []
+    # sha1 -> saved entry, in the order the images were first seen
+    saved = {}
     
     # Group by engine family for better organization
     family_counts = {}
+    repeats = 0
+    
+    # Appearances of the previous run by page digest (first page with that digest only)
+    previous_pages = (previous or {}).get("pages", {})
+    first_page_of = {}
+    for page, digest in sorted(previous_pages.items()):
+        first_page_of.setdefault(digest, page)
+    previous_by_digest = {}
+    for entry in (previous or {}).get("saved", []):
+        family_counts[entry["engine_family"]] = max(family_counts.get(entry["engine_family"], 0), entry["seq"])
+        for appearance in entry_appearances(entry):
+            digest = previous_pages.get(appearance["page"])
+            if first_page_of.get(digest) == appearance["page"]:
+                previous_by_digest.setdefault(digest, []).append((entry, appearance))
     
     for item in extracted:
+        if "page_digest" in item:
+            if page_digests is not None:
+                page_digests[item["page"]] = item["page_digest"]
+            if item["unchanged"]:
+                for entry, appearance in previous_by_digest.get(item["page_digest"], []):
+                    carried = saved.setdefault(entry["sha1"], dict(entry, appearances=[]))
+                    carried["appearances"].append(dict(appearance, page=item["page"]))
+            continue
+        
+        appearance = {
+            "page": item["page"],
+            "matched_part": item["matched_part"],
+            "label_distance": item["label_distance"],
+            "possible_parts": item["found_parts"],
+        }
+        if item["sha1"] in saved:
+            repeats += 1
+            if "staged_path" in item:
+                os.remove(item["staged_path"])
+            saved[item["sha1"]]["appearances"].append(appearance)
+            continue
+        
         family = item["engine_family"] or "unknown"
         family_counts[family] = family_counts.get(family, 0) + 1
         
         # Build filename
-        parts_str = "-".join(item["found_parts"][:3]) if item["found_parts"] else "no-part"
         filename = f"afr-{family.lower()}-p{item['page']}-{family_counts[family]}.{item['ext']}"
         
         filepath = output_dir / filename
         
-        # Save image
-        with open(filepath, "wb") as f:
-            f.write(item["bytes"])
+        # Save image (sharded runs already staged the bytes on disk)
+        with METRICS.stage("write"):
+            if "staged_path" in item:
+                os.replace(item["staged_path"], filepath)
+            else:
+                with open(filepath, "wb") as f:
+                    f.write(item["bytes"])
+        METRICS.count("write", records=1, bytes=os.path.getsize(filepath))
         
-        saved.append({
+        saved[item["sha1"]] = {
             "filename": filename,
             "filepath": str(filepath),
-            "page": item["page"],
             "size": f"{item['width']}x{item['height']}",
             "engine_family": family,
-            "possible_parts": item["found_parts"],
-        })
+            "sha1": item["sha1"],
+            "seq": family_counts[family],
+            "appearances": [appearance],
+        }
         
-        print(f"  Saved: {filename} ({item['width']}x{item['height']}) - Parts: {item['found_parts']}")
+        match_note = f" -> {item['matched_part']}" if item["matched_part"] else ""
+        print(f"  Saved: {filename} ({item['width']}x{item['height']}) - Parts: {item['found_parts']}{match_note}")
     
+    if repeats:
+        print(f"  {repeats} repeated images (identical content) recorded as extra pages of the saved copy")
+    
+    saved = list(saved.values())
+    for entry in saved:
+        summarize_appearances(entry)
     return saved
 
 
+MANIFEST_NAME = "extract_manifest.json"
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(output_dir: Path) -> dict | None:
+    manifest_file = output_dir / MANIFEST_NAME
+    if not manifest_file.exists():
+        return None
+    with open(manifest_file) as f:
+        manifest = json.load(f)
+    # JSON object keys are strings; pages are ints everywhere else
+    manifest["pages"] = {int(page): digest for page, digest in manifest["pages"].items()}
+    return manifest
+
+
+def write_manifest(output_dir: Path, pdf_path: str, pdf_sha256: str, page_digests: dict,
+                   saved: list, part_index: dict):
+    """Record what this run extracted so the next run only redoes changed pages."""
+    manifest = {
+        "pdf": os.path.basename(pdf_path),
+        "pdf_sha256": pdf_sha256,
+        "pages": {str(page): digest for page, digest in sorted(page_digests.items())},
+        "saved": saved,
+        "part_index": part_index,
+    }
+    with open(output_dir / MANIFEST_NAME, "w") as f:
+        json.dump(manifest, f)
+
+
+def remove_stale_images(previous: dict | None, saved: list):
+    """Delete files from the previous run that were not carried forward."""
+    kept = {entry["filename"] for entry in saved}
+    for entry in (previous or {}).get("saved", []):
+        if entry["filename"] not in kept and os.path.exists(entry["filepath"]):
+            os.remove(entry["filepath"])
+
+
+def merge_unchanged_part_hits(part_index: dict, previous: dict | None, moved_pages: dict):
+    """Carry part-index hits for pages skipped this run; moved_pages maps old page -> new page."""
+    for part, hits in (previous or {}).get("part_index", {}).items():
+        carried = [[moved_pages[page], offset] for page, offset in hits if page in moved_pages]
+        if carried:
+            part_index[part] = sorted(part_index.get(part, []) + carried)
+
+
+def save_part_index(part_index: dict, output_dir: Path):
+    """Write the part -> [[page, offset], ...] index for later lookups."""
+    index_file = output_dir / "part_page_index.json"
+    with open(index_file, "w") as f:
+        json.dump(dict(sorted(part_index.items())), f)
+    print(f"Part index saved to: {index_file} ({len(part_index)} part numbers)")
+
+
+def public_url(path: Path) -> str:
+    return "/" + Path(path).relative_to(PUBLIC_DIR).as_posix()
+
+
+def best_part_images(saved: list) -> dict:
+    """
+    part -> saved entry whose image sits closest to that part's label on
+    any page, with page and label_distance set to that appearance.
+    """
+    by_part = {}
+    for item in saved:
+        for appearance in entry_appearances(item):
+            part = appearance["matched_part"]
+            if part and (part not in by_part or appearance["label_distance"] < by_part[part]["label_distance"]):
+                by_part[part] = dict(item, page=appearance["page"], label_distance=appearance["label_distance"],
+                                     matched_part=part)
+    return by_part
+
+
+def part_update_suggestion(part: str, image_url: str) -> str:
+    """
+    Commented-out UPDATE for one part's image, scoped to AFR cylinder heads
+    since other brands reuse the same part numbers. Left for review, like
+    the family suggestions: the match is only a nearest-label guess.
+    """
+    return (f"-- UPDATE cse_parts_products SET image_url = '{image_url}'\n"
+            f"--   WHERE category = 'cylinder_head' AND brand = '{AFR_BRAND}' AND part_number = '{part}';\n")
+
+
 def generate_mapping_report(saved: list, output_dir: Path):
     """Generate a JSON report and SQL update suggestions."""
+    url_base = public_url(output_dir)
     
     # JSON mapping file
     mapping_file = output_dir / "image_mapping.json"
@@ -201,7 +667,7 @@ def generate_mapping_report(saved: list, output_dir: Path):
     sql_file = output_dir / "suggested_updates.sql"
     with open(sql_file, "w") as f:
         f.write("-- Suggested image URL updates for AFR cylinder heads\n")
-        f.write("-- Review images in public/shop/extracted/ and update paths as needed\n\n")
+        f.write(f"-- Review images in public{url_base}/ and update paths as needed\n\n")
         
         for family, images in by_family.items():
             f.write(f"\n-- {family.upper()} heads\n")
@@ -220,8 +686,16 @@ def generate_mapping_report(saved: list, output_dir: Path):
                 }.get(family, family.lower())
                 
                 f.write(f"-- Best candidate: {best['filename']} ({best['size']})\n")
-                f.write(f"-- UPDATE cse_parts_products SET image_url = '/shop/extracted/{best['filename']}'\n")
+                f.write(f"-- UPDATE cse_parts_products SET image_url = '{url_base}/{best['filename']}'\n")
                 f.write(f"--   WHERE category = 'cylinder_head' AND image_url LIKE '%afr-{family_slug}-head%';\n")
+        
+        # Per-part suggestions from the image/label spatial match (closest image wins)
+        by_part = best_part_images(saved)
+        if by_part:
+            f.write("\n-- Per-part images (nearest part-number label on the catalog page)\n")
+            for part, item in sorted(by_part.items()):
+                f.write(f"-- {part}: {item['filename']} (page {item['page']}, {item['label_distance']}pt from label)\n")
+                f.write(part_update_suggestion(part, f"{url_base}/{item['filename']}"))
     
     print(f"SQL suggestions saved to: {sql_file}")
     
@@ -237,7 +711,7 @@ def generate_mapping_report(saved: list, output_dir: Path):
     print("\n" + "="*60)
     print("NEXT STEPS")
     print("="*60)
-    print("1. Review extracted images in: public/shop/extracted/")
+    print(f"1. Review extracted images in: public{url_base}/")
     print("2. Select the best product image for each engine family")
     print("3. Rename/copy to public/shop/ with these names:")
     print("   - afr-sbc-head.png")
@@ -250,38 +724,207 @@ def generate_mapping_report(saved: list, output_dir: Path):
     print("4. Or update the migration SQL to use extracted filenames")
 
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python extract_afr_catalog_images.py <path_to_catalog.pdf>")
-        print("\nExample:")
-        print('  python scripts/extract_afr_catalog_images.py "C:/Users/phill/Downloads/AFR 2020 catalog.pdf"')
-        sys.exit(1)
-    
-    pdf_path = sys.argv[1]
-    
-    if not os.path.exists(pdf_path):
-        print(f"ERROR: File not found: {pdf_path}")
-        sys.exit(1)
-    
+def process_pdf(pdf_path: str, output_dir: Path, workers: int = 1, full: bool = False) -> list:
+    """
+    Extract one catalog into output_dir and write its reports.
+    Returns the saved image entries (carried over unchanged if the catalog
+    has not changed since the last run).
+    """
     print(f"Extracting images from: {pdf_path}")
-    print(f"Output directory: {OUTPUT_DIR}")
+    print(f"Output directory: {output_dir}")
     print()
     
-    # Extract images
-    extracted = extract_images_from_pdf(pdf_path)
+    # Re-runs only redo pages whose content changed since the last manifest
+    pdf_sha256 = file_sha256(pdf_path)
+    previous = load_manifest(output_dir)
+    if previous and full:
+        remove_stale_images(previous, [])
+        previous = None
+    if previous and previous["pdf_sha256"] == pdf_sha256:
+        print("Catalog unchanged since the last run (same content hash); nothing to do.")
+        print("Use --full to re-extract everything.")
+        return previous["saved"]
+    previous_digests = set(previous["pages"].values()) if previous else None
     
-    if not extracted:
-        print("No suitable images found in PDF.")
-        sys.exit(0)
+    # Extract and save images as a stream so only one image is in memory at a time
+    part_index = {}
+    page_digests = {}
+    if workers > 1:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        # Stage inside the output dir so the final rename never crosses filesystems
+        with tempfile.TemporaryDirectory(dir=output_dir, prefix=".staging-") as staging_dir:
+            extracted = extract_images_parallel(pdf_path, workers, Path(staging_dir), part_index, previous_digests)
+            saved = save_extracted_images(extracted, output_dir, previous, page_digests)
+    else:
+        extracted = extract_images_from_pdf(pdf_path, part_index, previous_digests)
+        saved = save_extracted_images(extracted, output_dir, previous, page_digests)
     
-    print(f"\nExtracted {len(extracted)} candidate images")
-    print("\nSaving images...")
+    # Unchanged pages, wherever they moved: old page number -> new page number
+    previous_page_of = {}
+    for page, digest in sorted((previous or {}).get("pages", {}).items()):
+        previous_page_of.setdefault(digest, page)
+    moved_pages = {previous_page_of[digest]: page for page, digest in sorted(page_digests.items())
+                   if digest in previous_page_of}
+    if previous:
+        print(f"\n{len(moved_pages)} of {len(page_digests)} pages unchanged since the last run")
+    merge_unchanged_part_hits(part_index, previous, moved_pages)
+    remove_stale_images(previous, saved)
+    write_manifest(output_dir, pdf_path, pdf_sha256, page_digests, saved, part_index)
+    save_part_index(part_index, output_dir)
     
-    # Save to disk
-    saved = save_extracted_images(extracted, OUTPUT_DIR)
+    if not saved:
+        print("No suitable images found in PDF.")
+        return saved
+    
+    print(f"\nSaved {len(saved)} candidate images")
     
     # Generate reports
-    generate_mapping_report(saved, OUTPUT_DIR)
+    with METRICS.stage("report"):
+        generate_mapping_report(saved, output_dir)
+    return saved
+
+
+def catalog_slug(pdf_path: Path) -> str:
+    """Output folder name for a catalog, e.g. "AFR 2020 catalog.pdf" -> "afr-2020-catalog"."""
+    return re.sub(r"[^a-z0-9]+", "-", pdf_path.stem.lower()).strip("-") or "catalog"
+
+
+def _process_batch_pdf(pdf_path: str, output_dir: str, full: bool) -> tuple:
+    """Batch worker: one whole catalog per process."""
+    METRICS.reset()
+    try:
+        return pdf_path, process_pdf(pdf_path, Path(output_dir), 1, full), None, METRICS.snapshot()
+    except Exception as e:
+        return pdf_path, [], str(e), METRICS.snapshot()
+
+
+def process_batch(catalog_dir: Path, workers: int, full: bool) -> list:
+    """
+    Extract every PDF in catalog_dir, at most `workers` at a time (each
+    catalog runs in a single process, so that is also the total process
+    count), then write the merged report. Returns per-catalog results.
+    """
+    pdfs = sorted(p for p in catalog_dir.iterdir() if p.is_file() and p.suffix.lower() == ".pdf")
+    if not pdfs:
+        print(f"No PDF files found in {catalog_dir}")
+        return []
+    
+    slugs = {}
+    jobs = []
+    for pdf in pdfs:
+        slug = catalog_slug(pdf)
+        slugs[slug] = slugs.get(slug, 0) + 1
+        if slugs[slug] > 1:
+            slug = f"{slug}-{slugs[slug]}"
+        jobs.append((str(pdf), str(OUTPUT_DIR / slug)))
+    
+    pool_size = min(workers, len(jobs))
+    print(f"Batch: {len(jobs)} catalogs across {pool_size} worker processes\n")
+    
+    results = []
+    with ProcessPoolExecutor(max_workers=pool_size, initializer=configure_parts, initargs=(AFR_PART_NUMBERS,)) as pool:
+        futures = [pool.submit(_process_batch_pdf, pdf, out, full) for pdf, out in jobs]
+        for future, (_, output_dir) in zip(futures, jobs):
+            pdf_path, saved, error, worker_metrics = future.result()
+            METRICS.merge(worker_metrics)
+            if error:
+                print(f"  ERROR: {pdf_path}: {error}")
+            results.append({"pdf": pdf_path, "output_dir": output_dir, "saved": saved, "error": error})
+    
+    generate_batch_report(results, OUTPUT_DIR)
+    return results
+
+
+def generate_batch_report(results: list, output_dir: Path):
+    """Merge per-catalog results: one JSON summary and one SQL file across all catalogs."""
+    by_part = {}
+    for result in results:
+        for part, item in best_part_images(result["saved"]).items():
+            if part not in by_part or item["label_distance"] < by_part[part]["label_distance"]:
+                by_part[part] = dict(item, pdf=os.path.basename(result["pdf"]))
+    
+    report = {
+        "catalogs": [
+            {
+                "pdf": os.path.basename(r["pdf"]),
+                "output_dir": public_url(Path(r["output_dir"])),
+                "images": len(r["saved"]),
+                "matched_parts": len(best_part_images(r["saved"])),
+                "error": r["error"],
+            }
+            for r in results
+        ],
+        "parts": {
+            part: {
+                "image_url": public_url(Path(item["filepath"])),
+                "pdf": item["pdf"],
+                "page": item["page"],
+                "label_distance": item["label_distance"],
+            }
+            for part, item in sorted(by_part.items())
+        },
+        "unmatched_parts": [part for part in AFR_PART_NUMBERS if part not in by_part],
+    }
+    
+    output_dir.mkdir(parents=True, exist_ok=True)
+    report_file = output_dir / "batch_report.json"
+    with open(report_file, "w") as f:
+        json.dump(report, f, indent=2)
+    
+    sql_file = output_dir / "batch_suggested_updates.sql"
+    with open(sql_file, "w") as f:
+        f.write("-- Suggested per-part image URL updates merged across all catalogs in the batch\n")
+        f.write("-- (nearest part-number label wins when several catalogs show the same part)\n\n")
+        for part, entry in report["parts"].items():
+            f.write(f"-- {part}: {entry['pdf']} page {entry['page']}, {entry['label_distance']}pt from label\n")
+            f.write(part_update_suggestion(part, entry['image_url']))
+    
+    print("\n" + "="*60)
+    print("BATCH SUMMARY")
+    print("="*60)
+    for catalog in report["catalogs"]:
+        status = f"ERROR: {catalog['error']}" if catalog["error"] else f"{catalog['images']} images, {catalog['matched_parts']} parts"
+        print(f"  {catalog['pdf']}: {status}")
+    print(f"Parts with an image: {len(report['parts'])} of {len(AFR_PART_NUMBERS)}")
+    print(f"Report: {report_file}")
+    print(f"SQL: {sql_file}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Extract product images from AFR dealer catalog PDFs.",
+        epilog='Example: python scripts/extract_afr_catalog_images.py "C:/Users/phill/Downloads/AFR 2020 catalog.pdf"',
+    )
+    parser.add_argument("pdf_path", help="Path to the catalog PDF, or a directory of catalog PDFs.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes: page shards for one PDF, or catalogs at once in batch mode "
+                             "(0 = one per CPU core).")
+    parser.add_argument("--full", action="store_true",
+                        help="Ignore the previous extraction manifest and reprocess every page.")
+    parser.add_argument("--catalog", help="Part catalog CSV (default: scripts/part_catalog.csv).")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    pdf_path = args.pdf_path
+    workers = args.workers or os.cpu_count() or 1
+    
+    if not os.path.exists(pdf_path):
+        print(f"ERROR: File not found: {pdf_path}")
+        sys.exit(1)
+    
+    if args.catalog:
+        if not os.path.exists(args.catalog):
+            print(f"ERROR: Part catalog not found: {args.catalog}")
+            sys.exit(1)
+        configure_parts(part_numbers(load_part_catalog(args.catalog)))
+    
+    if os.path.isdir(pdf_path):
+        process_batch(Path(pdf_path), workers, args.full)
+    else:
+        process_pdf(pdf_path, OUTPUT_DIR, workers, args.full)
+    METRICS.write(OUTPUT_DIR, job="pdf-images")
 
 
 if __name__ == "__main__":
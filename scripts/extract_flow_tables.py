@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Cylinder Head Flow Table Extractor
+
+Finds lift/flow tables in catalog PDFs from PyMuPDF word positions (a
+"Lift / Intake / Exhaust" header row with numeric rows under it, or the
+same table laid out sideways), ties each table to the nearest part-number
+label on the page and writes the numbers out for a bulk load into
+public.cylinder_heads_flow_data.
+
+Output (in tmp/flow_data/ by default):
+    flow_data.csv          one row per lift point
+    load_flow_data.sql     psql script: \\copy into a staging table, then
+                           replace the flow rows of every matching head
+
+With --database-url (or DATABASE_URL) the same statements are run directly
+through psycopg using COPY FROM STDIN.
+
+Requirements:
+    pip install pymupdf numpy
+    pip install "psycopg[binary]"   (only for --database-url)
+
+Usage:
+    python scripts/extract_flow_tables.py <catalog.pdf | catalog_dir> [--brand "Air Flow Research"] [--database-url URL]
+"""
+
+import sys
+import os
+import re
+import csv
+import argparse
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: NumPy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+from extract_afr_catalog_images import AFR_BRAND, PART_MATCHER, PART_LOOKUP, LabelGrid, open_pdf
+
+OUTPUT_DIR = Path(__file__).parent.parent / "tmp" / "flow_data"
+CSV_NAME = "flow_data.csv"
+SQL_NAME = "load_flow_data.sql"
+CSV_COLUMNS = ["brand", "part_number", "lift", "intake_flow", "exhaust_flow", "pdf", "page"]
+
+# Tables can sit further from their part label than product photos do
+FLOW_LABEL_DISTANCE = 300
+
+LIFT_WORD = re.compile(r"^lift\b", re.IGNORECASE)
+INTAKE_WORD = re.compile(r"^(intake|int\.?|in)$", re.IGNORECASE)
+EXHAUST_WORD = re.compile(r"^(exhaust|exh\.?|ex)$", re.IGNORECASE)
+NUMBER = re.compile(r"^\d*\.?\d+$")
+
+STAGING_DDL = """CREATE TEMP TABLE flow_data_staging (
+  brand TEXT, part_number TEXT, lift NUMERIC, intake_flow NUMERIC, exhaust_flow NUMERIC, pdf TEXT, page INTEGER
+) ON COMMIT DROP;"""
+
+# Replace (not append) so re-running a catalog is idempotent
+LOAD_STATEMENTS = [
+    """DELETE FROM public.cylinder_heads_flow_data f
+USING public.cylinder_heads h, (SELECT DISTINCT brand, part_number FROM flow_data_staging) s
+WHERE f.head_id = h.id AND lower(h.brand) = lower(s.brand) AND h.part_number = s.part_number;""",
+    """INSERT INTO public.cylinder_heads_flow_data (head_id, lift, intake_flow, exhaust_flow)
+SELECT h.id, s.lift, s.intake_flow, s.exhaust_flow
+FROM flow_data_staging s
+JOIN public.cylinder_heads h ON lower(h.brand) = lower(s.brand) AND h.part_number = s.part_number;""",
+    # Keep the denormalized JSONB copy in step ({lift, intakeFlow, exhaustFlow}, as the UI submits it)
+    """UPDATE public.cylinder_heads h
+SET flow_data = s.flow_data, updated_at = NOW()
+FROM (
+  SELECT brand, part_number,
+         jsonb_agg(jsonb_build_object('lift', lift, 'intakeFlow', intake_flow, 'exhaustFlow', exhaust_flow)
+                   ORDER BY lift) AS flow_data
+  FROM flow_data_staging GROUP BY brand, part_number
+) s
+WHERE lower(h.brand) = lower(s.brand) AND h.part_number = s.part_number;""",
+]
+
+
+def group_rows(words: list) -> list:
+    """Cluster page words into text rows by vertical center, each row sorted left to right."""
+    if not words:
+        return []
+    heights = sorted(w[3] - w[1] for w in words)
+    tolerance = max(heights[len(heights) // 2] * 0.5, 1.0)
+
+    rows = []
+    for word in sorted(words, key=lambda w: ((w[1] + w[3]) / 2, w[0])):
+        center = (word[1] + word[3]) / 2
+        if rows and center - rows[-1][0] <= tolerance:
+            rows[-1][1].append(word)
+        else:
+            rows.append([center, [word]])
+    return [sorted(row, key=lambda w: w[0]) for _, row in rows]
+
+
+def _column_of(word, columns: dict) -> str:
+    center = (word[0] + word[2]) / 2
+    return min(columns, key=lambda name: abs(columns[name] - center))
+
+
+def _header_columns(row: list) -> dict | None:
+    """x-centers of the lift/intake/exhaust headers if this row is a table header."""
+    columns = {}
+    for word in row:
+        text = word[4].strip(":")
+        for name, pattern in (("lift", LIFT_WORD), ("intake", INTAKE_WORD), ("exhaust", EXHAUST_WORD)):
+            if name not in columns and pattern.match(text):
+                columns[name] = (word[0] + word[2]) / 2
+    return columns if len(columns) == 3 else None
+
+
+def _row_label(row: list) -> str | None:
+    text = row[0][4].strip(":")
+    for name, pattern in (("lift", LIFT_WORD), ("intake", INTAKE_WORD), ("exhaust", EXHAUST_WORD)):
+        if pattern.match(text):
+            return name
+    return None
+
+
+def _bbox(words: list) -> tuple:
+    return (min(w[0] for w in words), min(w[1] for w in words),
+            max(w[2] for w in words), max(w[3] for w in words))
+
+
+def find_flow_tables(rows: list) -> list:
+    """
+    Return [(cells, bbox), ...] where cells is a list of [lift, intake, exhaust]
+    strings. Handles tables with a header row (columns) and tables with a
+    label in front of each row (sideways). Candidates with fewer than two
+    lift rows are dropped.
+    """
+    tables = []
+    i = 0
+    while i < len(rows):
+        columns = _header_columns(rows[i])
+
+        if _row_label(rows[i]) == "lift" and any(NUMBER.match(w[4]) for w in rows[i][1:]):
+            # Sideways: "Lift .100 .200 ...", "Intake 70 110 ...", "Exhaust ..."
+            labelled = {}
+            for row in rows[i:i + 3]:
+                label = _row_label(row)
+                if label:
+                    labelled[label] = [w[4] for w in row[1:] if NUMBER.match(w[4])]
+            count = min(map(len, labelled.values())) if len(labelled) == 3 else 0
+            # "Intake Runner 195cc" is a spec line, not a table row
+            if count >= 2:
+                cells = [[labelled[c][k] for c in ("lift", "intake", "exhaust")] for k in range(count)]
+                tables.append((cells, _bbox([w for row in rows[i:i + 3] for w in row])))
+                i += 3
+                continue
+
+        if columns:
+            cells = []
+            table_words = list(rows[i])
+            j = i + 1
+            while j < len(rows):
+                numbers = [w for w in rows[j] if NUMBER.match(w[4])]
+                if len(numbers) < 3:
+                    break
+                by_column = {}
+                for word in numbers:
+                    by_column.setdefault(_column_of(word, columns), word[4])
+                if len(by_column) < 3:
+                    break
+                cells.append([by_column["lift"], by_column["intake"], by_column["exhaust"]])
+                table_words.extend(rows[j])
+                j += 1
+            if len(cells) >= 2:
+                tables.append((cells, _bbox(table_words)))
+            i = j
+            continue
+        i += 1
+    return tables
+
+
+def parse_flow_cells(cells: list):
+    """
+    Convert one table's cell strings to a float array of [lift, intake, exhaust]
+    rows in a single pass. Lifts printed in thousandths (100, 200, ...) are
+    scaled to inches. Returns None if the table does not look like flow data.
+    """
+    values = np.array(cells, dtype=float).reshape(-1, 3)
+    if len(values) < 2:
+        return None
+    lifts = values[:, 0]
+    if lifts.max() > 2:
+        values[:, 0] = lifts / 1000.0
+    lifts = values[:, 0]
+    if np.any(np.diff(lifts) <= 0) or np.any(values[:, 1:] <= 0):
+        return None
+    return values
+
+
+def extract_flow_tables_from_pdf(pdf_path: str):
+    """Yield {"part_number", "page", "values"} for every flow table that can be tied to a part."""
+    doc = open_pdf(pdf_path)
+    try:
+        for page_num in range(len(doc)):
+            page = doc[page_num]
+            words = page.get_text("words")
+            tables = find_flow_tables(group_rows(words))
+            if not tables:
+                continue
+
+            labels = []
+            for x0, y0, x1, y1, word, *_ in words:
+                match = PART_MATCHER.search(word)
+                if match:
+                    labels.append((PART_LOOKUP[match.group().upper()], (x0 + x1) / 2, (y0 + y1) / 2))
+            grid = LabelGrid(labels)
+            page_parts = {label[0] for label in labels}
+
+            for cells, bbox in tables:
+                part, _ = grid.nearest(bbox, FLOW_LABEL_DISTANCE)
+                if part is None and len(page_parts) == 1:
+                    part = next(iter(page_parts))
+                values = parse_flow_cells(cells)
+                if part is None or values is None:
+                    print(f"  Page {page_num + 1}: skipped a {len(cells)}-row table (no part label or not flow data)")
+                    continue
+                print(f"  Page {page_num + 1}: {part} flow table, {len(values)} lift points")
+                yield {"part_number": part, "page": page_num + 1, "values": values}
+    finally:
+        doc.close()
+
+
+def write_flow_csv(rows: list, path: Path):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_COLUMNS)
+        writer.writerows(rows)
+
+
+def write_load_sql(csv_path: Path, sql_path: Path):
+    with open(sql_path, "w") as f:
+        f.write("-- Bulk load extracted flow tables into cylinder_heads_flow_data\n")
+        f.write("-- Generated by scripts/extract_flow_tables.py; run with psql from this directory\n\n")
+        f.write("BEGIN;\n\n")
+        f.write(STAGING_DDL + "\n\n")
+        f.write(f"\\copy flow_data_staging FROM '{csv_path.name}' WITH (FORMAT csv, HEADER true)\n\n")
+        for statement in LOAD_STATEMENTS:
+            f.write(statement + "\n\n")
+        f.write("COMMIT;\n")
+
+
+def load_into_database(csv_path: Path, database_url: str) -> int:
+    """Run the load in one transaction over a direct connection. Returns rows inserted."""
+    try:
+        import psycopg
+    except ImportError:
+        print('ERROR: psycopg not installed. Run: pip install "psycopg[binary]"')
+        sys.exit(1)
+
+    with psycopg.connect(database_url) as conn, conn.cursor() as cur:
+        cur.execute(STAGING_DDL)
+        with open(csv_path, "rb") as f, cur.copy("COPY flow_data_staging FROM STDIN WITH (FORMAT csv, HEADER true)") as copy:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                copy.write(chunk)
+        inserted = 0
+        for statement in LOAD_STATEMENTS:
+            cur.execute(statement)
+            if statement.startswith("INSERT"):
+                inserted = cur.rowcount
+    return inserted
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Extract lift/flow tables from catalog PDFs and bulk-load them.")
+    parser.add_argument("pdf_path", help="Catalog PDF, or a directory of catalog PDFs.")
+    parser.add_argument("--brand", default=AFR_BRAND,
+                        help=f"Brand to match against cylinder_heads.brand (default: {AFR_BRAND}).")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR, help="Where to write the CSV and SQL.")
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL"),
+                        help="Load directly into this Postgres database (default: $DATABASE_URL).")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    source = Path(args.pdf_path)
+    if not source.exists():
+        print(f"ERROR: File not found: {source}")
+        sys.exit(1)
+
+    pdfs = sorted(p for p in source.iterdir() if p.suffix.lower() == ".pdf") if source.is_dir() else [source]
+
+    rows = []
+    parts_seen = {}
+    for pdf in pdfs:
+        print(f"Scanning: {pdf}")
+        for table in extract_flow_tables_from_pdf(str(pdf)):
+            part = table["part_number"]
+            if part in parts_seen:
+                print(f"    {part} already has a table from {parts_seen[part]}; keeping that one")
+                continue
+            parts_seen[part] = f"{pdf.name} page {table['page']}"
+            for lift, intake, exhaust in table["values"].tolist():
+                rows.append([args.brand, part, f"{lift:.3f}", f"{intake:g}", f"{exhaust:g}", pdf.name, table["page"]])
+
+    if not rows:
+        print("No flow tables found.")
+        return
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    csv_path = args.output_dir / CSV_NAME
+    sql_path = args.output_dir / SQL_NAME
+    write_flow_csv(rows, csv_path)
+    write_load_sql(csv_path, sql_path)
+
+    print("\n" + "="*60)
+    print("FLOW TABLE SUMMARY")
+    print("="*60)
+    print(f"Heads with flow data: {len(parts_seen)}")
+    print(f"Lift points: {len(rows)}")
+    print(f"CSV: {csv_path}")
+    print(f"SQL: {sql_path} (psql -f {SQL_NAME} from {args.output_dir})")
+
+    if args.database_url:
+        inserted = load_into_database(csv_path, args.database_url)
+        print(f"Loaded {inserted} flow rows into cylinder_heads_flow_data")
+
+
+if __name__ == "__main__":
+    main()
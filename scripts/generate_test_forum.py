@@ -1,24 +1,250 @@
 #!/usr/bin/env python3
-import requests
+"""
+Forum test data / load generator
+
+Without options, calls /api/test/create-forum-data once and prints the test
+user and thread (as before). With --users N it becomes a load generator
+against the local dev server:
+
+    seed phase    N POSTs to /api/test/create-forum-data, each creating user
+                  test<index>, one thread and --posts replies
+    read phase    --reads GETs alternating /api/forum/threads and
+                  /api/forum/thread/<id> for the seeded threads
+
+Requests start on a linear ramp over --ramp seconds with at most
+--concurrency in flight (asyncio, with the blocking HTTP calls on a thread
+pool). Each operation reports its latency percentiles (p50/p95/p99), a
+latency histogram, throughput and error rate; --report saves the same as
+JSON to compare runs.
+
+Requirements:
+    pip install requests   (single-call mode only; the load generator uses the standard library)
+
+Usage:
+    python scripts/generate_test_forum.py
+    python scripts/generate_test_forum.py --users 200 --posts 5 --concurrency 20 --ramp 10 --reads 1000
+"""
+
+import sys
 import json
+import time
+import asyncio
+import argparse
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_URL = "http://localhost:3000"
 
 # Call the test data creation endpoint
-url = "http://localhost:3000/api/test/create-forum-data"
-
-try:
-    response = requests.post(url)
-    data = response.json()
-    
-    print("✅ Test data created successfully!")
-    print(f"\nUser Credentials:")
-    print(f"  Email: {data.get('user', {}).get('email')}")
-    print(f"  Handle: {data.get('user', {}).get('handle')}")
-    print(f"\nForum Thread:")
-    print(f"  Title: {data.get('thread', {}).get('title')}")
-    print(f"  URL: http://localhost:3000{data.get('thread', {}).get('url')}")
-    print(f"\n📝 Full response:")
-    print(json.dumps(data, indent=2))
-    
-except Exception as e:
-    print(f"❌ Error: {e}")
-    print("Make sure the dev server is running on http://localhost:3000")
+url = f"{BASE_URL}/api/test/create-forum-data"
+
+# Histogram bucket upper bounds (ms)
+LATENCY_BUCKETS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def create_test_forum_data(endpoint=url):
+    import requests
+
+    response = requests.post(endpoint)
+    return response.json()
+
+
+def percentile(ordered: list, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(int(round(fraction * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+class OperationStats:
+    """Latencies and outcomes of one kind of request."""
+
+    def __init__(self):
+        self.latencies = []
+        self.statuses = {}
+        self.errors = 0
+        self.first_start = None
+        self.last_end = None
+
+    def record(self, start: float, end: float, status: int | None):
+        self.latencies.append((end - start) * 1000)
+        key = str(status) if status else "connection_error"
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        if not status or status >= 400:
+            self.errors += 1
+        self.first_start = start if self.first_start is None else min(self.first_start, start)
+        self.last_end = end if self.last_end is None else max(self.last_end, end)
+
+    def histogram(self) -> dict:
+        counts = dict.fromkeys([f"<={bound}ms" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}ms"], 0)
+        for latency in self.latencies:
+            for bound in LATENCY_BUCKETS:
+                if latency <= bound:
+                    counts[f"<={bound}ms"] += 1
+                    break
+            else:
+                counts[f">{LATENCY_BUCKETS[-1]}ms"] += 1
+        return counts
+
+    def summary(self) -> dict:
+        ordered = sorted(self.latencies)
+        elapsed = (self.last_end - self.first_start) if self.latencies else 0.0
+        return {
+            "requests": len(ordered),
+            "errors": self.errors,
+            "error_rate": round(self.errors / len(ordered), 4) if ordered else 0.0,
+            "throughput_rps": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(percentile(ordered, 0.50), 1),
+            "p95_ms": round(percentile(ordered, 0.95), 1),
+            "p99_ms": round(percentile(ordered, 0.99), 1),
+            "max_ms": round(ordered[-1], 1) if ordered else 0.0,
+            "statuses": self.statuses,
+            "histogram": self.histogram(),
+        }
+
+
+def http_request(method: str, target: str, body: dict | None, timeout: float) -> tuple:
+    """(status or None, parsed JSON or None); blocking, run on the pool."""
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(target, data=data, method=method,
+                                     headers={"Content-Type": "application/json"} if data else {})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            status, payload = response.status, response.read()
+    except urllib.error.HTTPError as e:
+        status, payload = e.code, e.read()
+    except (urllib.error.URLError, OSError):
+        return None, None
+    try:
+        return status, json.loads(payload or b"null")
+    except ValueError:
+        return status, None
+
+
+class LoadRun:
+    """Ramped, concurrency-limited requests with per-operation stats."""
+
+    def __init__(self, base_url: str, concurrency: int, ramp: float, timeout: float):
+        self.base_url = base_url.rstrip("/")
+        self.ramp = ramp
+        self.timeout = timeout
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+        self.stats = {}
+
+    async def call(self, operation: str, method: str, path: str, body: dict | None = None):
+        loop = asyncio.get_running_loop()
+        async with self.semaphore:
+            start = time.perf_counter()
+            status, payload = await loop.run_in_executor(
+                self.executor, http_request, method, self.base_url + path, body, self.timeout)
+            self.stats.setdefault(operation, OperationStats()).record(start, time.perf_counter(), status)
+        return payload if status and status < 400 else None
+
+    async def ramped(self, requests: list) -> list:
+        """Run (operation, method, path, body) tuples, starting them evenly over the ramp."""
+        step = self.ramp / len(requests) if requests else 0
+
+        async def delayed(position, request):
+            await asyncio.sleep(position * step)
+            return await self.call(*request)
+
+        return await asyncio.gather(*(delayed(position, request) for position, request in enumerate(requests)))
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+
+async def run_load(args) -> dict:
+    run = LoadRun(args.base_url, args.concurrency, args.ramp, args.timeout)
+    try:
+        print(f"Seeding {args.users} users/threads with {args.posts} replies each "
+              f"(concurrency {args.concurrency}, ramp {args.ramp:g}s)...")
+        seeded = await run.ramped([
+            ("seed", "POST", "/api/test/create-forum-data", {"index": args.start_index + i, "replies": args.posts})
+            for i in range(args.users)
+        ])
+        thread_ids = [payload["thread"]["id"] for payload in seeded if payload and payload.get("thread")]
+        print(f"  {len(thread_ids)} threads created")
+
+        if args.reads:
+            print(f"Reading: {args.reads} requests over the thread list and {len(thread_ids)} threads...")
+            reads = []
+            for i in range(args.reads):
+                if i % 2 == 0 or not thread_ids:
+                    reads.append(("list_threads", "GET", "/api/forum/threads"))
+                else:
+                    reads.append(("get_thread", "GET", f"/api/forum/thread/{thread_ids[(i // 2) % len(thread_ids)]}"))
+            await run.ramped(reads)
+    finally:
+        run.close()
+    return {operation: stats.summary() for operation, stats in run.stats.items()}
+
+
+def print_report(report: dict):
+    print("\n" + "="*60)
+    print("FORUM LOAD REPORT")
+    print("="*60)
+    for operation, summary in report.items():
+        print(f"\n{operation}: {summary['requests']} requests, {summary['throughput_rps']} req/s, "
+              f"{summary['errors']} errors ({summary['error_rate']:.1%})")
+        print(f"  p50 {summary['p50_ms']} ms   p95 {summary['p95_ms']} ms   "
+              f"p99 {summary['p99_ms']} ms   max {summary['max_ms']} ms")
+        print(f"  statuses: {summary['statuses']}")
+        peak = max(summary["histogram"].values()) or 1
+        for bucket, count in summary["histogram"].items():
+            if count:
+                print(f"  {bucket:>10} {count:6d} {'#' * max(1, round(40 * count / peak))}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Create forum test data, or load-test the forum API with it.")
+    parser.add_argument("--users", type=int, default=0, help="Users (each with one thread) to seed; 0 = single call.")
+    parser.add_argument("--posts", type=int, default=1, help="Replies per seeded thread (default: 1, max 50).")
+    parser.add_argument("--reads", type=int, default=0, help="Read requests after seeding (default: 0).")
+    parser.add_argument("--concurrency", type=int, default=10, help="Requests in flight at most (default: 10).")
+    parser.add_argument("--ramp", type=float, default=0.0, help="Seconds over which each phase's requests start.")
+    parser.add_argument("--start-index", type=int, default=int(time.time()),
+                        help="First test user index, so reruns don't collide (default: current time).")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds.")
+    parser.add_argument("--base-url", default=BASE_URL, help=f"Dev server (default: {BASE_URL}).")
+    parser.add_argument("--report", help="Also write the report as JSON to this path.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.users:
+        report = asyncio.run(run_load(args))
+        print_report(report)
+        if args.report:
+            with open(args.report, "w", encoding="utf-8") as f:
+                json.dump({"args": vars(args), "operations": report}, f, indent=2)
+            print(f"\nReport: {args.report}")
+        if any(summary["errors"] == summary["requests"] for summary in report.values()):
+            print(f"\nEvery request of an operation failed; is the dev server running on {args.base_url}?")
+            sys.exit(1)
+        return
+
+    try:
+        data = create_test_forum_data(f"{args.base_url.rstrip('/')}/api/test/create-forum-data")
+
+        print("✅ Test data created successfully!")
+        print(f"\nUser Credentials:")
+        print(f"  Email: {data.get('user', {}).get('email')}")
+        print(f"  Handle: {data.get('user', {}).get('handle')}")
+        print(f"\nForum Thread:")
+        print(f"  Title: {data.get('thread', {}).get('title')}")
+        print(f"  URL: {args.base_url.rstrip('/')}{data.get('thread', {}).get('url')}")
+        print(f"\n📝 Full response:")
+        print(json.dumps(data, indent=2))
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        print(f"Make sure the dev server is running on {args.base_url}")
+
+
+if __name__ == '__main__':
+    main()
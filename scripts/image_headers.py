@@ -0,0 +1,91 @@
+"""
+Image header sniffer
+
+Reads pixel dimensions, bit depth and format from the first few bytes of
+PNG, JPEG, WebP and GIF files without decoding any pixel data (and without
+Pillow). Used by organize_afr_images.py to rank candidate images.
+"""
+
+import struct
+
+# PNG color type -> channels
+PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+# JPEG start-of-frame markers (C4/C8/CC are DHT/JPG/DAC, not frames)
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def _png(f, head: bytes) -> dict | None:
+    if head[12:16] != b"IHDR":
+        return None
+    width, height, depth, color_type = struct.unpack(">IIBB", head[16:26])
+    bits = depth * PNG_CHANNELS.get(color_type, 1)
+    return {"format": "png", "width": width, "height": height, "bit_depth": bits}
+
+
+def _jpeg(f, head: bytes) -> dict | None:
+    f.seek(2)
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        code = marker[1]
+        if code == 0xFF:
+            # Fill byte; step one byte and retry
+            f.seek(-1, 1)
+            continue
+        if code in (0xD8, 0x01) or 0xD0 <= code <= 0xD7:
+            continue
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack(">H", length_bytes)[0]
+        if code in JPEG_SOF_MARKERS:
+            precision, height, width, components = struct.unpack(">BHHB", f.read(6))
+            return {"format": "jpeg", "width": width, "height": height, "bit_depth": precision * components}
+        f.seek(length - 2, 1)
+
+
+def _webp(f, head: bytes) -> dict | None:
+    chunk = head[12:16]
+    if chunk == b"VP8X":
+        alpha = bool(head[20] & 0x10)
+        width = int.from_bytes(head[24:27], "little") + 1
+        height = int.from_bytes(head[27:30], "little") + 1
+        return {"format": "webp", "width": width, "height": height, "bit_depth": 32 if alpha else 24}
+    if chunk == b"VP8 ":
+        width, height = struct.unpack("<HH", head[26:30])
+        return {"format": "webp", "width": width & 0x3FFF, "height": height & 0x3FFF, "bit_depth": 24}
+    if chunk == b"VP8L":
+        bits = int.from_bytes(head[21:25], "little")
+        width = (bits & 0x3FFF) + 1
+        height = ((bits >> 14) & 0x3FFF) + 1
+        alpha = bool((bits >> 28) & 1)
+        return {"format": "webp", "width": width, "height": height, "bit_depth": 32 if alpha else 24}
+    return None
+
+
+def _gif(f, head: bytes) -> dict | None:
+    width, height = struct.unpack("<HH", head[6:10])
+    return {"format": "gif", "width": width, "height": height, "bit_depth": 8}
+
+
+def read_image_header(path) -> dict | None:
+    """
+    Return {"format", "width", "height", "bit_depth"} for an image file, or
+    None if the format is not recognized or the header is truncated.
+    """
+    try:
+        with open(path, "rb") as f:
+            head = f.read(32)
+            if head.startswith(b"\x89PNG\r\n\x1a\n"):
+                return _png(f, head)
+            if head.startswith(b"\xff\xd8"):
+                return _jpeg(f, head)
+            if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+                return _webp(f, head)
+            if head[:4] == b"GIF8":
+                return _gif(f, head)
+    except (OSError, struct.error):
+        return None
+    return None
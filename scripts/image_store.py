@@ -0,0 +1,154 @@
+"""
+Content-addressed image store
+
+Blobs are stored once under .image-store/ named by their SHA-256, and the
+friendly public paths (e.g. /shop/afr-heads/afr-1011.png) are materialized
+from them as hardlinks or reflinks, falling back to a copy when neither
+works. Copies and reflinks keep the blob's mtime, so a re-run recognizes
+them (same size and mtime, else same digest) and leaves them alone. Never
+symlinks: .image-store/ is gitignored and not deployed, so a link into it
+would be dangling in public/. Blobs no published path refers to any more
+are removed by collect_garbage(). Used by organize_afr_images.py.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+STORE_DIR = Path(__file__).parent.parent / ".image-store"
+
+# ioctl number for FICLONE (Linux btrfs/xfs reflinks)
+FICLONE = 0x40049409
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _reflink(src: Path, dest: Path):
+    if fcntl is None:
+        raise OSError("reflinks not supported on this platform")
+    with open(src, "rb") as s, open(dest, "wb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            d.close()
+            os.remove(dest)
+            raise
+
+
+class ImageStore:
+    """
+    Blob store plus a small cache of source file -> digest, keyed by size and
+    mtime, so unchanged sources are not re-hashed on every run.
+    """
+
+    def __init__(self, store_dir: Path = STORE_DIR):
+        self.store_dir = store_dir
+        self.index_file = store_dir / "sources.json"
+        self.sources = {}
+        if self.index_file.exists():
+            with open(self.index_file) as f:
+                self.sources = json.load(f)
+
+    def blob_path(self, digest: str, suffix: str) -> Path:
+        return self.store_dir / digest[:2] / f"{digest}{suffix.lower()}"
+
+    def add(self, src: Path) -> Path:
+        """Put src in the store (if not already there) and return its blob path."""
+        stat = src.stat()
+        key = str(src.resolve())
+        cached = self.sources.get(key)
+        if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+            digest = cached["sha256"]
+        else:
+            digest = file_sha256(src)
+            self.sources[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+
+        blob = self.blob_path(digest, src.suffix)
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            tmp = blob.with_name(blob.name + ".tmp")
+            # Never hardlink the source itself: an in-place edit would change the blob
+            try:
+                _reflink(src, tmp)
+            except OSError:
+                shutil.copy2(src, tmp)
+            os.replace(tmp, blob)
+        return blob
+
+    def publish(self, blob: Path, dest: Path) -> str:
+        """
+        Materialize blob at dest. Returns how: "unchanged", "hardlink",
+        "reflink" or "copy". A symlink left at dest by an older run is replaced.
+        """
+        if not dest.is_symlink() and dest.exists():
+            if os.path.samefile(blob, dest):
+                return "unchanged"
+            # A copy or reflink from an earlier run carries the blob's mtime;
+            # failing that, a matching digest also means nothing to do
+            blob_stat, dest_stat = blob.stat(), dest.stat()
+            if blob_stat.st_size == dest_stat.st_size:
+                if blob_stat.st_mtime_ns == dest_stat.st_mtime_ns:
+                    return "unchanged"
+                if file_sha256(dest) == blob.stem:
+                    shutil.copystat(blob, dest)
+                    return "unchanged"
+
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f".{dest.name}.tmp")
+        if tmp.exists() or tmp.is_symlink():
+            tmp.unlink()
+
+        attempts = [
+            ("hardlink", lambda: os.link(blob, tmp)),
+            ("reflink", lambda: (_reflink(blob, tmp), shutil.copystat(blob, tmp))),
+            ("copy", lambda: shutil.copy2(blob, tmp)),
+        ]
+        for method, attempt in attempts:
+            try:
+                attempt()
+            except OSError:
+                continue
+            os.replace(tmp, dest)
+            return method
+        raise OSError(f"Could not publish {blob} to {dest}")
+
+    def collect_garbage(self, keep: set) -> int:
+        """
+        Delete blobs (and leftover .tmp files) whose names are not in `keep`,
+        and forget cached sources that no longer exist. Returns the number of
+        files deleted.
+        """
+        removed = 0
+        for blob in self.store_dir.glob("??/*"):
+            if blob.name not in keep:
+                blob.unlink()
+                removed += 1
+        for directory in self.store_dir.glob("??"):
+            if directory.is_dir() and not any(directory.iterdir()):
+                directory.rmdir()
+        self.sources = {key: entry for key, entry in self.sources.items() if os.path.exists(key)}
+        return removed
+    
+    def save(self):
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.index_file, "w") as f:
+            json.dump(self.sources, f, indent=2, sort_keys=True)
+
+
+def write_publish_manifest(manifest: dict, path: Path):
+    """Write {logical URL: {"blob": name, "sha256": digest}} for the published files."""
+    with open(path, "w") as f:
+        json.dump(dict(sorted(manifest.items())), f, indent=2)
@@ -0,0 +1,280 @@
+"""
+Ingest run metrics
+
+Per-stage wall time (monotonic clock), call, record, byte and error counters
+for the ingest scripts, written at the end of a run as a JSON report and a
+Prometheus textfile (for node_exporter's textfile collector).
+
+    from ingest_metrics import METRICS, timed
+
+    @timed("fetch")
+    def fetch_page(...): ...
+
+    with METRICS.stage("write"):
+        ...
+    METRICS.count("write", records=len(rows), bytes=size)
+
+    METRICS.write(output_dir, job="pdf-images")
+
+Stage times are inclusive: a stage that runs inside another is counted in
+both. Worker processes collect their own metrics; send METRICS.snapshot()
+back with the results and merge() it in the parent.
+
+METRICS.enable_profiling() (camspec_ingest.py --profile) additionally runs
+one cProfile profiler per stage and tracks tracemalloc peaks and retained
+allocations at stage boundaries; write_profile() then dumps <stage>.prof
+files and a profile_report.txt. Profiling only sees the current process,
+so profile with --workers 1.
+"""
+
+import io
+import os
+import json
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+
+COUNTERS = ("seconds", "calls", "records", "bytes", "errors")
+
+# Also drop the .prom file here when set (node_exporter --collector.textfile.directory)
+TEXTFILE_DIR_ENV = "PROMETHEUS_TEXTFILE_DIR"
+
+# Profiling: frames kept per allocation, rows per report table, and how much
+# retained memory must grow before a stage's snapshot is retaken
+TRACEMALLOC_FRAMES = 10
+PROFILE_TOP = 15
+SNAPSHOT_GROWTH = 1.10
+
+
+class Metrics:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.started_at = time.time()
+        self.stages = {}
+        self._lock = threading.Lock()
+        self.output_dir = None
+        self.job = None
+        self.profiling = False
+
+    def _stage(self, name: str) -> dict:
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = dict.fromkeys(COUNTERS, 0)
+        return stage
+
+    def count(self, name: str, records: int = 0, bytes: int = 0, errors: int = 0, calls: int = 0,
+              seconds: float = 0.0):
+        with self._lock:
+            stage = self._stage(name)
+            stage["records"] += records
+            stage["bytes"] += bytes
+            stage["errors"] += errors
+            stage["calls"] += calls
+            stage["seconds"] += seconds
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a block; an exception escaping it counts as an error."""
+        if self.profiling:
+            self._enter_profile(name)
+        start = time.monotonic()
+        try:
+            yield
+        except Exception:
+            self.count(name, errors=1)
+            raise
+        finally:
+            self.count(name, calls=1, seconds=time.monotonic() - start)
+            if self.profiling:
+                self._exit_profile(name)
+
+    def enable_profiling(self):
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+        self.profiling = True
+        self._profiles = {}
+        self._profile_stack = []
+        self._peaks = {}
+        self._retained = {}
+        self._snapshots = {}
+        self._baseline = tracemalloc.take_snapshot()
+
+    def _mark_boundary(self):
+        """Charge the memory peak since the last boundary to every open stage."""
+        peak = tracemalloc.get_traced_memory()[1]
+        for name, _ in self._profile_stack:
+            self._peaks[name] = max(self._peaks.get(name, 0), peak)
+        tracemalloc.reset_peak()
+
+    def _enter_profile(self, name: str):
+        self._mark_boundary()
+        if self._profile_stack:
+            self._profile_stack[-1][1].disable()
+        profile = self._profiles.setdefault(name, cProfile.Profile())
+        self._profile_stack.append((name, profile))
+        profile.enable()
+
+    def _exit_profile(self, name: str):
+        _, profile = self._profile_stack.pop()
+        profile.disable()
+        self._mark_boundary()
+        self._peaks[name] = max(self._peaks.get(name, 0), tracemalloc.get_traced_memory()[1])
+        # Snapshot what is still allocated when the stage ends, but only when
+        # that is clearly more than last time, so hot stages stay cheap
+        current = tracemalloc.get_traced_memory()[0]
+        if current > self._retained.get(name, 0) * SNAPSHOT_GROWTH:
+            self._retained[name] = current
+            self._snapshots[name] = tracemalloc.take_snapshot()
+        if self._profile_stack:
+            self._profile_stack[-1][1].enable()
+
+    def write_profile(self, output_dir) -> Path:
+        """Dump per-stage .prof files and a text report of time and allocation hot spots."""
+        profile_dir = Path(output_dir) / "profile"
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        snapshot_filter = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        baseline = self._baseline.filter_traces(snapshot_filter)
+
+        out = io.StringIO()
+        out.write("Stages by peak traced memory (inclusive of nested stages)\n\n")
+        stages = sorted(self._profiles, key=lambda name: -self._peaks.get(name, 0))
+        for name in stages:
+            stage = self.stages.get(name, dict.fromkeys(COUNTERS, 0))
+            out.write(f"{name}: {stage['calls']} calls, {stage['seconds']:.3f}s, "
+                      f"peak {self._peaks.get(name, 0) / 2**20:.1f} MiB, "
+                      f"retained at exit {self._retained.get(name, 0) / 2**20:.1f} MiB\n")
+
+        for name in stages:
+            out.write(f"\n{'=' * 70}\n{name}\n{'=' * 70}\n")
+            snapshot = self._snapshots.get(name)
+            if snapshot:
+                out.write("\nTop allocations still held at stage exit (vs. start of run):\n")
+                diffs = snapshot.filter_traces(snapshot_filter).compare_to(baseline, "lineno")
+                for diff in diffs[:PROFILE_TOP]:
+                    frame = diff.traceback[0]
+                    out.write(f"  {diff.size_diff / 1024:+10.1f} KiB  {diff.count_diff:+8d} blocks  "
+                              f"{frame.filename}:{frame.lineno}\n")
+
+            profile = self._profiles[name]
+            profile.dump_stats(profile_dir / f"{name}.prof")
+            out.write("\nTop cumulative time:\n")
+            stats = pstats.Stats(profile, stream=out)
+            stats.sort_stats("cumulative").print_stats(PROFILE_TOP)
+
+        report_path = profile_dir / "profile_report.txt"
+        report_path.write_text(out.getvalue(), encoding="utf-8")
+        print(f"Profile: {report_path} (+ {len(stages)} .prof files for snakeviz/pstats)")
+        return report_path
+
+    def reset(self):
+        """Start counting from zero (e.g. in a forked worker that inherited the parent's counts)."""
+        with self._lock:
+            self.stages = {}
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {name: dict(stage) for name, stage in self.stages.items()}
+
+    def merge(self, snapshot: dict):
+        for name, stage in snapshot.items():
+            self.count(name, **stage)
+
+    def report(self, job: str) -> dict:
+        return {
+            "job": job,
+            "started_at": self.started_at,
+            "wall_seconds": round(time.monotonic() - self.started, 6),
+            "stages": {
+                name: dict(stage, seconds=round(stage["seconds"], 6))
+                for name, stage in sorted(self.snapshot().items())
+            },
+        }
+
+    def prometheus_text(self, job: str) -> str:
+        report = self.report(job)
+        lines = []
+        for counter in COUNTERS:
+            metric = f"camspec_ingest_stage_{counter}_total"
+            lines.append(f"# HELP {metric} Ingest stage {counter}, summed over the run.")
+            lines.append(f"# TYPE {metric} counter")
+            for name, stage in report["stages"].items():
+                lines.append(f'{metric}{{job="{job}",stage="{name}"}} {stage[counter]}')
+        lines.append("# HELP camspec_ingest_run_seconds Wall time of the last run.")
+        lines.append("# TYPE camspec_ingest_run_seconds gauge")
+        lines.append(f'camspec_ingest_run_seconds{{job="{job}"}} {report["wall_seconds"]}')
+        lines.append("# HELP camspec_ingest_last_run_timestamp_seconds When the last run finished.")
+        lines.append("# TYPE camspec_ingest_last_run_timestamp_seconds gauge")
+        lines.append(f'camspec_ingest_last_run_timestamp_seconds{{job="{job}"}} {time.time():.3f}')
+        return "\n".join(lines) + "\n"
+
+    def summary_lines(self) -> list:
+        """One line per stage, slowest first, for the end-of-run printout."""
+        lines = []
+        for name, stage in sorted(self.snapshot().items(), key=lambda item: -item[1]["seconds"]):
+            line = f"  {name}: {stage['seconds']:.3f}s, {stage['calls']} calls"
+            if stage["records"]:
+                line += f", {stage['records']} records"
+            if stage["bytes"]:
+                line += f", {stage['bytes']:,} bytes"
+            if stage["errors"]:
+                line += f", {stage['errors']} errors"
+            lines.append(line)
+        return lines
+
+    def write(self, output_dir, job: str) -> Path:
+        """Write ingest_metrics.json and ingest_metrics.prom into output_dir."""
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        self.output_dir = output_dir
+        self.job = job
+        json_path = self._write_files()
+
+        print("\nStage timings:")
+        for line in self.summary_lines():
+            print(line)
+        print(f"Metrics: {json_path}")
+        return json_path
+
+    def flush(self):
+        """
+        Rewrite the last write()'s files with the current counts, e.g. once a
+        caller's enclosing stage has closed; does nothing before a write().
+        """
+        if self.output_dir is not None:
+            self._write_files()
+
+    def _write_files(self) -> Path:
+        output_dir, job = self.output_dir, self.job
+        json_path = output_dir / "ingest_metrics.json"
+        with open(json_path, "w") as f:
+            json.dump(self.report(job), f, indent=2)
+
+        text = self.prometheus_text(job)
+        targets = [output_dir / "ingest_metrics.prom"]
+        if os.environ.get(TEXTFILE_DIR_ENV):
+            targets.append(Path(os.environ[TEXTFILE_DIR_ENV]) / f"camspec_{job.replace('-', '_')}.prom")
+        for path in targets:
+            # Write then rename, so the collector never reads a half-written file
+            tmp = path.with_name(path.name + ".tmp")
+            with open(tmp, "w") as f:
+                f.write(text)
+            os.replace(tmp, path)
+        return json_path
+
+
+METRICS = Metrics()
+
+
+def timed(name: str):
+    """Decorator: time every call of the function as stage `name`."""
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with METRICS.stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -4,86 +4,445 @@ Organize AFR catalog images and generate SQL updates.
 
 This script:
 1. Finds the best image for each AFR part number
-2. Copies it to a clean location with simple filename
+2. Publishes it to a clean location with simple filename (hardlinked from
+   the content-addressed store in .image-store/, see image_store.py;
+   blobs no published image uses any more are removed)
 3. Generates SQL to update the migration
+
+With --watch it keeps running after the first pass, picks up new or changed
+files in the source directory (inotify via the optional `watchdog` package,
+otherwise polling), republishes only the affected parts and appends their
+UPDATE statements to the SQL file, commented out for review and scoped to
+AFR cylinder heads.
+
+Usage:
+    python scripts/organize_afr_images.py [--watch] [--interval 2] [--catalog parts.csv]
 """
 
 import os
 import re
-import shutil
+import json
+import time
+import argparse
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, Counter
+
+from extract_afr_catalog_images import part_update_suggestion
+from image_headers import read_image_header
+from image_store import STORE_DIR, ImageStore, write_publish_manifest
+from part_catalog import load_part_catalog, parts_by_family
 
 # Source and destination
 SRC_DIR = Path(__file__).parent.parent / "public" / "shop" / "afr-images"
 DEST_DIR = Path(__file__).parent.parent / "public" / "shop" / "afr-heads"
 
-# Our part numbers grouped by engine family
-PARTS_BY_FAMILY = {
-    "sbc": ["1011", "1012", "1016", "0911", "0916", "908", "1034", "1036", 
-            "1095-716", "1050", "1054", "1100", "1065", "1110", "1068", 
-            "1121", "1132-TI", "1137-TI"],
-    "sbf": ["1351", "1352", "1402", "1472", "1422", "1420", 
-            "1426-716", "1428-716", "1450", "1451"],
-    "ls": ["1501", "1502", "1506", "1510", "1530", "1610", "1680"],
-    "ls3": ["1803", "1804", "1840", "1845"],
-    "bbc": ["2000", "2001", "2010-TI", "2015-TI", "2020-TI", 
-            "2100", "2101", "2110"],
-    "mopar": ["2401", "2402"],
-    "hemi": ["2509", "2510", "2505", "2506", "2513", "2514"],
-}
+# Header reads (dimensions, bit depth, format) cached between runs, keyed by
+# file name, size and mtime. Lives outside public/ so it is never deployed.
+HEADER_CACHE_FILE = STORE_DIR / "organizer_headers.json"
+HEADER_READ_THREADS = 16
+
+# Published URL -> blob; it names blobs that are never deployed, so it
+# stays in the store rather than in public/
+PUBLISH_MANIFEST_FILE = STORE_DIR / "publish_manifest.json"
+
+# Our part numbers grouped by engine family (see part_catalog.csv)
+PARTS_BY_FAMILY = {}
 
 # Flatten for lookup
 PART_TO_FAMILY = {}
-for family, parts in PARTS_BY_FAMILY.items():
-    for part in parts:
-        # Normalize part number (remove suffix like -TI, -716)
-        base_part = part.split("-")[0]
-        PART_TO_FAMILY[base_part] = family
-        PART_TO_FAMILY[part] = family
-
-def find_best_image(part_number: str, all_files: list) -> Path | None:
+
+
+def use_catalog(catalog: list):
+    """Point the organizer at a part catalog (the default, or --catalog)."""
+    PARTS_BY_FAMILY.clear()
+    PARTS_BY_FAMILY.update(parts_by_family(catalog))
+    PART_TO_FAMILY.clear()
+    for family, parts in PARTS_BY_FAMILY.items():
+        for part in parts:
+            # Normalize part number (remove suffix like -TI, -716)
+            base_part = part.split("-")[0]
+            PART_TO_FAMILY[base_part] = family
+            PART_TO_FAMILY[part] = family
+
+
+use_catalog(load_part_catalog())
+
+# Vendor/part tokens in catalog image filenames, e.g. "AFR_1011_Cylinder_Head.png"
+PART_TOKEN = re.compile(r"(?<![A-Za-z0-9])([A-Za-z]+)_(\d+)(?!\d)")
+
+
+def score_image(name: str, size: int, header: dict | None = None) -> int:
+    """Rank a candidate image by filename hints plus a resolution bonus."""
+    score = 0
+    name_lower = name.lower()
+    
+    # Prefer "Cylinder_Head" images
+    if "cylinder_head" in name_lower:
+        score += 100
+    # Then "Specifications_Features" 
+    elif "specifications" in name_lower:
+        score += 80
+    # Then product pages
+    elif "_p" in name_lower and "img01" in name_lower:
+        score += 50
+    else:
+        score += 10
+    
+    if header:
+        # Real resolution from the image header: up to 40 for ~800k pixels,
+        # plus 10 for full color (24/32-bit) over grayscale or palette images
+        score += min(header["width"] * header["height"] // 20000, 40)
+        if header["bit_depth"] >= 24:
+            score += 10
+    else:
+        # Unreadable header: fall back to file size as a proxy
+        score += min(size // 10000, 50)  # Cap bonus at 50
+    
+    return score
+
+
+def load_header_cache() -> dict:
+    if HEADER_CACHE_FILE.exists():
+        with open(HEADER_CACHE_FILE) as f:
+            return json.load(f)
+    return {}
+
+
+def save_header_cache(cache: dict):
+    HEADER_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(HEADER_CACHE_FILE, "w") as f:
+        json.dump(cache, f)
+
+
+def read_headers(entries: list, cache: dict) -> dict:
+    """
+    Header info for each (name, path, size, mtime_ns) entry, reusing cached
+    results and reading the rest concurrently (the work is all small reads).
+    """
+    headers = {}
+    to_read = []
+    for name, path, size, mtime_ns in entries:
+        cached = cache.get(name)
+        if cached and cached["size"] == size and cached["mtime_ns"] == mtime_ns:
+            headers[name] = cached["header"]
+        else:
+            to_read.append((name, path, size, mtime_ns))
+    
+    if to_read:
+        with ThreadPoolExecutor(max_workers=HEADER_READ_THREADS) as pool:
+            results = pool.map(read_image_header, [path for _, path, _, _ in to_read])
+            for (name, _, size, mtime_ns), header in zip(to_read, results):
+                headers[name] = header
+                cache[name] = {"size": size, "mtime_ns": mtime_ns, "header": header}
+    
+    return headers
+
+
+def build_image_index(src_dir: Path) -> dict:
+    """
+    One pass over the source directory.
+    Returns {(VENDOR, part): [(score, path, header), ...]} with candidates
+    sorted best-first, so each part lookup is a dict hit instead of a scan.
+    """
+    index = defaultdict(list)
+    entries = []
+    
+    with os.scandir(src_dir) as it:
+        for entry in it:
+            if not entry.is_file() or not entry.name.lower().endswith(".png"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((entry.name, entry.path, stat.st_size, stat.st_mtime_ns))
+    
+    cache = load_header_cache()
+    headers = read_headers(entries, cache)
+    save_header_cache(cache)
+    
+    for name, path, size, _ in entries:
+        index_file(index, name, Path(path), size, headers[name], resort=False)
+    
+    for candidates in index.values():
+        candidates.sort(key=_candidate_order)
+    
+    return index
+
+
+def _candidate_order(candidate):
+    return -candidate[0], candidate[1].name
+
+
+def part_keys(name: str) -> set:
+    """Index keys a filename contributes to."""
+    return {(vendor.upper(), part) for vendor, part in (m.groups() for m in PART_TOKEN.finditer(name))}
+
+
+def index_file(index: dict, name: str, path: Path, size: int, header: dict | None, resort: bool = True) -> set:
+    """Add one file to the index; returns the keys it was filed under."""
+    keys = part_keys(name)
+    score = score_image(name, size, header)
+    for key in keys:
+        index[key].append((score, path, header))
+        if resort:
+            index[key].sort(key=_candidate_order)
+    return keys
+
+
+def unindex_file(index: dict, name: str) -> set:
+    """Remove one file from the index; returns the keys it was filed under."""
+    keys = part_keys(name)
+    for key in keys:
+        index[key] = [c for c in index.get(key, []) if c[1].name != name]
+        if not index[key]:
+            del index[key]
+    return keys
+
+
+def find_best_image(part_number: str, index: dict, vendor: str = "AFR") -> Path | None:
     """Find the best image for a part number."""
     base_part = part_number.split("-")[0]
+    candidates = index.get((vendor, base_part))
+    return candidates[0][1] if candidates else None
+
+
+class Publisher:
+    """Publishes chosen images from the content-addressed store and tracks the manifest."""
     
-    # Find all matching files
-    matches = []
-    for f in all_files:
-        # Match AFR_XXXX pattern
-        if f"AFR_{base_part}" in f.name:
-            # Prefer certain image types
-            score = 0
-            name_lower = f.name.lower()
-            
-            # Prefer "Cylinder_Head" images
-            if "cylinder_head" in name_lower:
-                score += 100
-            # Then "Specifications_Features" 
-            elif "specifications" in name_lower:
-                score += 80
-            # Then product pages
-            elif "_p" in name_lower and "img01" in name_lower:
-                score += 50
-            else:
-                score += 10
-            
-            # Larger images are better (check file size as proxy)
+    def __init__(self):
+        self.store = ImageStore()
+        self.manifest = {}
+        self.methods = Counter()
+        self.collected = 0
+    
+    def publish(self, src: Path, dest_name: str) -> Path:
+        blob = self.store.add(src)
+        self.methods[self.store.publish(blob, DEST_DIR / dest_name)] += 1
+        self.manifest[f"/shop/afr-heads/{dest_name}"] = {"blob": blob.name, "sha256": blob.stem}
+        return blob
+    
+    def unpublish(self, dest_name: str):
+        """Remove a published file whose source image has gone away."""
+        dest = DEST_DIR / dest_name
+        if dest.exists() or dest.is_symlink():
+            dest.unlink()
+        self.manifest.pop(f"/shop/afr-heads/{dest_name}", None)
+    
+    def save(self):
+        # Published files are hardlinks or copies, so dropping a blob never breaks one
+        self.collected += self.store.collect_garbage({entry["blob"] for entry in self.manifest.values()})
+        self.store.save()
+        write_publish_manifest(self.manifest, PUBLISH_MANIFEST_FILE)
+        # Older runs wrote it next to the images, where it was deployed
+        (DEST_DIR / "manifest.json").unlink(missing_ok=True)
+
+
+def publish_family_fallback(family: str, index: dict, publisher: Publisher) -> bool:
+    """Link afr-<family>-head.png to the first part in the family that has an image."""
+    for part in PARTS_BY_FAMILY[family]:
+        best = find_best_image(part, index)
+        if best:
+            # Same bytes as that part's image, so this is just another link to its blob
+            publisher.publish(best, f"afr-{family}-head.png")
+            return True
+    publisher.unpublish(f"afr-{family}-head.png")
+    return False
+
+
+def snapshot_source_dir() -> dict:
+    """{name: (size, mtime_ns)} for every source PNG."""
+    snapshot = {}
+    with os.scandir(SRC_DIR) as it:
+        for entry in it:
+            if entry.is_file() and entry.name.lower().endswith(".png"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                snapshot[entry.name] = (stat.st_size, stat.st_mtime_ns)
+    return snapshot
+
+
+def snapshot_diff(previous: dict, current: dict) -> set:
+    """Names added, changed or removed between two snapshots."""
+    changed = {name for name, sig in current.items() if previous.get(name) != sig}
+    return changed | (set(previous) - set(current))
+
+
+def poll_changes(interval: float, snapshot: dict):
+    """
+    Yield sets of changed/removed file names by diffing directory snapshots,
+    starting from `snapshot` (taken before the initial pass, so edits made
+    during it are picked up too). A batch is only released once a snapshot
+    comes back unchanged, so files still being written are not picked up
+    half-finished.
+    """
+    previous = snapshot
+    pending = set()
+    while True:
+        time.sleep(interval)
+        current = snapshot_source_dir()
+        changed = snapshot_diff(previous, current)
+        previous = current
+        if changed:
+            pending |= changed
+        elif pending:
+            yield pending
+            pending = set()
+
+
+def inotify_changes(interval: float, snapshot: dict):
+    """
+    Yield sets of changed file names from filesystem events (inotify on
+    Linux, via watchdog). Events are batched until `interval` seconds pass
+    without a new one, so a large unzip becomes one update. Changes since
+    `snapshot` (taken before the initial pass) come first, once the
+    observer is running.
+    
+    The queue is read with a timeout, never a bare get(), so Ctrl+C is
+    delivered on Windows too.
+    """
+    import queue
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    
+    events = queue.Queue()
+    
+    class Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if event.is_directory:
+                return
+            for path in (event.src_path, getattr(event, "dest_path", "")):
+                if path and path.lower().endswith(".png"):
+                    events.put(os.path.basename(path))
+    
+    observer = Observer()
+    observer.schedule(Handler(), str(SRC_DIR), recursive=False)
+    observer.start()
+    try:
+        missed = snapshot_diff(snapshot, snapshot_source_dir())
+        if missed:
+            yield missed
+        while True:
             try:
-                size = f.stat().st_size
-                score += min(size // 10000, 50)  # Cap bonus at 50
-            except:
-                pass
-            
-            matches.append((f, score))
+                changed = {events.get(timeout=interval)}
+            except queue.Empty:
+                continue
+            while True:
+                try:
+                    changed.add(events.get(timeout=interval))
+                except queue.Empty:
+                    break
+            yield changed
+    finally:
+        observer.stop()
+        observer.join()
+
+
+def apply_changes(names: set, index: dict, publisher: Publisher) -> dict:
+    """
+    Re-index the given files and republish every part they touch.
+    Returns {part_number: image_url} for the SQL log.
+    """
+    cache = load_header_cache()
+    entries = []
+    affected_keys = set()
+    
+    for name in names:
+        affected_keys |= unindex_file(index, name)
+        path = SRC_DIR / name
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((name, str(path), stat.st_size, stat.st_mtime_ns))
     
-    if not matches:
-        return None
+    headers = read_headers(entries, cache)
+    save_header_cache(cache)
+    for name, path, size, _ in entries:
+        affected_keys |= index_file(index, name, Path(path), size, headers[name])
     
-    # Return highest scored match
-    matches.sort(key=lambda x: x[1], reverse=True)
-    return matches[0][0]
+    affected_bases = {part for vendor, part in affected_keys if vendor == "AFR"}
+    updates = {}
+    families = set()
+    missing = defaultdict(list)
+    for family, parts in PARTS_BY_FAMILY.items():
+        for part in parts:
+            if part.split("-")[0] not in affected_bases:
+                continue
+            families.add(family)
+            best = find_best_image(part, index)
+            if best:
+                dest_name = f"afr-{part.lower()}.png"
+                publisher.publish(best, dest_name)
+                updates[part] = f"/shop/afr-heads/{dest_name}"
+                print(f"  ✓ {part}: {best.name} -> {dest_name}")
+            else:
+                publisher.unpublish(f"afr-{part.lower()}.png")
+                missing[family].append(part)
+    
+    for family in families:
+        has_fallback = publish_family_fallback(family, index, publisher)
+        for part in missing[family]:
+            if has_fallback:
+                updates[part] = f"/shop/afr-heads/afr-{family}-head.png"
+                print(f"  ✗ {part}: No image found, using family fallback")
+            else:
+                print(f"  ✗ {part}: No image found, and no family fallback published")
+    
+    publisher.save()
+    return updates
+
+
+def watch(index: dict, publisher: Publisher, interval: float, snapshot: dict):
+    """
+    Keep the published images in sync with the source directory, starting
+    from `snapshot`, taken before the initial pass.
+    """
+    try:
+        import watchdog  # noqa: F401
+        changes = inotify_changes(interval, snapshot)
+        mode = "filesystem events"
+    except ImportError:
+        changes = poll_changes(interval, snapshot)
+        mode = f"polling every {interval}s (pip install watchdog for inotify)"
+    
+    sql_file = DEST_DIR / "update_image_urls.sql"
+    print(f"\nWatching {SRC_DIR} using {mode}. Ctrl+C to stop.")
+    
+    try:
+        for names in changes:
+            print(f"\n{len(names)} file(s) changed")
+            updates = apply_changes(names, index, publisher)
+            if not updates:
+                continue
+            with open(sql_file, "a") as f:
+                f.write(f"\n-- Watch update {datetime.now().isoformat(timespec='seconds')} (review, then uncomment)\n")
+                for part, url in sorted(updates.items()):
+                    f.write(part_update_suggestion(part, url))
+            print(f"  Appended {len(updates)} suggested UPDATE statements to {sql_file.name}")
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Organize AFR catalog images and generate SQL updates.")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and process new or changed source images as they appear.")
+    parser.add_argument("--interval", type=float, default=2.0,
+                        help="Polling interval / event batching window in seconds for --watch.")
+    parser.add_argument("--catalog", help="Part catalog CSV (default: scripts/part_catalog.csv).")
+    return parser.parse_args()
+
 
 def main():
+    args = parse_args()
+    if args.catalog:
+        use_catalog(load_part_catalog(args.catalog))
+    
     if not SRC_DIR.exists():
         print(f"ERROR: Source directory not found: {SRC_DIR}")
         print("Run this after extracting AFR_catalog_images_png_by_partnumber.zip")
@@ -92,11 +451,17 @@ def main():
     # Create destination
     DEST_DIR.mkdir(parents=True, exist_ok=True)
     
-    # Get all source files
-    all_files = list(SRC_DIR.glob("*.png"))
-    print(f"Found {len(all_files)} source images\n")
+    # Taken before the pass, so --watch also catches edits made during it
+    snapshot = snapshot_source_dir() if args.watch else None
+    
+    # Index all source files in one pass
+    index = build_image_index(SRC_DIR)
+    image_count = len({c[1] for candidates in index.values() for c in candidates})
+    print(f"Indexed {image_count} source images under {len(index)} part numbers\n")
+    
+    publisher = Publisher()
     
-    # Track what we copy
+    # Track what we publish
     copied = {}
     missing = defaultdict(list)
     family_images = defaultdict(list)
@@ -105,12 +470,11 @@ def main():
     for family, parts in PARTS_BY_FAMILY.items():
         print(f"\n{family.upper()}:")
         for part in parts:
-            best = find_best_image(part, all_files)
+            best = find_best_image(part, index)
             if best:
-                # Copy with clean filename
+                # Publish with clean filename
                 dest_name = f"afr-{part.lower()}.png"
-                dest_path = DEST_DIR / dest_name
-                shutil.copy2(best, dest_path)
+                publisher.publish(best, dest_name)
                 copied[part] = f"/shop/afr-heads/{dest_name}"
                 family_images[family].append(dest_name)
                 print(f"  ✓ {part}: {best.name} -> {dest_name}")
@@ -121,12 +485,10 @@ def main():
     # Also create family-level fallback images (first good one from each family)
     print("\n\nCreating family fallback images...")
     for family, images in family_images.items():
-        if images:
-            # Copy first image as family fallback
-            src = DEST_DIR / images[0]
-            dest = DEST_DIR / f"afr-{family}-head.png"
-            shutil.copy2(src, dest)
-            print(f"  {family}: {dest.name}")
+        if images and publish_family_fallback(family, index, publisher):
+            print(f"  {family}: afr-{family}-head.png")
+    
+    publisher.save()
     
     # Generate SQL update snippet
     print("\n" + "="*60)
@@ -154,12 +516,17 @@ def main():
     print("\n" + "="*60)
     print("SUMMARY")
     print("="*60)
-    print(f"Images copied: {len(copied)}")
+    print(f"Images published: {len(copied)}")
+    print(f"Files written: {', '.join(f'{method}: {count}' for method, count in sorted(publisher.methods.items()))}")
+    print(f"Unreferenced blobs removed from the store: {publisher.collected}")
     print(f"Missing (will use family fallback): {sum(len(v) for v in missing.values())}")
     
     for family, parts in missing.items():
         if parts:
             print(f"  {family}: {', '.join(parts)}")
+    
+    if args.watch:
+        watch(index, publisher, args.interval, snapshot)
 
 
 if __name__ == "__main__":
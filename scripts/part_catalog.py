@@ -0,0 +1,71 @@
+"""
+Shared part catalog
+
+The single list of part numbers and engine families used by the catalog
+image scripts (extract_afr_catalog_images.py, organize_afr_images.py).
+Reads scripts/part_catalog.csv (vendor,part_number,family) or a CSV export
+of cse_parts_products, e.g.:
+
+    \\copy (SELECT brand, part_number, engine_family FROM cse_parts_products
+           WHERE category = 'cylinder_head') TO 'parts.csv' CSV HEADER
+"""
+
+import csv
+from pathlib import Path
+
+CATALOG_FILE = Path(__file__).parent / "part_catalog.csv"
+
+# cse_parts_products.engine_family -> family slug used in image filenames
+FAMILY_SLUGS = {
+    "Small Block Chevy": "sbc",
+    "Small Block Windsor": "sbf",
+    "LS": "ls",
+    "LS3": "ls3",
+    "Big Block Chevy": "bbc",
+    "Small Block LA": "mopar",
+    "Gen 3 Hemi": "hemi",
+}
+
+# cse_parts_products.brand -> vendor code used in catalog image filenames
+VENDOR_CODES = {
+    "Air Flow Research": "AFR",
+}
+
+
+def _slug(value: str) -> str:
+    return "-".join(value.lower().split())
+
+
+def load_part_catalog(path=CATALOG_FILE) -> list:
+    """
+    Return [{"vendor", "part_number", "family"}, ...] in file order.
+    Accepts either our own columns or a DB export (brand, engine_family).
+    """
+    rows = []
+    seen = set()
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            vendor = row.get("vendor") or VENDOR_CODES.get(row.get("brand", ""), row.get("brand", ""))
+            family = row.get("family") or FAMILY_SLUGS.get(row.get("engine_family", ""),
+                                                          _slug(row.get("engine_family", "")))
+            part = (row.get("part_number") or "").strip()
+            if not part or (vendor, part) in seen:
+                continue
+            seen.add((vendor, part))
+            rows.append({"vendor": vendor.strip(), "part_number": part, "family": family.strip()})
+    if not rows:
+        raise ValueError(f"No part numbers found in {path}")
+    return rows
+
+
+def part_numbers(catalog: list, vendor: str = "AFR") -> list:
+    return [row["part_number"] for row in catalog if row["vendor"] == vendor]
+
+
+def parts_by_family(catalog: list, vendor: str = "AFR") -> dict:
+    """{family: [part_number, ...]} with families in first-seen order."""
+    families = {}
+    for row in catalog:
+        if row["vendor"] == vendor:
+            families.setdefault(row["family"], []).append(row["part_number"])
+    return families
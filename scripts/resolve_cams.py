@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Cam entity resolution
+
+Groups records that describe the same cam across sources, even when their
+identifiers differ: "CCA-35-218-3" vs "35-218-3" from a title, Howards
+"HRS-220051-08/-10/-12" variants, "Ford Small Block Windsor" vs "Ford small
+block Windsor". Keys are normalized first, then records are only compared
+within blocks instead of all n^2 pairs:
+
+    part block    brand code + part number root (line code, hyphens and
+                  variant suffix stripped); every pair in a block matches
+    spec block    family + brand code + 2-degree duration buckets, for records
+                  with no part number; they match a cam in their block when
+                  duration, lift and LSA agree within tolerance, and join at
+                  most one part number (matching several is ambiguous_specs)
+
+Matches are merged with union-find into canonical groups, each with a
+canonical record (the most complete member, gaps filled from the others).
+
+Output (in tmp/resolved/ by default):
+    cam_groups.json       [{group_id, canonical, members: [...], reasons: [...]}]
+    cam_group_map.csv     source, family, brand, pn -> group_id
+
+Requirements:
+    None (standard library only)
+
+Usage:
+    python scripts/resolve_cams.py tmp/validated/load_ready.json cse_generic_cams.csv
+"""
+
+import re
+import sys
+import csv
+import json
+import argparse
+from itertools import product
+from pathlib import Path
+
+from cam_records import BRAND_CODES, read_records
+from ingest_metrics import METRICS
+
+OUTPUT_DIR = Path(__file__).parent.parent / "tmp" / "resolved"
+
+# Canonical spelling for family keys that are known to vary in case/spacing
+FAMILY_NAMES = {"ford small block windsor": "Ford Small Block Windsor"}
+
+# Brand name fragments -> line code
+BRAND_ALIASES = {
+    "comp": "CCA", "edelbrock": "EDL", "ford performance": "FMS", "howards": "HRS",
+    "melling": "MEL", "summit": "SUM", "trick flow": "TFS",
+}
+
+# Line codes whose part numbers end in a variant suffix on the same grind
+VARIANT_SUFFIX = {"HRS": re.compile(r"-\d{2}$")}
+
+# A part number at the end of a title, e.g. "... Camshafts 35-218-3"
+TITLE_PART = re.compile(r"([A-Z0-9]+(?:-[A-Z0-9]+)+)\s*$", re.IGNORECASE)
+
+DURATION_BUCKET = 2
+DURATION_TOLERANCE = 1.0
+LIFT_TOLERANCE = 0.003
+LSA_TOLERANCE = 0.5
+
+
+class DisjointSet:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a: int, b: int) -> bool:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        self.parent[max(root_a, root_b)] = min(root_a, root_b)
+        return True
+
+
+def family_key(family: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", (family or "").lower()).split())
+
+
+def brand_code(brand: str, pn: str) -> str:
+    """Line code from the part number prefix, else from the brand name."""
+    prefix = (pn or "").split("-", 1)[0].upper()
+    if prefix in BRAND_CODES:
+        return prefix
+    name = (brand or "").lower()
+    for fragment, code in BRAND_ALIASES.items():
+        if fragment in name:
+            return code
+    return name or "?"
+
+
+def part_root(code: str, pn: str) -> str:
+    """'CCA-35-218-3' / '35-218-3' -> '352183'; 'HRS-220051-08' -> '220051'."""
+    part = (pn or "").strip().upper()
+    if part.startswith(code + "-"):
+        part = part[len(code) + 1:]
+    if code in VARIANT_SUFFIX:
+        part = VARIANT_SUFFIX[code].sub("", part)
+    return re.sub(r"[^A-Z0-9]", "", part)
+
+
+def record_keys(record: dict) -> dict:
+    pn = record["pn"]
+    if not pn and record["cam_name"]:
+        match = TITLE_PART.search(record["cam_name"])
+        pn = match.group(1) if match else None
+    code = brand_code(record["brand"], pn)
+    return {"family": family_key(record["family"]), "brand": code, "part": part_root(code, pn) if pn else None}
+
+
+def _duration(record: dict) -> tuple:
+    """(kind, intake, exhaust), preferring @.050."""
+    if record["dur_int_050"] is not None and record["dur_exh_050"] is not None:
+        return "050", record["dur_int_050"], record["dur_exh_050"]
+    if record["adv_int"] is not None and record["adv_exh"] is not None:
+        return "adv", record["adv_int"], record["adv_exh"]
+    return None
+
+
+def same_specs(a: dict, b: dict) -> bool:
+    duration_a, duration_b = _duration(a), _duration(b)
+    if not duration_a or not duration_b or duration_a[0] != duration_b[0]:
+        return False
+    if abs(duration_a[1] - duration_b[1]) > DURATION_TOLERANCE or abs(duration_a[2] - duration_b[2]) > DURATION_TOLERANCE:
+        return False
+    for field in ("lift_int", "lift_exh"):
+        if a[field] is None or b[field] is None or abs(a[field] - b[field]) > LIFT_TOLERANCE:
+            return False
+    return a["lsa"] is None or b["lsa"] is None or abs(a["lsa"] - b["lsa"]) <= LSA_TOLERANCE
+
+
+def _buckets(value: float) -> tuple:
+    bucket = int(value // DURATION_BUCKET)
+    return bucket, bucket - 1
+
+
+def build_blocks(records: list, keys: list) -> tuple:
+    """({part block key: [indices]}, {spec block key: [indices]})"""
+    part_blocks, spec_blocks = {}, {}
+    for index, (record, key) in enumerate(zip(records, keys)):
+        if key["part"]:
+            part_blocks.setdefault((key["brand"], key["part"]), []).append(index)
+        duration = _duration(record)
+        if duration:
+            # Each record also sits in the bucket below on each axis, so values
+            # either side of a bucket edge (closer than a bucket) share a block
+            kind, intake, exhaust = duration
+            for bucket in product(_buckets(intake), _buckets(exhaust)):
+                spec_blocks.setdefault((key["family"], key["brand"], kind, bucket), []).append(index)
+    return part_blocks, spec_blocks
+
+
+def resolve(records: list) -> tuple:
+    """(groups, stats): groups is a list of member index lists with match reasons."""
+    with METRICS.stage("resolve"):
+        keys = [record_keys(record) for record in records]
+        part_blocks, spec_blocks = build_blocks(records, keys)
+        sets = DisjointSet(len(records))
+        reasons = {}
+        compared = 0
+
+        for members in part_blocks.values():
+            for other in members[1:]:
+                compared += 1
+                if sets.union(members[0], other):
+                    reasons.setdefault(members[0], set()).add("part_number")
+
+        # Specs only decide for records without a part number: two part
+        # numbers sharing a grind (e.g. COMP 31- vs 35- cores) are different
+        # products, so an unnumbered record joins at most one of them
+        matches = {}
+        checked = set()
+        for members in spec_blocks.values():
+            unnumbered = [index for index in members if not keys[index]["part"]]
+            for a in unnumbered:
+                for b in members:
+                    pair = (min(a, b), max(a, b))
+                    if a == b or pair in checked:
+                        continue
+                    checked.add(pair)
+                    compared += 1
+                    if same_specs(records[a], records[b]):
+                        matches.setdefault(a, set()).add(b)
+                        if not keys[b]["part"]:
+                            matches.setdefault(b, set()).add(a)
+
+        # Part number (brand, root) each group holds, by union-find root
+        group_part = {}
+        for index, key in enumerate(keys):
+            if key["part"]:
+                group_part[sets.find(index)] = (key["brand"], key["part"])
+
+        ambiguous = set()
+        for a in sorted(matches):
+            parts = {group_part[sets.find(b)] for b in matches[a] if sets.find(b) in group_part}
+            if len(parts) > 1:
+                ambiguous.add(a)
+                continue
+            for b in sorted(matches[a]):
+                part_a, part_b = group_part.get(sets.find(a)), group_part.get(sets.find(b))
+                if part_a and part_b and part_a != part_b:
+                    # Would bridge two part numbers through other unnumbered records
+                    ambiguous.add(a)
+                    continue
+                if sets.union(a, b):
+                    group_part[sets.find(a)] = part_a or part_b
+                    reasons.setdefault(a, set()).add("specs")
+        for index in ambiguous:
+            reasons.setdefault(index, set()).add("ambiguous_specs")
+
+        grouped = {}
+        for index in range(len(records)):
+            grouped.setdefault(sets.find(index), []).append(index)
+        groups = []
+        for members in grouped.values():
+            group_reasons = set()
+            for index in members:
+                group_reasons |= reasons.get(index, set())
+            groups.append({"members": members, "reasons": sorted(group_reasons)})
+    METRICS.count("resolve", records=len(records))
+
+    stats = {
+        "records": len(records),
+        "part_blocks": len(part_blocks),
+        "spec_blocks": len(spec_blocks),
+        "pairs_compared": compared,
+        "all_pairs": len(records) * (len(records) - 1) // 2,
+        "groups": len(groups),
+        "ambiguous": len(ambiguous),
+    }
+    return groups, stats
+
+
+def canonical_record(records: list, members: list) -> dict:
+    """Most complete member, with gaps filled from the others."""
+    ranked = sorted(members, key=lambda index: -sum(value is not None for value in records[index].values()))
+    canonical = dict(records[ranked[0]])
+    for index in ranked[1:]:
+        for field, value in records[index].items():
+            if canonical.get(field) is None and value is not None:
+                canonical[field] = value
+    key = family_key(canonical["family"])
+    canonical["family"] = FAMILY_NAMES.get(key, canonical["family"])
+    if canonical["brand"] is None:
+        canonical["brand"] = BRAND_CODES.get(brand_code(None, canonical["pn"]))
+    return canonical
+
+
+def write_outputs(records: list, groups: list, output_dir: Path):
+    output_dir.mkdir(parents=True, exist_ok=True)
+    groups = sorted(groups, key=lambda group: min(group["members"]))
+    output = []
+    with METRICS.stage("write"), open(output_dir / "cam_group_map.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["source", "family", "brand", "pn", "group_id"])
+        for group_id, group in enumerate(groups, start=1):
+            members = [records[index] for index in group["members"]]
+            output.append({
+                "group_id": group_id,
+                "canonical": canonical_record(records, group["members"]),
+                "members": [{field: member[field] for field in ("source", "family", "brand", "pn", "cam_name")}
+                            for member in members],
+                "reasons": group["reasons"],
+            })
+            for member in members:
+                writer.writerow([member["source"], member["family"], member["brand"], member["pn"], group_id])
+        with open(output_dir / "cam_groups.json", "w", encoding="utf-8") as groups_file:
+            json.dump(output, groups_file, indent=2)
+    METRICS.count("write", records=len(output))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Group cam records from several sources into canonical cams.")
+    parser.add_argument("inputs", nargs="+", type=Path, help="Extractor outputs / cse_generic_cams CSV exports.")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR, help="Where to write the groups.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    records = []
+    for path in args.inputs:
+        if not path.exists():
+            print(f"ERROR: File not found: {path}")
+            sys.exit(1)
+        records.extend(read_records(path))
+    if not records:
+        print("No records to resolve.")
+        return
+
+    groups, stats = resolve(records)
+    merged = [group for group in groups if len(group["members"]) > 1]
+    print(f"{stats['records']} records -> {stats['groups']} cams ({len(merged)} merged groups)")
+    if stats["ambiguous"]:
+        print(f"  {stats['ambiguous']} records without a part number match several part numbers; "
+              f"not merged (reason ambiguous_specs)")
+    print(f"  {stats['part_blocks']} part blocks, {stats['spec_blocks']} spec blocks, "
+          f"{stats['pairs_compared']:,} pairs compared of {stats['all_pairs']:,}")
+
+    write_outputs(records, groups, args.output_dir)
+    print(f"Output: {args.output_dir}")
+    METRICS.write(args.output_dir, job="resolve")
+
+
+if __name__ == "__main__":
+    main()
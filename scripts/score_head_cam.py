@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Head x cam compatibility scorer
+
+Scores every cylinder head against every cam of the same engine family in
+one batch, instead of one pairing at a time on a page view. Each head's
+lift/flow curve is interpolated (np.interp, clamped at the ends like the
+app's interpolateFlow) at every cam's intake and exhaust lift at once:
+
+    intake_cfm / exhaust_cfm   head flow at the cam's valve lift
+    utilization                intake_cfm / the head's peak intake flow
+    score                      intake_cfm + EXHAUST_WEIGHT * exhaust_cfm
+
+Pairs where the cam's lift exceeds the head's max_lift are left out. Each
+cam keeps its top heads by score (ties broken by utilization).
+
+Heads come from a cylinder_heads CSV export (flow_data JSONB column, as the
+UI stores it) or straight from Postgres (cylinder_heads joined with
+cylinder_heads_flow_data). Only approved heads are scored; pending and
+rejected submissions are skipped. Cams are anything cam_records.read_records
+understands.
+
+Cam and head families are named differently ("Small Block Windsor
+(221/260/289/302/351W)" or "Ford Small Block Windsor" for cams, "Small
+Block Windsor" for heads); CAM_HEAD_FAMILIES pairs them the way the
+profile calculator does, and output is grouped by head family.
+
+Output (in tmp/head_cam_scores/ by default):
+    <family-slug>.json     {"cams": {brand: {pn: [{head_id, brand, part_number, intake_cfm, ...}, ...]}}}
+    top_matches.csv        family, cam brand and pn, rank, head, flows, utilization, score
+
+Requirements:
+    pip install numpy
+    pip install "psycopg[binary]"   (only for --database-url)
+
+Usage:
+    python scripts/score_head_cam.py tmp/validated/load_ready.json --heads cylinder_heads.csv
+    python scripts/score_head_cam.py cse_generic_cams.csv --database-url $DATABASE_URL --top 5
+"""
+
+import sys
+import os
+import csv
+import json
+import time
+import argparse
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: NumPy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+from build_cam_neighbors import family_slug
+from cam_records import read_records, to_number
+from resolve_cams import family_key
+from ingest_metrics import METRICS
+
+OUTPUT_DIR = Path(__file__).parent.parent / "tmp" / "head_cam_scores"
+DEFAULT_TOP = 10
+EXHAUST_WEIGHT = 0.75
+
+# Cam family -> the head families it pairs with, as ENGINE_SELECTIONS in
+# app/components/ProfileCalculatorNew.tsx pairs camFamily and headFamily.
+# Families named alike on both sides (2JZ, K-Series, ...) need no entry.
+CAM_HEAD_FAMILIES = {
+    "Small Block Windsor (221/260/289/302/351W)": ["Small Block Windsor"],
+    "Cleveland (351C/351M/400)": ["Small Block Cleveland"],
+    "Modular 4.6/5.4 (2V/3V/4V)": ["Modular 4.6/5.4"],
+    "EcoBoost V6 (3.5/2.7)": ["EcoBoost 2.7/3.0/3.5"],
+    "Lima 2.3": ["EcoBoost 2.3"],
+    "Gen I Small Block (265–400)": ["Small Block Chevy (SBC)"],
+    "Gen II LT1/LT4 (1992–1997)": ["Gen I/II LT1/LT4 (90s)"],
+    "Gen III/IV LS (4.8/5.3/6.0/6.2 etc.)": ["LS (Gen III/IV)"],
+    "Gen V LT (LT1/LT4/LT2 etc.)": ["LT (Gen V)"],
+    "Big Block Mark IV (396/402/427/454)": ["Big Block Chevy (BBC)"],
+    "Big Block Gen V/VI (454/502 etc.)": ["Big Block Chevy (BBC)"],
+    "Magnum (5.2/5.9)": ["Magnum Small Block"],
+    "Gen III Hemi (5.7/6.1/6.4/6.2)": ["Gen III HEMI (5.7/6.1/6.4)", "Hellcat 6.2"],
+    "RB Big Block (383/400/413/426W/440)": ["B/RB Big Block"],
+    "B Big Block": ["B/RB Big Block"],
+    "UZ (1UZ/2UZ/3UZ)": ["1UZ/3UZ", "2UZ"],
+    "H-Series": ["H/F-Series"],
+    "SR": ["SR20"],
+    "VR": ["VR30"],
+    "07K 2.5": ["5-Cyl (07K)"],
+}
+
+# Older or short engine_family values found in cylinder_heads rows
+HEAD_FAMILY_ALIASES = {
+    "SBF": "Small Block Windsor",
+    "SBC": "Small Block Chevy (SBC)",
+    "LS3": "LS (Gen III/IV)",
+    "Gen 3 Hemi": "Gen III HEMI (5.7/6.1/6.4)",
+    "Small Block LA": "LA Small Block",
+}
+
+HEADS_QUERY = """SELECT h.id, h.brand, h.part_number, h.engine_family, h.max_lift,
+       f.lift, f.intake_flow, f.exhaust_flow
+FROM public.cylinder_heads h
+JOIN public.cylinder_heads_flow_data f ON f.head_id = h.id
+WHERE h.status = 'approved'
+ORDER BY h.id, f.lift"""
+
+
+def _family(name: str) -> str:
+    """Family key, ignoring the parenthesized part (as normalize_engine_family does)."""
+    return family_key((name or "").split("(", 1)[0])
+
+
+_HEAD_ALIASES = {_family(alias): _family(name) for alias, name in HEAD_FAMILY_ALIASES.items()}
+_CAM_HEADS = {_family(cam): [_family(head) for head in heads] for cam, heads in CAM_HEAD_FAMILIES.items()}
+
+
+def head_family(engine_family: str) -> str:
+    """Family key of a cylinder head's engine_family."""
+    key = _family(engine_family)
+    return _HEAD_ALIASES.get(key, key)
+
+
+def cam_head_families(cam: dict) -> list:
+    """
+    Head family keys a cam is scored against. The extractors prefix the
+    make ("Ford Small Block Windsor"); the app's camFamily values do not.
+    """
+    key = _family(cam["family"])
+    make = _family(cam.get("make"))
+    if key not in _CAM_HEADS and make and key.startswith(make + " "):
+        key = key[len(make) + 1:]
+    return _CAM_HEADS.get(key) or [_HEAD_ALIASES.get(key, key)]
+
+
+def _head(row: dict, points: list) -> dict | None:
+    """Head with its flow curve as sorted arrays; None without usable points."""
+    points = [(to_number(lift), to_number(intake), to_number(exhaust)) for lift, intake, exhaust in points]
+    points = sorted(point for point in points if None not in point)
+    if not points:
+        return None
+    curve = np.array(points, dtype=float)
+    return {
+        "head_id": row.get("id"), "brand": row.get("brand"), "part_number": row.get("part_number"),
+        "family": head_family(row.get("engine_family")), "engine_family": row.get("engine_family"),
+        "max_lift": to_number(row.get("max_lift")),
+        "lift": curve[:, 0], "intake": curve[:, 1], "exhaust": curve[:, 2],
+    }
+
+
+def read_heads_csv(path: Path) -> list:
+    """
+    Approved heads from a cylinder_heads CSV export with its flow_data JSON
+    column (exports without a status column are taken as all approved).
+    """
+    heads = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if "status" in row and (row["status"] or "").strip().lower() != "approved":
+                continue
+            try:
+                flow = json.loads(row.get("flow_data") or "[]")
+            except json.JSONDecodeError:
+                flow = []
+            points = [(p.get("lift"), p.get("intakeFlow"), p.get("exhaustFlow")) for p in flow if isinstance(p, dict)]
+            head = _head(row, points)
+            if head:
+                heads.append(head)
+    return heads
+
+
+def read_heads_database(database_url: str) -> list:
+    """Heads with their cylinder_heads_flow_data rows, straight from Postgres."""
+    try:
+        import psycopg
+    except ImportError:
+        print('ERROR: psycopg not installed. Run: pip install "psycopg[binary]"')
+        sys.exit(1)
+
+    rows = {}
+    with psycopg.connect(database_url) as conn, conn.cursor() as cur:
+        cur.execute(HEADS_QUERY)
+        for head_id, brand, part_number, engine_family, max_lift, lift, intake, exhaust in cur:
+            entry = rows.setdefault(head_id, ({"id": str(head_id), "brand": brand, "part_number": part_number,
+                                               "engine_family": engine_family, "max_lift": max_lift}, []))
+            entry[1].append((lift, intake, exhaust))
+    heads = [_head(row, points) for row, points in rows.values()]
+    return [head for head in heads if head]
+
+
+def score_family(heads: list, cams: list) -> dict:
+    """{name: (len(heads), len(cams)) array} for one family's head x cam matrix."""
+    lift_int = np.array([cam["lift_int"] for cam in cams], dtype=float)
+    lift_exh = np.array([cam["lift_exh"] for cam in cams], dtype=float)
+
+    intake = np.empty((len(heads), len(cams)))
+    exhaust = np.empty((len(heads), len(cams)))
+    for row, head in enumerate(heads):
+        intake[row] = np.interp(lift_int, head["lift"], head["intake"])
+        exhaust[row] = np.interp(lift_exh, head["lift"], head["exhaust"])
+
+    peak = np.array([head["intake"].max() for head in heads])
+    max_lift = np.array([np.inf if head["max_lift"] is None else head["max_lift"] for head in heads])
+    fits = np.maximum(lift_int, lift_exh)[None, :] <= max_lift[:, None]
+
+    score = intake + EXHAUST_WEIGHT * exhaust
+    return {
+        "intake_cfm": intake, "exhaust_cfm": exhaust,
+        "utilization": intake / peak[:, None],
+        "score": np.where(fits, score, -np.inf),
+    }
+
+
+def top_matches(heads: list, cams: list, scores: dict, top: int) -> dict:
+    """{cam brand: {cam pn: [match, ...]}} best first, leaving out heads the cam doesn't fit."""
+    # lexsort sorts by its last key first: score, then utilization, both descending
+    order = np.lexsort((-scores["utilization"], -scores["score"]), axis=0)[:top]
+    matches = {}
+    for column, cam in enumerate(cams):
+        ranked = []
+        for row in order[:, column]:
+            if not np.isfinite(scores["score"][row, column]):
+                break
+            head = heads[row]
+            ranked.append({
+                "head_id": head["head_id"], "brand": head["brand"], "part_number": head["part_number"],
+                **{name: round(float(values[row, column]), 3 if name == "utilization" else 1)
+                   for name, values in scores.items()},
+            })
+        matches.setdefault(cam["brand"] or "", {})[cam["pn"]] = ranked
+    return matches
+
+
+def pair_families(heads: list, cams: list) -> dict:
+    """
+    {head family key: (heads, cams)} for families with both, one record per
+    cam brand and pn. A cam whose family pairs with several head families
+    is scored in each.
+    """
+    heads_by_family, cams_by_family = {}, {}
+    for head in heads:
+        heads_by_family.setdefault(head["family"], []).append(head)
+    seen = set()
+    for cam in cams:
+        if cam["lift_int"] is None or cam["lift_exh"] is None or not cam["pn"]:
+            continue
+        for family in cam_head_families(cam):
+            key = (family, cam["brand"], cam["pn"])
+            if key not in seen:
+                seen.add(key)
+                cams_by_family.setdefault(family, []).append(cam)
+    return {family: (heads_by_family[family], cams_by_family[family])
+            for family in sorted(heads_by_family.keys() & cams_by_family.keys())}
+
+
+def write_outputs(results: dict, output_dir: Path):
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with METRICS.stage("write"), open(output_dir / "top_matches.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["family", "cam_brand", "cam_pn", "rank", "head_id", "head_brand", "head_part_number",
+                         "intake_cfm", "exhaust_cfm", "utilization", "score"])
+        slugs = set()
+        for family, (name, matches) in results.items():
+            for brand, by_pn in matches.items():
+                for pn, ranked in by_pn.items():
+                    for rank, match in enumerate(ranked, start=1):
+                        writer.writerow([name, brand, pn, rank, match["head_id"], match["brand"], match["part_number"],
+                                         match["intake_cfm"], match["exhaust_cfm"], match["utilization"],
+                                         match["score"]])
+            # Keys are normalized, but never let two families share a file
+            slug, n = family_slug(family), 1
+            while slug in slugs:
+                n += 1
+                slug = f"{family_slug(family)}-{n}"
+            slugs.add(slug)
+            path = output_dir / f"{slug}.json"
+            path.write_text(json.dumps({"family": name, "exhaust_weight": EXHAUST_WEIGHT, "cams": matches},
+                                       separators=(",", ":")), encoding="utf-8")
+    METRICS.count("write", records=sum(len(by_pn) for _, matches in results.values() for by_pn in matches.values()))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Rank cylinder heads for every cam by flow at the cam's lift.")
+    parser.add_argument("inputs", nargs="+", type=Path, help="load_ready.json / cse_generic_cams CSV export(s).")
+    parser.add_argument("--heads", type=Path, help="cylinder_heads CSV export (with the flow_data column).")
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL"),
+                        help="Read heads and flow data from Postgres instead (default: $DATABASE_URL).")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help=f"Heads kept per cam (default: {DEFAULT_TOP}).")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR, help="Where to write the matches.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    for path in [*args.inputs, args.heads]:
+        if path and not path.exists():
+            print(f"ERROR: File not found: {path}")
+            sys.exit(1)
+    cams = []
+    for path in args.inputs:
+        cams.extend(read_records(path))
+
+    if args.heads:
+        heads = read_heads_csv(args.heads)
+    elif args.database_url:
+        heads = read_heads_database(args.database_url)
+    else:
+        print("ERROR: Give --heads or --database-url (or set DATABASE_URL)")
+        sys.exit(1)
+    print(f"{len(heads)} heads with flow data, {len(cams)} cam records")
+
+    families = pair_families(heads, cams)
+    if not families:
+        print("No engine family has both heads and cams.")
+        return
+
+    results = {}
+    for family, (family_heads, family_cams) in families.items():
+        start = time.perf_counter()
+        with METRICS.stage("score"):
+            scores = score_family(family_heads, family_cams)
+            matches = top_matches(family_heads, family_cams, scores, args.top)
+        elapsed = time.perf_counter() - start
+        METRICS.count("score", records=len(family_heads) * len(family_cams))
+        name = family_heads[0]["engine_family"]
+        print(f"  {name}: {len(family_heads)} heads x {len(family_cams)} cams "
+              f"= {len(family_heads) * len(family_cams):,} pairs in {elapsed * 1000:.1f} ms")
+        results[family] = (name, matches)
+
+    write_outputs(results, args.output_dir)
+    print(f"Output: {args.output_dir}")
+    METRICS.write(args.output_dir, job="head-cam")
+
+
+if __name__ == "__main__":
+    main()
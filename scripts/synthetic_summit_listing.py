@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Synthetic Summit Racing listing pages
+
+Generates search-result pages with the same card markup as the saved
+Summit pages in tmp/ (div.item.row cards with an h2 title link,
+p.item-description and p.item-part-number span), at any card count, for
+benchmarking the listing parsers beyond the ~100-card fixtures.
+
+Descriptions follow the grammars seen in the fixtures ("Advertised Duration
+275/279, Lift .499/.510", "220/231 Duration, 113 LSA + 0 Adv",
+"Duration 288 Int./300 Exh.", "Lift 228 int./228 exh.", oval-track
+"280/284-250/254-.592/.608-106", cards with no specs, ...), weighted
+roughly as often as they appear there. The same --seed always produces the
+same page.
+
+Requirements:
+    None (standard library only)
+
+Usage:
+    python scripts/synthetic_summit_listing.py --cards 10000 --output tmp/synthetic_10k.html
+    python scripts/synthetic_summit_listing.py --cards 1000000 --seed 7 --output /data/summit_1m.html
+"""
+
+import sys
+import random
+import argparse
+from html import escape
+from pathlib import Path
+
+DEFAULT_SEED = 42
+
+PAGE_HEADER = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Camshafts for Ford Small Block Windsor - Free Shipping on Orders Over $109 at Summit Racing</title>
+</head>
+<body>
+<div class="row search-results">
+<div class="columns small-24 results-list">
+"""
+
+PAGE_FOOTER = """</div>
+</div>
+</body>
+</html>
+"""
+
+CARD_TEMPLATE = """<div class="item row" data-prodid="{sku}">
+<div class="previous-purchase-placeholder" data-sku="{sku}">
+</div>
+<div class="columns small-24 show-for-small-only">
+    <h2><a href="/parts/{slug}/make/ford">{title}</a></h2>
+</div>
+<div class="columns small-11 medium-7 large-6 item-image-column">
+    <a href="/parts/{slug}/make/ford">
+        <img alt="{title}" itemprop="image" src="//static.summitracing.com/global/images/prod/mediumlarge/{slug}_ml.jpg" title="{title}" class="item-image" />
+    </a>
+    <div class="promo-overlay-mount-point"
+         data-sku="{sku}"
+         data-has-special-offer="False"
+         data-has-manufacturer-rebate="False"
+         data-is-instant-rebate="False"
+         data-has-summit-bucks="False"
+         data-is-search-page="True">
+    </div>
+</div>
+<div class="columns medium-17 large-18 show-for-medium">
+    <h2>
+        <a href="/parts/{slug}/make/ford">
+            {title}
+        </a>
+    </h2>
+</div>
+<div class="columns small-13 medium-9 large-10 item-info-column">
+    <p class="item-description">{description}</p>
+        <p class="item-part-number" data-sku="{sku}"><strong>Part Number:</strong> <span class="nowrap">{sku}</span></p>
+    <p class="results-review">
+        <span class="review-rollup-stars star_{stars_class}">
+            <span class="value-title" title="{rating} out of 5 stars">
+{star_icons}
+                <span class="hide-alt">{rating} out of 5 stars</span>
+            </span>
+        </span>
+        <span class="review-count">
+            <a href="/parts/{slug}/reviews">( {reviews} )</a>
+        </span>
+    </p>
+            <div class="part-quantity-placeholder show-for-medium" data-sku="{sku}"></div>
+            <p class="estimate-module show-for-medium" data-sku="{sku}" data-extra="">
+			<span class="availability emphasize-date">
+                <span data-sku="{sku}" class="estimate-shipping-placeholder">
+                    <strong>Estimated Ship Date:</strong>
+                    <span style="display: inline;">
+                        <span class="display-date">{ship_date}</span>
+                    </span>
+                </span>
+			</span>
+    <span class="ordered-by"></span>
+            </p>
+            <div class="additional-information-portal"></div>
+        <ul class="item-bug no-decoration-list show-for-medium additional-information" data-sku="{sku}">
+        <li><button onclick="openAdditionalInfoModal('Free Shipping', 'Order this item and get free shipping and handling on your entire order! Offer excludes truck freight and oversize fees. Valid on orders shipped in the contiguous United States.',)" title="Free Shipping"><i class="custom-icon-free-shipping"></i><span class="faq-link">Free Shipping</span></button></li>
+            <li class="purchase-plan-placeholder" data-sku="{sku}">
+            </li>
+                    </ul>
+</div>
+    <div class="columns small-13 medium-8 item-price-column">
+<div class='price-wrapper hide-content pricing-component' data-location="body" id="{sku}-currentPrice" data-sku="{sku}" style='display: block;'>
+    <meta itemprop="priceCurrency" content="USD">
+    <p>
+        <span>
+            <svg class="svg-spinner price-spinner" viewBox="0 0 50 50">
+                <circle class="spinner-path" cx="25" cy="25" r="20" fill="none" stroke-width="5"></circle>
+            </svg><span>...Loading</span>
+        </span>
+    </p>
+</div>
+    </div>
+    <div class="columns small-24 medium-8 item-actions-column">
+        <div class="item-actions">
+                    <div class="add-to-cart-wrapper" data-sku-context="{sku}">
+    <div>
+            <div class="addtocart_sr"
+                 data-sku="{sku}"
+                 data-isHubCentric='False'
+                 data-isFitmentCheck='False'
+                 data-hasspecialattentionnotes='False'
+                 data-isSoldByTheFoot='False'
+                 data-parttype='Camshafts'
+                 data-wheelFitmentBypass='False'
+                 data-title='{title}'
+                 data-image='https://static.summitracing.com/global/images/prod/mediumlarge/{slug}_ml.jpg'>
+            </div>
+    </div>
+                        <div class="item-wishlist-compare">
+                            <ul class="no-decoration-list inline-list">
+                                <li>
+                                    <span class="comparePlaceholder" data-sku="{sku}"></span>
+                                </li>
+                                    <li class="wishlistPlaceholder" data-sku="{sku}" data-name="{title}" data-image-small="//static.summitracing.com/global/images/prod/small/{slug}_s.jpg"></li>
+                                    <li class="myGaragePlaceholder" data-sku="{sku}"></li>
+                            </ul>
+                        </div>
+                    </div>
+        </div>
+    </div>
+    </div>
+"""
+
+STAR_ICON = '                <i class="custom-icon-star-full"></i>'
+
+# Summit line code -> (title, part number pattern); "#" is a random digit
+BRANDS = {
+    "CCA": ("COMP Cams&#174; Xtreme Energy&#8482; Hydraulic Flat Tappet Camshafts", "CCA-35-###-#"),
+    "EDL": ("Edelbrock Performer-Plus Camshafts", "EDL-####"),
+    "FMS": ("Ford Performance Parts M-Select Camshafts", "FMS-M-6250-####"),
+    "HRS": ("Howards Cams Hydraulic Roller Camshafts", "HRS-2#####-##"),
+    "MEL": ("Melling Stock Replacement Camshafts", "MEL-SYB-###"),
+    "SUM": ("Summit Racing&#8482; Pro SBF Best Hydraulic Roller Cams", "SUM-#####"),
+    "TFS": ("Trick Flow&#174; Track Max&#174; Hydraulic Roller Camshafts for Ford 5.0L", "TFS-514#####"),
+}
+# Random draws per part number before falling back to a suffix
+PART_NUMBER_TRIES = 20
+
+BRAND_WEIGHTS = {"CCA": 30, "HRS": 20, "MEL": 15, "SUM": 12, "TFS": 10, "FMS": 8, "EDL": 5}
+
+TAPPETS = ["Hydraulic Flat Tappet", "Hydraulic Roller Tappet", "Hydraulic Roller", "Mechanical Flat Tappet",
+           "Mechanical Roller Tappet", "Retro-Fit Hydraulic Roller"]
+APPLICATIONS = ["Ford, 351W", "Ford, 5.0L HO", "Ford, Small Block", "Ford, 302 HO/351W", "Ford, 5.0L",
+                "Ford, 221, 255, 260, 289, 302", "Small Ford, 5.0L", "Ford, Mercury, 289, 302"]
+LSAS = [106, 108, 110, 110, 110.5, 112, 112, 112.5, 113, 114]
+
+
+def random_cam(rng: random.Random) -> dict:
+    """Plausible cam specs: advertised and @.050 duration, lift and LSA."""
+    adv_int = rng.randrange(250, 322, 2)
+    split = rng.choice([0, 0, 4, 6, 8, 10, 12])
+    dur050_int = adv_int - rng.randint(50, 58)
+    lift_int = rng.randrange(380, 650) / 1000
+    return {
+        "adv": (adv_int, adv_int + split),
+        "dur050": (dur050_int, dur050_int + split - rng.randint(0, 2)),
+        "lift": (lift_int, round(lift_int + rng.choice([0, 0, 0.011, 0.015, -0.010]), 3)),
+        "lsa": rng.choice(LSAS),
+        "advance": rng.choice([0, 2, 3, 4, 3.5]),
+    }
+
+
+def _lift(value: float) -> str:
+    """.499 (the dominant fixture style)."""
+    return f"{value:.3f}".lstrip("0")
+
+
+def _num(value: float) -> str:
+    return f"{value:g}"
+
+
+def _rpm_range(rng: random.Random) -> str:
+    low = rng.randrange(1500, 4000, 100)
+    return f"{low:,}-{low + rng.randrange(2800, 4000, 100):,}"
+
+
+def grammar_advertised(rng, cam):
+    """Camshaft, Hydraulic Roller, Advertised Duration 275/279, Lift .499/.510, Lobe Sep. 112, ..."""
+    lsa = f", Lobe Sep. {_num(cam['lsa'])}" if rng.random() < 0.2 else ""
+    return (f"Camshaft, {rng.choice(TAPPETS)}, Advertised Duration {cam['adv'][0]}/{cam['adv'][1]}, "
+            f"Lift {_lift(cam['lift'][0])}/{_lift(cam['lift'][1])}{lsa}, {rng.choice(APPLICATIONS)}, Each")
+
+
+def grammar_trailing_label(rng, cam):
+    """Camshaft, M-Select Class 1, Hydraulic Roller, 298/292 Advertised Duration, 0.444 in./0.444 in. Lift, ..."""
+    return (f"Camshaft, M-Select Class {rng.randint(1, 3)}, {rng.choice(TAPPETS)}, "
+            f"{cam['adv'][0]}/{cam['adv'][1]} Advertised Duration, "
+            f"{cam['lift'][0]:.3f} in./{cam['lift'][1]:.3f} in. Lift, Ford, Lincoln, Mercury, Windsor, Each")
+
+
+def grammar_int_exh(rng, cam):
+    """Camshaft, Mechanical Roller, Duration 288 Int./300 Exh., Lift 0.704 Int./0.672 Exh., Lobe Separation 106, ..."""
+    return (f"Camshaft, {rng.choice(TAPPETS)}, Duration {cam['adv'][0]} Int./{cam['adv'][1]} Exh., "
+            f"Lift {cam['lift'][0]:.3f} Int./{cam['lift'][1]:.3f} Exh., Lobe Separation {_num(cam['lsa'])}, "
+            f"{rng.choice(APPLICATIONS)}, Each")
+
+
+def grammar_lsa_plus_advance(rng, cam):
+    """Summit E303 Plus Hyd. Roller Cam, 220/231 Duration, 113 LSA + 0 Adv, .550/.540 1.6 Ratio, ..."""
+    lift_17 = [round(lift * 1.7 / 1.6, 3) for lift in cam["lift"]]
+    return (f"Summit {rng.choice('BEFX')}303 Plus Hyd. Roller Cam, {cam['dur050'][0]}/{cam['dur050'][1]} Duration, "
+            f"{_num(cam['lsa'])} LSA + {_num(cam['advance'])} Adv, "
+            f"{_lift(cam['lift'][0])}/{_lift(cam['lift'][1])} 1.6 Ratio, "
+            f"{_lift(lift_17[0])}/{_lift(lift_17[1])} 1.7 Ratio, {_rpm_range(rng).replace(',', '')} Range, "
+            f"'85-1996 Roller Block")
+
+
+def grammar_pro_sbf(rng, cam):
+    """Pro SBF Best Hydraulic Roller Cam 7, 236/248 Duration, 110.5 LSA + 3.5 Adv. .587/.587 lift 1.6 ratio, ..."""
+    lift_17 = [round(lift * 1.7 / 1.6, 3) for lift in cam["lift"]]
+    return (f"Pro SBF Best Hydraulic Roller Cam {rng.randint(1, 12)}, {cam['dur050'][0]}/{cam['dur050'][1]} Duration, "
+            f"{_num(cam['lsa'])} LSA + {_num(cam['advance'])} Adv. "
+            f"{_lift(cam['lift'][0])}/{_lift(cam['lift'][1])} lift 1.6 ratio, "
+            f"{_lift(lift_17[0])}/{_lift(lift_17[1])} lift 1.7 ratio, {_rpm_range(rng)} basic rpm")
+
+
+def grammar_lobe_lift(rng, cam):
+    """Muscle Car Camshaft, ..., Advertised Duration 310 int./310 exh., Lift 228 int./228 exh., Ford,Each"""
+    lobe = [round(lift / 1.6 * 1000) for lift in cam["lift"]]
+    return (f"Muscle Car Camshaft, 289 HIPO, Mechanical Flat Tappet, {_rpm_range(rng)} RPM Range, "
+            f"Advertised Duration {cam['adv'][0]} int./{cam['adv'][1]} exh., "
+            f"Lift {lobe[0]} int./{lobe[1]} exh., Ford,Each")
+
+
+def grammar_at_050(rng, cam):
+    """Camshaft, Hydraulic Roller, Duration @ .050 in. 210/211, Lift .445/.445, Ford, Small Block, Each"""
+    return (f"Camshaft, Hydraulic Roller, Duration @ .050 in. {cam['dur050'][0]}/{cam['dur050'][1]}, "
+            f"Lift {_lift(cam['lift'][0])}/{_lift(cam['lift'][1])}, {rng.choice(APPLICATIONS)}, Each")
+
+
+def grammar_oval_track(rng, cam):
+    """Camshaft, FL280S-6, Oval Track, Mech Flat Tappet, 280/284-250/254-.592/.608-106"""
+    return (f"Camshaft, FL{cam['adv'][0]}S-6, Oval Track, Mech Flat Tappet, "
+            f"{cam['adv'][0]}/{cam['adv'][1]}-{cam['dur050'][0]}/{cam['dur050'][1]}-"
+            f"{_lift(cam['lift'][0])}/{_lift(cam['lift'][1])}-{int(cam['lsa'])}")
+
+
+def grammar_no_specs(rng, cam):
+    """CAMSHAFT-ENGINE / Camshaft, Magnum, Hydraulic Roller Tappet, Ford, Each"""
+    return rng.choice(["CAMSHAFT-ENGINE", "Camshaft, Magnum, Hydraulic Roller Tappet, Ford, Each",
+                       "Camshaft, Replacement, Hydraulic Flat Tappet, Ford, Marine, Small Block, Each"])
+
+
+# Grammar -> weight, roughly the mix in the two saved pages
+GRAMMARS = {
+    grammar_advertised: 140,
+    grammar_no_specs: 13,
+    grammar_int_exh: 11,
+    grammar_pro_sbf: 9,
+    grammar_trailing_label: 6,
+    grammar_lsa_plus_advance: 4,
+    grammar_lobe_lift: 2,
+    grammar_at_050: 2,
+    grammar_oval_track: 2,
+}
+
+
+def random_part_number(rng: random.Random, code: str, seen: set) -> str:
+    """Unused part number for the brand; a -N suffix once random draws keep colliding."""
+    pattern = BRANDS[code][1]
+    for _ in range(PART_NUMBER_TRIES):
+        part = "".join(str(rng.randrange(10)) if ch == "#" else ch for ch in pattern)
+        if part not in seen:
+            seen.add(part)
+            return part
+    # The pattern's space is (nearly) used up, e.g. MEL-SYB-### past ~1000 cards
+    suffix = 2
+    while f"{part}-{suffix}" in seen:
+        suffix += 1
+    seen.add(f"{part}-{suffix}")
+    return f"{part}-{suffix}"
+
+
+def render_card(sku: str, title: str, description: str, rng: random.Random) -> str:
+    rating = round(rng.uniform(3.5, 5.0), 2)
+    return CARD_TEMPLATE.format(
+        sku=sku,
+        slug=sku.lower(),
+        title=f"{title} {sku}",
+        description=escape(description, quote=False),
+        rating=rating,
+        stars_class=f"{int(rating)}_{int(rating % 1 * 2) * 50:02d}",
+        star_icons="\n".join([STAR_ICON] * round(rating)),
+        reviews=rng.randint(1, 400),
+        ship_date=rng.choice(["Today", "Tomorrow", "Monday"]),
+    )
+
+
+def iter_listing_html(cards: int, seed: int = DEFAULT_SEED):
+    """Yield a listing page with `cards` product cards, one chunk per card."""
+    rng = random.Random(seed)
+    codes, code_weights = list(BRAND_WEIGHTS), list(BRAND_WEIGHTS.values())
+    grammars, grammar_weights = list(GRAMMARS), list(GRAMMARS.values())
+    seen = set()
+
+    yield PAGE_HEADER
+    for _ in range(cards):
+        code = rng.choices(codes, code_weights)[0]
+        grammar = rng.choices(grammars, grammar_weights)[0]
+        description = grammar(rng, random_cam(rng))
+        sku = random_part_number(rng, code, seen)
+        yield render_card(sku, BRANDS[code][0], description, rng)
+    yield PAGE_FOOTER
+
+
+def generate_listing_html(cards: int, seed: int = DEFAULT_SEED) -> str:
+    return "".join(iter_listing_html(cards, seed))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate a synthetic Summit Racing listing page.")
+    parser.add_argument("--cards", type=int, default=100, help="Number of product cards (default: 100).")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"Random seed (default: {DEFAULT_SEED}).")
+    parser.add_argument("--output", type=Path, required=True, help="HTML file to write.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.cards < 0:
+        print("ERROR: --cards must be >= 0")
+        sys.exit(1)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        for chunk in iter_listing_html(args.cards, args.seed):
+            f.write(chunk)
+    print(f"Wrote {args.cards:,} cards ({args.output.stat().st_size / 2**20:.1f} MiB) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Family pairing in score_head_cam.py, with the family strings the data really uses."""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from score_head_cam import cam_head_families, head_family, pair_families
+
+
+def _cam(family, make="Ford", pn="CCA-35-218-3", brand="COMP Cams"):
+    return {"family": family, "make": make, "brand": brand, "pn": pn, "lift_int": 0.5, "lift_exh": 0.51}
+
+
+def _head(engine_family, head_id="1"):
+    return {"head_id": head_id, "family": head_family(engine_family), "engine_family": engine_family}
+
+
+def test_windsor_cams_pair_with_windsor_heads():
+    windsor = head_family("Small Block Windsor")
+    assert head_family("SBF") == windsor
+    # validate_cams.py / extractor output, and a cse_generic_cams export
+    assert cam_head_families(_cam("Ford Small Block Windsor")) == [windsor]
+    assert cam_head_families(_cam("Small Block Windsor (221/260/289/302/351W)")) == [windsor]
+
+
+def test_other_makes_follow_the_profile_calculator():
+    assert cam_head_families(_cam("Gen I Small Block (265–400)", make="Chevrolet")) == \
+        [head_family("Small Block Chevy (SBC)")]
+    assert cam_head_families(_cam("Gen III Hemi (5.7/6.1/6.4/6.2)", make="Dodge/Mopar")) == \
+        [head_family("Gen III HEMI (5.7/6.1/6.4)"), head_family("Hellcat 6.2")]
+    assert cam_head_families(_cam("2JZ", make="Toyota")) == [head_family("2JZ")]
+
+
+def test_pair_families_matches_real_strings():
+    heads = [_head("Small Block Windsor"), _head("SBF", head_id="2"), _head("Big Block Chevy (BBC)", head_id="3")]
+    cams = [
+        _cam("Ford Small Block Windsor"),
+        _cam("Small Block Windsor (221/260/289/302/351W)", pn="TFS-51403001", brand="Trick Flow Specialties"),
+        _cam("Small Block Windsor (221/260/289/302/351W)"),  # same brand and pn as the first
+    ]
+    families = pair_families(heads, cams)
+    assert list(families) == [head_family("Small Block Windsor")]
+    family_heads, family_cams = families[head_family("Small Block Windsor")]
+    assert [head["head_id"] for head in family_heads] == ["1", "2"]
+    assert [cam["pn"] for cam in family_cams] == ["CCA-35-218-3", "TFS-51403001"]
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Cam batch validator
+
+Checks a whole batch of extracted cams at once (NumPy, one column per spec)
+for values that would be garbage in public.cse_generic_cams, and splits the
+batch into load-ready and quarantined records with the reasons:
+
+    missing_duration      no advertised or @.050 duration
+    missing_lift          no intake/exhaust lift
+    missing_dur_050       no @.050 duration (dur_*_050 are NOT NULL)
+    adv_duration_range    advertised duration outside 200-360 deg
+    dur_050_range         @.050 duration outside 150-300 deg
+    adv_050_spread        advertised minus @.050 outside 25-90 deg
+    lift_range            lift outside 0.250-0.900 in (e.g. lobe lift "228")
+    lsa_range             LSA outside 100-122 deg
+    duration_ratio        exhaust/intake duration outside 0.85-1.20
+    lift_ratio            exhaust/intake lift outside 0.80-1.25
+
+and counts, without quarantining, records that load with a warning:
+
+    missing_lsa           no lobe separation angle (cse_generic_cams.lsa is
+                          nullable, migration 012: most Summit specs omit it)
+
+Input is any mix of extractor outputs (see cam_records.py): the
+extract_first100 CSV/JSON, the crawler's extracted_camshafts.json, a
+cse_generic_cams CSV export, or cam_geometry.py's export (only its measured
+dur_*_050 are checked and loaded; the dur_*_050_est estimates never are).
+
+Output (in tmp/validated/ by default):
+    load_ready.json       normalized records that passed
+    load_ready.sql        INSERT ... ON CONFLICT DO NOTHING into cse_generic_cams
+                          (only with --peak-hp-rpm: the listings don't give it
+                          and the column is NOT NULL)
+    quarantine.csv        rejected records with a "reasons" column
+
+Requirements:
+    pip install numpy
+
+Usage:
+    python scripts/validate_cams.py tmp/ford_windsor_cams_first100.json tmp/ford_windsor_cams_page2.csv
+    python scripts/validate_cams.py tmp/ford_windsor_cams_first100.json --peak-hp-rpm 6000 --boost-ok either
+"""
+
+import sys
+import csv
+import json
+import time
+import argparse
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: NumPy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+from cam_records import FIELDS, GEOMETRY_FIELDS, NUMERIC_FIELDS, read_records, sql_literal
+from ingest_metrics import METRICS
+
+OUTPUT_DIR = Path(__file__).parent.parent / "tmp" / "validated"
+
+# Numeric columns of the batch matrix
+COLUMNS = NUMERIC_FIELDS
+
+# (low, high) plausibility bounds
+ADV_DURATION = (200, 360)
+DUR_050 = (150, 300)
+ADV_050_SPREAD = (25, 90)
+LIFT = (0.250, 0.900)
+LSA = (100, 122)
+DURATION_RATIO = (0.85, 1.20)
+LIFT_RATIO = (0.80, 1.25)
+
+# Reported, but the record still loads
+WARNINGS = ("missing_lsa",)
+
+INSERT_COLUMNS = ("make", "family", "brand", "pn", "cam_name", "dur_int_050", "dur_exh_050", "lsa",
+                  "lift_int", "lift_exh", "peak_hp_rpm", "boost_ok", "notes", "source_url")
+
+
+def batch_matrix(records: list):
+    """records -> (n, len(COLUMNS)) float array with NaN for missing values."""
+    return np.array([[np.nan if record[column] is None else record[column] for column in COLUMNS]
+                     for record in records], dtype=float).reshape(len(records), len(COLUMNS))
+
+
+def _outside(values, bounds):
+    """True where a value is present and outside [low, high]."""
+    low, high = bounds
+    with np.errstate(invalid="ignore"):
+        return ~np.isnan(values) & ((values < low) | (values > high))
+
+
+def check_batch(matrix) -> dict:
+    """{reason: boolean mask over the batch}"""
+    adv, dur_050, lift, lsa = matrix[:, 0:2], matrix[:, 2:4], matrix[:, 4:6], matrix[:, 6]
+    has_adv = ~np.isnan(adv).any(axis=1)
+    has_050 = ~np.isnan(dur_050).any(axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Exhaust / intake, taking @.050 where present and advertised otherwise
+        duration = np.where(has_050[:, None], dur_050, adv)
+        duration_ratio = duration[:, 1] / duration[:, 0]
+        lift_ratio = lift[:, 1] / lift[:, 0]
+        spread = adv - dur_050
+
+    return {
+        "missing_duration": ~has_adv & ~has_050,
+        "missing_lift": np.isnan(lift).any(axis=1),
+        "missing_dur_050": ~has_050,
+        "missing_lsa": np.isnan(lsa),
+        "adv_duration_range": _outside(adv, ADV_DURATION).any(axis=1),
+        "dur_050_range": _outside(dur_050, DUR_050).any(axis=1),
+        "adv_050_spread": _outside(spread, ADV_050_SPREAD).any(axis=1),
+        "lift_range": _outside(lift, LIFT).any(axis=1),
+        "lsa_range": _outside(lsa, LSA),
+        "duration_ratio": _outside(duration_ratio, DURATION_RATIO),
+        "lift_ratio": _outside(lift_ratio, LIFT_RATIO),
+    }
+
+
+def validate_batch(records: list) -> tuple:
+    """
+    Split normalized records into (load_ready, quarantined, warnings);
+    quarantined records get a "reasons" list, and warnings counts the
+    load-ready records per WARNINGS reason.
+    """
+    with METRICS.stage("validate"):
+        failures = check_batch(batch_matrix(records))
+        warning_masks = {reason: failures.pop(reason) for reason in WARNINGS}
+        reasons = [[] for _ in records]
+        for reason, mask in failures.items():
+            for index in np.flatnonzero(mask):
+                reasons[index].append(reason)
+
+        load_ready, quarantined = [], []
+        for record, record_reasons in zip(records, reasons):
+            if record_reasons:
+                quarantined.append(dict(record, reasons=record_reasons))
+            else:
+                load_ready.append(record)
+        loaded = np.array([not record_reasons for record_reasons in reasons], dtype=bool)
+        warnings = {reason: int((mask & loaded).sum()) for reason, mask in warning_masks.items()}
+    METRICS.count("validate", records=len(records), errors=len(quarantined))
+    return load_ready, quarantined, warnings
+
+
+def generate_insert_sql(records: list, peak_hp_rpm: int, boost_ok: str) -> str:
+    """peak_hp_rpm / boost_ok aren't in the listings; they are applied to every row as given."""
+    lines = []
+    for record in records:
+        values = [record[column] for column in INSERT_COLUMNS[:10]]
+        values += [peak_hp_rpm, boost_ok, f"Validated import: {record['source']}", record["source_url"]]
+        lines.append("(" + ", ".join(sql_literal(value) for value in values) + ")")
+    return (f"INSERT INTO public.cse_generic_cams ({', '.join(INSERT_COLUMNS)})\nVALUES\n"
+            + ",\n".join(lines)
+            + "\nON CONFLICT (make, family, pn) DO NOTHING;\n")
+
+
+def write_outputs(load_ready: list, quarantined: list, output_dir: Path, peak_hp_rpm=None, boost_ok="either"):
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with METRICS.stage("write"):
+        with open(output_dir / "load_ready.json", "w", encoding="utf-8") as f:
+            json.dump(load_ready, f, indent=2)
+        sql_path = output_dir / "load_ready.sql"
+        if load_ready and peak_hp_rpm is not None:
+            sql_path.write_text(generate_insert_sql(load_ready, peak_hp_rpm, boost_ok), encoding="utf-8")
+        elif sql_path.exists():
+            # Don't leave a previous run's SQL next to this run's load_ready.json
+            sql_path.unlink()
+        with open(output_dir / "quarantine.csv", "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=[*FIELDS, *GEOMETRY_FIELDS, "reasons"])
+            writer.writeheader()
+            for record in quarantined:
+                writer.writerow(dict(record, reasons=";".join(record["reasons"])))
+    METRICS.count("write", records=len(load_ready) + len(quarantined))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Validate extracted cams and quarantine implausible ones.")
+    parser.add_argument("inputs", nargs="+", type=Path, help="Extractor CSV/JSON outputs to validate.")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR, help="Where to write the results.")
+    parser.add_argument("--peak-hp-rpm", type=int,
+                        help="peak_hp_rpm for every loaded cam; load_ready.sql is only written when given.")
+    parser.add_argument("--boost-ok", choices=["yes", "no", "either"], default="either",
+                        help="boost_ok for every loaded cam (default: either).")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    records = []
+    for path in args.inputs:
+        if not path.exists():
+            print(f"ERROR: File not found: {path}")
+            sys.exit(1)
+        records.extend(read_records(path))
+    if not records:
+        print("No records to validate.")
+        return
+
+    start = time.perf_counter()
+    load_ready, quarantined, warnings = validate_batch(records)
+    elapsed = time.perf_counter() - start
+    print(f"Validated {len(records)} cams in {elapsed * 1000:.1f} ms: "
+          f"{len(load_ready)} load-ready, {len(quarantined)} quarantined")
+
+    reason_counts = {}
+    for record in quarantined:
+        for reason in record["reasons"]:
+            reason_counts[reason] = reason_counts.get(reason, 0) + 1
+    for reason, count in sorted(reason_counts.items(), key=lambda item: -item[1]):
+        print(f"  {reason}: {count}")
+    for reason, count in warnings.items():
+        if count:
+            print(f"  warning {reason}: {count} (loaded anyway)")
+
+    write_outputs(load_ready, quarantined, args.output_dir, args.peak_hp_rpm, args.boost_ok)
+    print(f"Output: {args.output_dir}")
+    if load_ready and args.peak_hp_rpm is None:
+        print("  load_ready.sql not written: pass --peak-hp-rpm (cse_generic_cams.peak_hp_rpm is NOT NULL)")
+    METRICS.write(args.output_dir, job="validate")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,11 @@ import argparse
 import csv
 import json
 import re
-from bs4 import BeautifulSoup
+import sys
+
+# Shared helpers live in scripts/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+from ingest_metrics import METRICS, timed  # noqa: E402
 
 DEFAULT_HTML_PATH = Path('tmp/summit_ford_windsor_page1.html')
 DEFAULT_OUTPUT_PATH = Path('tmp/ford_windsor_cams_first100.csv')
@@ -66,6 +70,7 @@ def normalize_angle_value(value: str) -> str:
     return f"{numeric:.2f}".rstrip('0').rstrip('.')
 
 
+@timed('extract_specs')
 def extract_specs(text: str) -> tuple[str, str, str, str]:
     duration = ''
     duration_type = ''
@@ -105,14 +110,20 @@ def parse_args():
     return parser.parse_args()
 
 
-def main() -> None:
-    args = parse_args()
-    html = args.html_path.read_text(encoding='utf-8')
-    soup = BeautifulSoup(html, 'html.parser')
-    cards = soup.select('div.item.row')
+CSV_FIELDS = ['index', 'brand', 'part_number', 'duration_type', 'duration', 'lift', 'lsa', 'description']
+
+
+def parse_listing_html(html: str, start_index: int = 1, limit: int = 100) -> list[dict]:
+    """Parse the product cards of a saved Summit listing page into spec rows."""
+    from bs4 import BeautifulSoup
+
+    with METRICS.stage('html_parse'):
+        soup = BeautifulSoup(html, 'html.parser')
+        cards = soup.select('div.item.row')
+    METRICS.count('html_parse', records=len(cards), bytes=len(html))
 
     rows = []
-    for idx, card in enumerate(cards[:args.limit], start=args.start_index):
+    for idx, card in enumerate(cards[:limit], start=start_index):
         part_el = card.select_one('p.item-part-number span')
         if not part_el:
             continue
@@ -134,20 +145,31 @@ def main() -> None:
             'lsa': lsa,
             'description': description,
         })
+    METRICS.count('extract_specs', records=len(rows))
+    return rows
 
-    args.csv_path.parent.mkdir(parents=True, exist_ok=True)
-    with args.csv_path.open('w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(
-            csvfile,
-            fieldnames=['index', 'brand', 'part_number', 'duration_type', 'duration', 'lift', 'lsa', 'description'],
-        )
+
+@timed('write')
+def write_outputs(rows: list[dict], csv_path: Path, json_path: Path) -> None:
+    csv_path.parent.mkdir(parents=True, exist_ok=True)
+    with csv_path.open('w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDS)
         writer.writeheader()
         writer.writerows(rows)
 
-    args.json_path.parent.mkdir(parents=True, exist_ok=True)
-    args.json_path.write_text(json.dumps(rows, indent=2), encoding='utf-8')
+    json_path.parent.mkdir(parents=True, exist_ok=True)
+    json_path.write_text(json.dumps(rows, indent=2), encoding='utf-8')
+    METRICS.count('write', records=len(rows), bytes=csv_path.stat().st_size + json_path.stat().st_size)
+
+
+def main() -> None:
+    args = parse_args()
+    html = args.html_path.read_text(encoding='utf-8')
+    rows = parse_listing_html(html, args.start_index, args.limit)
+    write_outputs(rows, args.csv_path, args.json_path)
 
     print(f'Extracted {len(rows)} rows to {args.csv_path} and {args.json_path}')
+    METRICS.write(args.csv_path.parent, job='parse')
 
 
 if __name__ == '__main__':
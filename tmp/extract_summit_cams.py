@@ -8,7 +8,7 @@ import re
 from datetime import datetime
 
 # All cam data extracted manually from the fetched content
-cams_data = [
+page_content = """
 Howards Cams Hydraulic Flat Tappet Camshafts 220051-08
 Camshaft, Hydraulic Flat Tappet, Advertised Duration 277/289, Lift .496/.520,
 Ford, 351W, Each
@@ -567,29 +567,33 @@ VALUES ({', '.join(values)});"""
     
     return sql
 
-# Parse the content
-print("Extracting camshaft data...\n")
-cams = extract_cams(page_content)
-
-print(f"Found {len(cams)} camshafts with complete specifications\n")
-print("=" * 80)
-print("SQL INSERT STATEMENTS")
-print("=" * 80)
-print()
-
-# Generate SQL for each cam
-for cam in cams:
-    print(generate_sql_insert(cam))
+def main():
+    # Parse the content
+    print("Extracting camshaft data...\n")
+    cams = extract_cams(page_content)
+    
+    print(f"Found {len(cams)} camshafts with complete specifications\n")
+    print("=" * 80)
+    print("SQL INSERT STATEMENTS")
+    print("=" * 80)
     print()
-
-# Also save to file
-output_file = 'summit_cams_inserts.sql'
-with open(output_file, 'w') as f:
-    f.write("-- Ford Small Block Windsor Camshafts from Summit Racing (Page 2)\n")
-    f.write("-- Generated: " + datetime.now().isoformat() + "\n\n")
+    
+    # Generate SQL for each cam
     for cam in cams:
-        f.write(generate_sql_insert(cam))
-        f.write("\n\n")
+        print(generate_sql_insert(cam))
+        print()
+    
+    # Also save to file
+    output_file = 'summit_cams_inserts.sql'
+    with open(output_file, 'w') as f:
+        f.write("-- Ford Small Block Windsor Camshafts from Summit Racing (Page 2)\n")
+        f.write("-- Generated: " + datetime.now().isoformat() + "\n\n")
+        for cam in cams:
+            f.write(generate_sql_insert(cam))
+            f.write("\n\n")
+    
+    print(f"\nSQL statements saved to: {output_file}")
+    print(f"Total statements: {len(cams)}")
 
-print(f"\nSQL statements saved to: {output_file}")
-print(f"Total statements: {len(cams)}")
+if __name__ == '__main__':
+    main()